@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+AdsPower活跃浏览器索引
+后台定期调用一次get_active_browsers()，与上次快照对比后发布打开/关闭变化，
+浏览器是否打开、调试地址等查询直接从内存返回，不再逐个环境请求API
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+
+class ActiveBrowserIndex:
+    """活跃浏览器索引 - 线程安全"""
+
+    def __init__(self, api_client=None, interval: float = 3.0):
+        self.api_client = api_client
+        self.interval = interval  # 轮询间隔（秒）
+
+        self._lock = threading.Lock()
+        self._browsers = {}      # user_id -> 浏览器连接信息
+        self._subscribers = []   # callback(user_id, is_open, info)
+        self._stop_event = threading.Event()
+        self._refresh_event = threading.Event()
+        self._thread = None
+
+        self.last_refresh = 0.0  # 最近一次成功轮询的时间（monotonic）
+        self.stats = {
+            "polls": 0,          # 轮询次数
+            "poll_failures": 0,  # 轮询失败次数
+            "transitions": 0     # 发布的状态变化次数
+        }
+
+    # ==================== 生命周期 ====================
+
+    def set_api(self, api_client):
+        """设置用于轮询的API客户端"""
+        self.api_client = api_client
+
+    def start(self):
+        """启动后台轮询线程（重复调用无副作用）"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._poll_loop, name="AdsPowerActiveBrowsers", daemon=True)
+        self._thread.start()
+        print(f"[API] 活跃浏览器索引已启动，轮询间隔 {self.interval}s")
+
+    def stop(self):
+        """停止后台轮询线程"""
+        self._stop_event.set()
+        self._refresh_event.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=5)
+        self._thread = None
+
+    def is_running(self) -> bool:
+        return bool(self._thread and self._thread.is_alive())
+
+    def request_refresh(self):
+        """请求后台线程立即轮询一次"""
+        self._refresh_event.set()
+
+    def _poll_loop(self):
+        while not self._stop_event.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"[API] 活跃浏览器轮询错误: {e}")
+            self._refresh_event.wait(self.interval)
+            self._refresh_event.clear()
+
+    # ==================== 订阅 ====================
+
+    def subscribe(self, callback: Callable[[str, bool, Optional[Dict]], None]):
+        """订阅打开/关闭变化，callback(user_id, is_open, info)在轮询线程中调用"""
+        with self._lock:
+            if callback not in self._subscribers:
+                self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[str, bool, Optional[Dict]], None]):
+        """取消订阅"""
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def _publish(self, transitions: List):
+        if not transitions:
+            return
+        with self._lock:
+            subscribers = list(self._subscribers)
+            self.stats["transitions"] += len(transitions)
+        for user_id, is_open, info in transitions:
+            for callback in subscribers:
+                try:
+                    callback(user_id, is_open, info)
+                except Exception as e:
+                    print(f"[API] 活跃浏览器订阅回调错误: {e}")
+
+    # ==================== 快照 ====================
+
+    @staticmethod
+    def _parse_browsers(result: Dict) -> Dict[str, Dict]:
+        """解析get_active_browsers()返回，data可能为列表或{"list": [...]}"""
+        data = result.get("data") or {}
+        items = data.get("list", []) if isinstance(data, dict) else data
+        browsers = {}
+        for item in items or []:
+            if not isinstance(item, dict) or not item.get("user_id"):
+                continue
+            ws = item.get("ws") or {}
+            browsers[str(item["user_id"])] = {
+                "selenium": ws.get("selenium", ""),
+                "puppeteer": ws.get("puppeteer", ""),
+                "debug_port": str(item.get("debug_port", "") or ""),
+                "webdriver": item.get("webdriver", "")
+            }
+        return browsers
+
+    def refresh(self) -> bool:
+        """轮询一次并发布变化，API调用失败时保留旧快照"""
+        if self.api_client is None:
+            return False
+
+        self.stats["polls"] += 1
+        result = self.api_client.get_active_browsers()
+        if result.get("code") != 0:
+            self.stats["poll_failures"] += 1
+            return False
+
+        browsers = self._parse_browsers(result)
+        transitions = []
+        with self._lock:
+            previous = self._browsers
+            for user_id, info in browsers.items():
+                if user_id not in previous:
+                    transitions.append((user_id, True, info))
+            for user_id in previous:
+                if user_id not in browsers:
+                    transitions.append((user_id, False, None))
+            self._browsers = browsers
+            self.last_refresh = time.monotonic()
+
+        self._publish(transitions)
+        return True
+
+    def mark_opened(self, user_id: str, start_data: Dict = None):
+        """启动浏览器成功后立即登记，无需等待下一次轮询"""
+        info = self._parse_browsers({"data": [dict(start_data or {}, user_id=user_id)]}).get(str(user_id))
+        with self._lock:
+            was_open = str(user_id) in self._browsers
+            self._browsers[str(user_id)] = info
+        if not was_open:
+            self._publish([(str(user_id), True, info)])
+
+    def mark_closed(self, user_id: str):
+        """关闭浏览器成功后立即移除"""
+        with self._lock:
+            was_open = self._browsers.pop(str(user_id), None) is not None
+        if was_open:
+            self._publish([(str(user_id), False, None)])
+
+    # ==================== 查询 ====================
+
+    def is_open(self, user_id: str) -> bool:
+        """浏览器是否已打开（基于最近一次快照）"""
+        with self._lock:
+            return str(user_id) in self._browsers
+
+    def debug_endpoint(self, user_id: str) -> Optional[Dict[str, str]]:
+        """获取浏览器调试地址（selenium/puppeteer/debug_port/webdriver），未打开返回None"""
+        with self._lock:
+            info = self._browsers.get(str(user_id))
+            return dict(info) if info else None
+
+    def open_user_ids(self) -> List[str]:
+        """获取当前已打开的环境ID列表"""
+        with self._lock:
+            return list(self._browsers)
+
+    def is_fresh(self, max_age: float = None) -> bool:
+        """快照是否在有效期内（默认两个轮询间隔）"""
+        max_age = self.interval * 2 if max_age is None else max_age
+        return self.last_refresh > 0 and time.monotonic() - self.last_refresh <= max_age
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取轮询统计"""
+        with self._lock:
+            stats = self.stats.copy()
+            stats.update({
+                "open_browsers": len(self._browsers),
+                "running": self.is_running(),
+                "snapshot_age": round(time.monotonic() - self.last_refresh, 1) if self.last_refresh else None
+            })
+            return stats
+
+
+# 全局活跃浏览器索引 - UI和执行器共享
+active_browser_index = ActiveBrowserIndex()
@@ -8,24 +8,72 @@ AdsPower API客户端 - 基于真实API文档实现
 import requests
 import time
 import json
-from typing import Dict, List, Optional, Union
+import queue
+import threading
+from typing import Dict, List, Optional, Union, Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from adspower_rate_limiter import AdsPowerRateLimiter, adspower_rate_limiter
+from adspower_single_flight import SingleFlight, adspower_single_flight
+from adspower_response_cache import ResponseCache, adspower_response_cache
+from adspower_circuit_breaker import CircuitBreaker, get_circuit_breaker
+from adspower_active_browsers import active_browser_index
+from adspower_browser_sessions import BrowserSessionRegistry, browser_session_registry
+from adspower_metrics import APIMetrics, adspower_metrics
+from rpa_chromedriver_service import chromedriver_services
+
+
+class AdsPowerAPIError(Exception):
+    """API返回失败结果时抛出，result为API原始返回"""
+
+    def __init__(self, result: Dict):
+        super().__init__(result.get("msg", "API请求失败"))
+        self.result = result
+
 
 class AdsPowerAPIClient:
     """AdsPower API客户端 - 基于真实API实现"""
 
-    def __init__(self, base_url: str = "http://local.adspower.net:50325", api_key: str = ""):
+    # 虽为GET但会改变状态的接口，不参与请求合并
+    NON_COALESCED_GET_ENDPOINTS = {
+        "/api/v1/browser/start",
+        "/api/v1/browser/stop",
+        "/api/v1/user/export",
+        "/api/v1/user/proxy/check"
+    }
+
+    def __init__(self, base_url: str = "http://local.adspower.net:50325", api_key: str = "",
+                 rate_limiter: AdsPowerRateLimiter = None, single_flight: SingleFlight = None,
+                 response_cache: ResponseCache = None, circuit_breaker: CircuitBreaker = None,
+                 browser_sessions: BrowserSessionRegistry = None, metrics: APIMetrics = None):
         # 修正默认URL为官方文档中的地址
         self.base_url = base_url.rstrip('/')
         self.api_key = api_key
         self.timeout = 60  # 增加超时时间
         self.session = requests.Session()
 
+        # 频率限制器 - 默认使用进程级共享实例，多个客户端/线程共同遵守同一限额
+        self.rate_limiter = rate_limiter or adspower_rate_limiter
+
+        # 请求合并 - 默认进程级共享，相同的并发读请求只发送一次
+        self.single_flight = single_flight or adspower_single_flight
+
+        # 响应缓存 - 环境详情、环境列表、分组列表按TTL缓存，写操作成功后失效
+        self.response_cache = response_cache or adspower_response_cache
+
+        # 熔断器 - AdsPower重启或API无响应时快速失败，并探测/status自动恢复（同一API地址共享）
+        self.circuit_breaker = circuit_breaker or get_circuit_breaker(self.base_url)
+
+        # 浏览器会话登记表 - 浏览器仍在运行时复用连接信息，避免重复调用启动接口
+        self.browser_sessions = browser_sessions or browser_session_registry
+
+        # 请求指标 - 替代逐次请求的控制台输出（verbose=True时仍可输出）
+        self.metrics = metrics or adspower_metrics
+
         # 设置请求头
         self.session.headers.update({
             'User-Agent': 'AdsPower-Tool-Pro/1.0.0'
@@ -53,15 +101,45 @@ class AdsPowerAPIClient:
         self.close()
 
     def _make_request(self, method: str, endpoint: str, params: Dict = None, data: Dict = None) -> Dict:
+        """发送API请求 - 相同的并发GET请求合并为一次"""
+        if method.upper() == 'GET' and endpoint not in self.NON_COALESCED_GET_ENDPOINTS:
+            key = (self.base_url, endpoint, json.dumps(params or {}, sort_keys=True, default=str))
+            return self.single_flight.do(key, lambda: self._send_request(method, endpoint, params, data))
+        return self._send_request(method, endpoint, params, data)
+
+    def get_coalescing_stats(self) -> Dict:
+        """获取请求合并统计（coalesced为节省的调用次数）"""
+        return self.single_flight.get_stats()
+
+    def get_circuit_state(self) -> Dict:
+        """获取熔断器状态（state为closed/open/half_open）"""
+        return self.circuit_breaker.get_stats()
+
+    def get_cache_stats(self) -> Dict:
+        """获取响应缓存命中统计"""
+        return self.response_cache.get_stats()
+
+    def invalidate_cache(self):
+        """清空响应缓存，下次读取将重新请求API"""
+        self.response_cache.clear()
+
+    def _invalidate_profile_cache(self, user_ids: List[str] = None):
+        """环境数据变更后失效相关缓存，user_ids为None时失效全部环境详情"""
+        self.response_cache.invalidate("profiles")
+        if user_ids is None:
+            self.response_cache.invalidate("profile_detail")
+        else:
+            for user_id in user_ids:
+                self.response_cache.invalidate("profile_detail", (self.base_url, user_id))
+
+    def _send_request(self, method: str, endpoint: str, params: Dict = None, data: Dict = None) -> Dict:
         """发送API请求 - 优化异常处理和资源管理"""
         import time
         import json
         from requests.exceptions import RequestException, Timeout, ConnectionError
 
-        # 添加请求间隔，避免频率限制
-        time.sleep(0.5)
-
         url = f"{self.base_url}{endpoint}"
+        started = time.monotonic()
 
         # 添加API密钥到参数
         if params is None:
@@ -74,10 +152,23 @@ class AdsPowerAPIClient:
 
         for attempt in range(max_retries):
             response = None
+            attempts = attempt + 1
+
+            # 熔断期间直接失败，不再等待超时
+            if not self.circuit_breaker.allow_request():
+                self.metrics.log(f"熔断中，跳过请求: {method} {url}")
+                return self._finish_request(endpoint, started, attempt, "circuit_open", {
+                    "code": -1, "msg": "AdsPower API暂不可用（熔断中），请稍后重试", "data": None})
+
             try:
-                print(f"[API] {method} {url} (尝试 {attempt + 1}/{max_retries})")
+                # 按接口类别申请令牌，避免频率限制（替代固定间隔）
+                wait_time = self.rate_limiter.acquire(endpoint)
+                self.metrics.record_rate_limit_wait(endpoint, wait_time)
+
+                self.metrics.log(f"{method} {url} (尝试 {attempts}/{max_retries})")
 
                 # 发送请求
+                attempt_started = time.monotonic()
                 if method.upper() == 'GET':
                     response = self.session.get(url, params=params, timeout=self.timeout)
                 elif method.upper() == 'POST':
@@ -88,16 +179,20 @@ class AdsPowerAPIClient:
                 else:
                     return {"code": -1, "msg": f"不支持的HTTP方法: {method}"}
 
-                print(f"[API] Response status: {response.status_code}")
+                self.metrics.record_attempt(endpoint, time.monotonic() - attempt_started)
+                self.metrics.log(f"Response status: {response.status_code}")
+                self.circuit_breaker.record_success()
 
                 # 检查HTTP状态码
                 if response.status_code != 200:
+                    cause = f"http_{response.status_code}"
                     if attempt < max_retries - 1:
-                        print(f"[API] HTTP错误 {response.status_code}，等待{retry_delay}秒后重试...")
-                        time.sleep(retry_delay)
+                        self.metrics.log(f"HTTP错误 {response.status_code}，等待{retry_delay}秒后重试...")
+                        self._backoff(endpoint, cause, retry_delay)
                         retry_delay *= 2
                         continue
-                    return {"code": -1, "msg": f"HTTP错误: {response.status_code}", "data": None}
+                    return self._finish_request(endpoint, started, attempts, cause, {
+                        "code": -1, "msg": f"HTTP错误: {response.status_code}", "data": None})
 
                 # 解析JSON响应
                 try:
@@ -105,53 +200,79 @@ class AdsPowerAPIClient:
 
                     # 检查是否有频率限制错误
                     if result.get("code") == -1 and "Too many request" in result.get("msg", ""):
+                        self.rate_limiter.on_rate_limited(endpoint)
                         if attempt < max_retries - 1:
-                            print(f"[API] 频率限制，等待{retry_delay * 2}秒后重试...")
-                            time.sleep(retry_delay * 2)
+                            self.metrics.log(f"频率限制，等待{retry_delay * 2}秒后重试...")
+                            self._backoff(endpoint, "rate_limit", retry_delay * 2)
                             retry_delay *= 2
                             continue
                         else:
-                            return {"code": -1, "msg": "API频率限制，请稍后重试", "data": None}
+                            return self._finish_request(endpoint, started, attempts, "rate_limit", {
+                                "code": -1, "msg": "API频率限制，请稍后重试", "data": None})
 
-                    return result
+                    self.rate_limiter.on_success(endpoint)
+                    return self._finish_request(endpoint, started, attempts, None, result)
 
                 except json.JSONDecodeError as e:
-                    print(f"[API] JSON解析失败: {e}")
+                    self.metrics.log(f"JSON解析失败: {e}")
                     if attempt < max_retries - 1:
-                        time.sleep(retry_delay)
+                        self._backoff(endpoint, "json_decode", retry_delay)
                         retry_delay *= 2
                         continue
-                    return {"code": -1, "msg": "响应格式错误", "data": {"text": response.text if response else ""}}
+                    return self._finish_request(endpoint, started, attempts, "json_decode", {
+                        "code": -1, "msg": "响应格式错误", "data": {"text": response.text if response else ""}})
 
             except Timeout as e:
-                print(f"[API] 请求超时 (尝试 {attempt + 1}/{max_retries}): {e}")
-                if attempt < max_retries - 1:
-                    time.sleep(retry_delay)
+                self.metrics.log(f"请求超时 (尝试 {attempts}/{max_retries}): {e}")
+                self.circuit_breaker.record_failure()
+                if attempt < max_retries - 1 and not self.circuit_breaker.is_open():
+                    self._backoff(endpoint, "timeout", retry_delay)
                     retry_delay *= 2
                     continue
-                return {"code": -1, "msg": f"请求超时: {str(e)}", "data": None}
+                return self._finish_request(endpoint, started, attempts, "timeout", {
+                    "code": -1, "msg": f"请求超时: {str(e)}", "data": None})
 
             except ConnectionError as e:
-                print(f"[API] 连接错误 (尝试 {attempt + 1}/{max_retries}): {e}")
-                if attempt < max_retries - 1:
-                    time.sleep(retry_delay)
+                self.metrics.log(f"连接错误 (尝试 {attempts}/{max_retries}): {e}")
+                self.circuit_breaker.record_failure()
+                if attempt < max_retries - 1 and not self.circuit_breaker.is_open():
+                    self._backoff(endpoint, "connection", retry_delay)
                     retry_delay *= 2
                     continue
-                return {"code": -1, "msg": "连接错误，请确保AdsPower正在运行且API已启用", "data": None}
+                return self._finish_request(endpoint, started, attempts, "connection", {
+                    "code": -1, "msg": "连接错误，请确保AdsPower正在运行且API已启用", "data": None})
 
             except RequestException as e:
-                print(f"[API] 请求异常 (尝试 {attempt + 1}/{max_retries}): {e}")
+                self.metrics.log(f"请求异常 (尝试 {attempts}/{max_retries}): {e}")
                 if attempt < max_retries - 1:
-                    time.sleep(retry_delay)
+                    self._backoff(endpoint, "request_error", retry_delay)
                     retry_delay *= 2
                     continue
-                return {"code": -1, "msg": f"请求失败: {str(e)}", "data": None}
+                return self._finish_request(endpoint, started, attempts, "request_error", {
+                    "code": -1, "msg": f"请求失败: {str(e)}", "data": None})
 
             except Exception as e:
                 print(f"[API] 未知错误: {e}")
-                return {"code": -1, "msg": f"未知错误: {str(e)}", "data": None}
-
-        return {"code": -1, "msg": "请求失败，已达到最大重试次数", "data": None}
+                return self._finish_request(endpoint, started, attempts, "unknown", {
+                    "code": -1, "msg": f"未知错误: {str(e)}", "data": None})
+
+        return self._finish_request(endpoint, started, max_retries, "max_retries", {
+            "code": -1, "msg": "请求失败，已达到最大重试次数", "data": None})
+
+    def _backoff(self, endpoint: str, cause: str, delay: float):
+        """重试前退避等待，并按原因记录重试指标"""
+        self.metrics.record_retry(endpoint, cause, delay)
+        time.sleep(delay)
+
+    def _finish_request(self, endpoint: str, started: float, attempts: int,
+                        failure_cause: Optional[str], result: Dict) -> Dict:
+        """记录整次调用的耗时和结果后返回"""
+        self.metrics.record_call(endpoint, time.monotonic() - started, attempts, failure_cause)
+        return result
+
+    def get_metrics(self) -> Dict:
+        """获取各接口的耗时分布、尝试次数、重试原因和退避等待统计"""
+        return self.metrics.get_metrics()
     
     # ==================== 基础功能 ====================
 
@@ -174,8 +295,14 @@ class AdsPowerAPIClient:
     # ==================== 环境管理 ====================
 
     def get_profiles(self, page: int = 1, page_size: int = 100,
-                    group_id: str = "", search: str = "") -> Dict:
-        """获取浏览器环境列表 - 基于真实API"""
+                    group_id: str = "", search: str = "", use_cache: bool = True) -> Dict:
+        """获取浏览器环境列表 - 基于真实API；use_cache为False时不读也不写响应缓存"""
+        cache_key = (self.base_url, page, page_size, group_id, search)
+        if use_cache:
+            cached = self.response_cache.get("profiles", cache_key)
+            if cached is not None:
+                return cached
+
         params = {
             "page": page,
             "page_size": page_size
@@ -186,10 +313,19 @@ class AdsPowerAPIClient:
         if search:
             params["search"] = search
 
-        return self._make_request("GET", "/api/v1/user/list", params)
+        result = self._make_request("GET", "/api/v1/user/list", params)
+        if use_cache and result.get("code") == 0:
+            self.response_cache.put("profiles", cache_key, result)
+        return result
 
-    def get_profile_detail(self, user_id: str) -> Dict:
+    def get_profile_detail(self, user_id: str, use_cache: bool = True) -> Dict:
         """获取单个环境的详细信息"""
+        cache_key = (self.base_url, user_id)
+        if use_cache:
+            cached = self.response_cache.get("profile_detail", cache_key)
+            if cached is not None:
+                return cached
+
         # 使用user_id参数从列表API获取特定环境信息
         params = {
             "user_id": user_id,
@@ -204,6 +340,8 @@ class AdsPowerAPIClient:
                 profile = profiles[0]
                 # 增强profile数据
                 enhanced_profile = self.enhance_profile_data(profile)
+                if use_cache:
+                    self.response_cache.put("profile_detail", cache_key, enhanced_profile)
                 return enhanced_profile
             else:
                 # 如果没有找到特定环境，返回增强的空数据
@@ -279,22 +417,34 @@ class AdsPowerAPIClient:
 
     def create_profile(self, profile_data: Dict) -> Dict:
         """创建浏览器环境"""
-        return self._make_request("POST", "/api/v1/user/create", data=profile_data)
+        result = self._make_request("POST", "/api/v1/user/create", data=profile_data)
+        if result.get("code") == 0:
+            self.response_cache.invalidate("profiles")
+        return result
 
     def update_profile(self, user_id: str, profile_data: Dict) -> Dict:
         """更新浏览器环境"""
         profile_data["user_id"] = user_id
-        return self._make_request("POST", "/api/v1/user/update", data=profile_data)
+        result = self._make_request("POST", "/api/v1/user/update", data=profile_data)
+        if result.get("code") == 0:
+            self._invalidate_profile_cache([user_id])
+        return result
 
     def delete_profile(self, user_id: str) -> Dict:
         """删除浏览器环境"""
         params = {"user_id": user_id}
-        return self._make_request("POST", "/api/v1/user/delete", params)
+        result = self._make_request("POST", "/api/v1/user/delete", params)
+        if result.get("code") == 0:
+            self._invalidate_profile_cache([user_id])
+        return result
 
     def batch_delete_profiles(self, user_ids: List[str]) -> Dict:
-        """批量删除浏览器环境"""
+        """批量删除浏览器环境 - 一次请求删除全部，成功后统一清除缓存"""
         data = {"user_ids": user_ids}
-        return self._make_request("POST", "/api/v1/user/delete", data=data)
+        result = self._make_request("POST", "/api/v1/user/delete", data=data)
+        if result.get("code") == 0:
+            self._invalidate_profile_cache(user_ids)
+        return result
 
     def export_profiles(self, user_ids: List[str] = None) -> Dict:
         """导出浏览器环境数据"""
@@ -304,32 +454,69 @@ class AdsPowerAPIClient:
         else:
             return self._make_request("GET", "/api/v1/user/export")
     
-    def get_all_profiles(self, group_id: str = "", search: str = "") -> Dict:
-        """获取所有环境列表（自动分页）- 根据AdsPower官方API实现"""
-        all_profiles = []
-        page = 1
-        page_size = 100
-
-        while True:
-            result = self.get_profiles(page, page_size, group_id, search)
-            if result.get("code") != 0:
-                return result
-
-            data = result.get("data", {})
-            profiles = data.get("list", [])
+    def iter_profiles(self, group_id: str = "", search: str = "",
+                      page_size: int = 100) -> Iterator[Dict]:
+        """逐个返回所有环境（自动分页），后台线程预取下一页，内存中约保留两页数据
+
+        API返回失败时抛出AdsPowerAPIError
+        """
+        page_queue = queue.Queue(maxsize=1)
+        stop_event = threading.Event()
+
+        def put(item) -> bool:
+            # 消费方提前结束时不再阻塞，让预取线程及时退出
+            while not stop_event.is_set():
+                try:
+                    page_queue.put(item, timeout=0.5)
+                    return True
+                except queue.Full:
+                    continue
+            return False
 
-            if not profiles:
-                break
+        def prefetch():
+            page = 1
+            try:
+                while not stop_event.is_set():
+                    # 流式读取不经过响应缓存，内存中只保留预取队列中的页
+                    result = self.get_profiles(page, page_size, group_id, search, use_cache=False)
+                    if result.get("code") != 0:
+                        put(("error", result))
+                        return
+
+                    profiles = result.get("data", {}).get("list", [])
+                    if not put(("page", profiles)):
+                        return
+
+                    # AdsPower API不返回total字段，通过返回的数据量判断是否还有更多页
+                    if len(profiles) < page_size:
+                        break
+                    page += 1
+            except Exception as e:
+                put(("error", {"code": -1, "msg": f"获取环境列表失败: {str(e)}", "data": None}))
+                return
+            put(("done", None))
 
-            all_profiles.extend(profiles)
+        worker = threading.Thread(target=prefetch, name="AdsPowerProfilePrefetch", daemon=True)
+        worker.start()
 
-            # AdsPower API不返回total字段，通过返回的数据量判断是否还有更多页
-            if len(profiles) < page_size:
-                # 当前页数据不满，说明这是最后一页
-                break
+        try:
+            while True:
+                kind, payload = page_queue.get()
+                if kind == "error":
+                    raise AdsPowerAPIError(payload)
+                if kind == "done":
+                    break
+                for profile in payload:
+                    yield profile
+        finally:
+            stop_event.set()
 
-            page += 1
-            time.sleep(0.1)  # 避免请求过快
+    def get_all_profiles(self, group_id: str = "", search: str = "") -> Dict:
+        """获取所有环境列表（自动分页）- 根据AdsPower官方API实现"""
+        try:
+            all_profiles = list(self.iter_profiles(group_id, search))
+        except AdsPowerAPIError as e:
+            return e.result
 
         return {
             "code": 0,
@@ -348,12 +535,27 @@ class AdsPowerAPIClient:
         """启动浏览器 - 基于真实API"""
         params = {"user_id": user_id}
         params.update(kwargs)
-        return self._make_request("GET", "/api/v1/browser/start", params)
+        result = self._make_request("GET", "/api/v1/browser/start", params)
+        if result.get("code") == 0:
+            active_browser_index.mark_opened(user_id, result.get("data"))
+        return result
 
     def close_browser(self, user_id: str) -> Dict:
         """关闭浏览器 - 基于真实API"""
         params = {"user_id": user_id}
-        return self._make_request("GET", "/api/v1/browser/stop", params)
+        result = self._make_request("GET", "/api/v1/browser/stop", params)
+        if result.get("code") == 0:
+            self.browser_sessions.remove(user_id)
+            active_browser_index.mark_closed(user_id)
+        return result
+
+    def open_browser_session(self, user_id: str, **kwargs) -> Dict:
+        """获取浏览器连接信息 - 已打开则复用，未打开才启动（返回格式同start_browser）"""
+        return self.browser_sessions.open(self, user_id, **kwargs)
+
+    def get_browser_session_stats(self) -> Dict:
+        """获取浏览器会话复用统计"""
+        return self.browser_sessions.get_stats()
 
     def stop_browser(self, user_id: str) -> Dict:
         """停止浏览器 - 与close_browser功能相同，提供别名兼容"""
@@ -366,8 +568,7 @@ class AdsPowerAPIClient:
 
     def get_browser_debug_port(self, user_id: str) -> Dict:
         """获取浏览器调试端口"""
-        params = {"user_id": user_id}
-        result = self._make_request("GET", "/api/v1/browser/start", params)
+        result = self.open_browser_session(user_id)
         if result.get("code") == 0 and "data" in result:
             return result["data"].get("debug_port", 0)
         return 0
@@ -386,8 +587,8 @@ class AdsPowerAPIClient:
     def create_selenium_driver(self, user_id: str) -> tuple:
         """创建Selenium WebDriver连接到AdsPower浏览器"""
         try:
-            # 首先启动浏览器
-            start_result = self.start_browser(user_id)
+            # 获取浏览器连接信息（已打开则复用，否则启动）
+            start_result = self.open_browser_session(user_id)
             if start_result.get("code") != 0:
                 return None, f"启动浏览器失败: {start_result.get('msg', '')}"
 
@@ -403,12 +604,8 @@ class AdsPowerAPIClient:
             chrome_options = Options()
             chrome_options.add_experimental_option("debuggerAddress", ws_url.replace("ws://", "").replace("/devtools/browser", ""))
 
-            # 创建WebDriver
-            if webdriver_path:
-                service = Service(webdriver_path)
-                driver = webdriver.Chrome(service=service, options=chrome_options)
-            else:
-                driver = webdriver.Chrome(options=chrome_options)
+            # 创建WebDriver（同一webdriver路径共享一个chromedriver进程）
+            driver = chromedriver_services.create_driver(webdriver_path, chrome_options)
 
             return driver, "成功"
 
@@ -417,9 +614,18 @@ class AdsPowerAPIClient:
     
     # ==================== 分组管理 ====================
 
-    def get_groups(self) -> Dict:
+    def get_groups(self, use_cache: bool = True) -> Dict:
         """获取分组列表 - 基于真实API"""
-        return self._make_request("GET", "/api/v1/group/list")
+        cache_key = self.base_url
+        if use_cache:
+            cached = self.response_cache.get("groups", cache_key)
+            if cached is not None:
+                return cached
+
+        result = self._make_request("GET", "/api/v1/group/list")
+        if use_cache and result.get("code") == 0:
+            self.response_cache.put("groups", cache_key, result)
+        return result
 
     def create_group(self, group_name: str, remark: str = "") -> Dict:
         """创建分组"""
@@ -427,7 +633,10 @@ class AdsPowerAPIClient:
             "group_name": group_name,
             "remark": remark
         }
-        return self._make_request("POST", "/api/v1/group/create", data=data)
+        result = self._make_request("POST", "/api/v1/group/create", data=data)
+        if result.get("code") == 0:
+            self.response_cache.invalidate("groups")
+        return result
 
     def update_group(self, group_id: str, group_name: str, remark: str = "") -> Dict:
         """更新分组"""
@@ -436,12 +645,21 @@ class AdsPowerAPIClient:
             "group_name": group_name,
             "remark": remark
         }
-        return self._make_request("POST", "/api/v1/group/update", data=data)
+        result = self._make_request("POST", "/api/v1/group/update", data=data)
+        if result.get("code") == 0:
+            # 环境数据中包含分组名称，一并失效
+            self.response_cache.invalidate("groups")
+            self._invalidate_profile_cache()
+        return result
 
     def delete_group(self, group_id: str) -> Dict:
         """删除分组"""
         params = {"group_id": group_id}
-        return self._make_request("POST", "/api/v1/group/delete", params)
+        result = self._make_request("POST", "/api/v1/group/delete", params)
+        if result.get("code") == 0:
+            self.response_cache.invalidate("groups")
+            self._invalidate_profile_cache()
+        return result
 
     def move_profiles_to_group(self, user_ids: List[str], group_id: str) -> Dict:
         """移动环境到分组"""
@@ -449,7 +667,11 @@ class AdsPowerAPIClient:
             "user_ids": user_ids,
             "group_id": group_id
         }
-        return self._make_request("POST", "/api/v1/user/move", data=data)
+        result = self._make_request("POST", "/api/v1/user/move", data=data)
+        if result.get("code") == 0:
+            self.response_cache.invalidate("groups")
+            self._invalidate_profile_cache(user_ids)
+        return result
     
     # ==================== 代理管理 ====================
     
@@ -500,57 +722,95 @@ class AdsPowerAPIClient:
     
     # ==================== 批量操作 ====================
     
-    def batch_start_browsers(self, user_ids: List[str]) -> Dict:
-        """批量启动浏览器"""
+    def _iter_batch_operation(self, operation: Callable, user_ids: List[str],
+                              max_workers: int = 5, retry_failed: int = 1) -> Iterator[Dict]:
+        """以限定并发数批量执行浏览器操作，每个环境完成后立即产出结果
+
+        请求节奏由共享的频率限制器控制；失败的环境在本轮结束后单独重试，
+        最多重试retry_failed轮，每个环境只产出一次最终结果。
+        """
+        pending = list(user_ids)
+        attempt = 0
+
+        while pending:
+            attempt += 1
+            is_last_round = attempt > retry_failed
+            failed = []
+
+            pool = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(pending))),
+                                      thread_name_prefix="AdsPower-Batch")
+            try:
+                future_to_user = {pool.submit(operation, user_id): user_id for user_id in pending}
+                for future in as_completed(future_to_user):
+                    user_id = future_to_user[future]
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        result = {"code": -1, "msg": f"未知错误: {str(e)}", "data": None}
+
+                    if result.get("code") != 0 and not is_last_round:
+                        failed.append(user_id)
+                        continue
+
+                    yield {
+                        "user_id": user_id,
+                        "result": result,
+                        "attempts": attempt
+                    }
+            finally:
+                # 调用方提前停止迭代时取消尚未开始的请求
+                pool.shutdown(wait=False, cancel_futures=True)
+
+            if failed:
+                print(f"[API] 批量操作 {len(failed)} 个环境失败，第 {attempt} 次重试")
+            pending = failed
+
+    def iter_batch_start_browsers(self, user_ids: List[str], max_workers: int = 5,
+                                  retry_failed: int = 1) -> Iterator[Dict]:
+        """批量启动浏览器 - 流式返回每个环境的结果"""
+        return self._iter_batch_operation(self.start_browser, user_ids, max_workers, retry_failed)
+
+    def iter_batch_close_browsers(self, user_ids: List[str], max_workers: int = 5,
+                                  retry_failed: int = 1) -> Iterator[Dict]:
+        """批量关闭浏览器 - 流式返回每个环境的结果"""
+        return self._iter_batch_operation(self.close_browser, user_ids, max_workers, retry_failed)
+
+    def batch_start_browsers(self, user_ids: List[str], max_workers: int = 1,
+                             callback: Callable = None, retry_failed: int = 0) -> Dict:
+        """批量启动浏览器
+
+        max_workers大于1时并发启动；callback在每个环境完成时以单条结果调用。
+        """
         results = []
-        for user_id in user_ids:
-            result = self.start_browser(user_id)
-            results.append({
-                "user_id": user_id,
-                "result": result
-            })
-            time.sleep(0.5)  # 避免请求过快
-        
+        for item in self.iter_batch_start_browsers(user_ids, max_workers, retry_failed):
+            results.append(item)
+            if callback:
+                callback(item)
+
         return {
             "code": 0,
             "msg": "批量操作完成",
             "data": {"results": results}
         }
-    
-    def batch_close_browsers(self, user_ids: List[str]) -> Dict:
-        """批量关闭浏览器"""
+
+    def batch_close_browsers(self, user_ids: List[str], max_workers: int = 1,
+                             callback: Callable = None, retry_failed: int = 0) -> Dict:
+        """批量关闭浏览器
+
+        max_workers大于1时并发关闭；callback在每个环境完成时以单条结果调用。
+        """
         results = []
-        for user_id in user_ids:
-            result = self.close_browser(user_id)
-            results.append({
-                "user_id": user_id,
-                "result": result
-            })
-            time.sleep(0.5)  # 避免请求过快
-        
+        for item in self.iter_batch_close_browsers(user_ids, max_workers, retry_failed):
+            results.append(item)
+            if callback:
+                callback(item)
+
         return {
             "code": 0,
             "msg": "批量操作完成",
             "data": {"results": results}
         }
     
-    def batch_delete_profiles(self, user_ids: List[str]) -> Dict:
-        """批量删除环境"""
-        results = []
-        for user_id in user_ids:
-            result = self.delete_profile(user_id)
-            results.append({
-                "user_id": user_id,
-                "result": result
-            })
-            time.sleep(0.1)  # 避免请求过快
-        
-        return {
-            "code": 0,
-            "msg": "批量删除完成",
-            "data": {"results": results}
-        }
-    
     # ==================== 导出功能 ====================
     
     def export_profiles(self, user_ids: List[str] = None, export_fields: List[str] = None) -> Dict:
@@ -0,0 +1,583 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+AdsPower异步API客户端
+基于asyncio + aiohttp实现，与AdsPowerAPIClient接口一致，
+单个事件循环通过连接池复用keep-alive连接驱动大量并发环境；
+响应缓存与同步客户端共享，请求合并在客户端所在的事件循环内进行
+"""
+
+import asyncio
+import json
+import time
+from typing import AsyncIterator, Callable, Dict, List, Optional
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+from adspower_api import AdsPowerAPIClient, AdsPowerAPIError
+from adspower_rate_limiter import AdsPowerRateLimiter, adspower_rate_limiter
+from adspower_single_flight import AsyncSingleFlight
+from adspower_response_cache import ResponseCache, adspower_response_cache
+from adspower_circuit_breaker import CircuitBreaker, get_circuit_breaker
+from adspower_metrics import APIMetrics, adspower_metrics
+
+
+class AsyncAdsPowerAPIClient:
+    """AdsPower异步API客户端 - 重试、错误返回格式和频率限制与同步客户端保持一致"""
+
+    NON_COALESCED_GET_ENDPOINTS = AdsPowerAPIClient.NON_COALESCED_GET_ENDPOINTS
+
+    # 与同步客户端共用的数据处理和缓存方法
+    enhance_profile_data = AdsPowerAPIClient.enhance_profile_data
+    _invalidate_profile_cache = AdsPowerAPIClient._invalidate_profile_cache
+    get_cache_stats = AdsPowerAPIClient.get_cache_stats
+    invalidate_cache = AdsPowerAPIClient.invalidate_cache
+
+    def __init__(self, base_url: str = "http://local.adspower.net:50325", api_key: str = "",
+                 rate_limiter: AdsPowerRateLimiter = None, max_connections: int = 100,
+                 keepalive_timeout: float = 60, circuit_breaker: CircuitBreaker = None,
+                 metrics: APIMetrics = None, single_flight: AsyncSingleFlight = None,
+                 response_cache: ResponseCache = None):
+        if not AIOHTTP_AVAILABLE:
+            raise ImportError("异步API客户端需要安装aiohttp: pip install aiohttp")
+
+        self.base_url = base_url.rstrip('/')
+        self.api_key = api_key
+        self.timeout = 60
+        self.max_connections = max_connections
+        self.keepalive_timeout = keepalive_timeout
+
+        # 与同步客户端共享同一个进程级频率限制器
+        self.rate_limiter = rate_limiter or adspower_rate_limiter
+
+        # 与同步客户端共享熔断器，任一客户端检测到API不可用后全部快速失败
+        self.circuit_breaker = circuit_breaker or get_circuit_breaker(self.base_url)
+
+        # 与同步客户端共享请求指标
+        self.metrics = metrics or adspower_metrics
+
+        # 请求合并 - 协程不能等待线程锁，使用客户端自己的协程版合并组
+        self.single_flight = single_flight or AsyncSingleFlight()
+
+        # 与同步客户端共享响应缓存，任一客户端的写操作都会使缓存失效
+        self.response_cache = response_cache or adspower_response_cache
+
+        # 连接池在首次请求时于当前事件循环中创建
+        self.session = None
+
+    async def __aenter__(self):
+        """异步上下文管理器入口"""
+        await self._get_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """异步上下文管理器出口，确保连接池关闭"""
+        await self.close()
+
+    async def _get_session(self):
+        """获取（必要时创建）共享的keep-alive连接池"""
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                keepalive_timeout=self.keepalive_timeout
+            )
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={'User-Agent': 'AdsPower-Tool-Pro/1.0.0'}
+            )
+        return self.session
+
+    async def close(self):
+        """关闭连接池，释放资源"""
+        if self.session and not self.session.closed:
+            try:
+                await self.session.close()
+                print("[AsyncAPI] 会话已关闭")
+            except Exception as e:
+                print(f"[AsyncAPI] 关闭会话时出错: {e}")
+        self.session = None
+
+    async def _make_request(self, method: str, endpoint: str, params: Dict = None, data: Dict = None) -> Dict:
+        """发送API请求 - 相同的并发GET请求合并为一次"""
+        if method.upper() == 'GET' and endpoint not in self.NON_COALESCED_GET_ENDPOINTS:
+            key = (self.base_url, endpoint, json.dumps(params or {}, sort_keys=True, default=str))
+            return await self.single_flight.do(key, lambda: self._send_request(method, endpoint, params, data))
+        return await self._send_request(method, endpoint, params, data)
+
+    def get_coalescing_stats(self) -> Dict:
+        """获取请求合并统计（coalesced为节省的调用次数）"""
+        return self.single_flight.get_stats()
+
+    async def _send_request(self, method: str, endpoint: str, params: Dict = None, data: Dict = None) -> Dict:
+        """发送API请求 - 与AdsPowerAPIClient._send_request的重试和返回格式一致"""
+        url = f"{self.base_url}{endpoint}"
+        started = time.monotonic()
+
+        # 添加API密钥到参数
+        if params is None:
+            params = {}
+        if self.api_key:
+            params['api_key'] = self.api_key
+        # aiohttp要求查询参数为字符串
+        query = {key: str(value) for key, value in params.items()}
+
+        session = await self._get_session()
+
+        max_retries = 3
+        retry_delay = 1
+
+        for attempt in range(max_retries):
+            attempts = attempt + 1
+
+            # 熔断期间直接失败，不再等待超时
+            if not self.circuit_breaker.allow_request():
+                self.metrics.log(f"[Async] 熔断中，跳过请求: {method} {url}")
+                return self._finish_request(endpoint, started, attempt, "circuit_open", {
+                    "code": -1, "msg": "AdsPower API暂不可用（熔断中），请稍后重试", "data": None})
+
+            try:
+                # 按接口类别预约令牌，不阻塞事件循环
+                wait_time = self.rate_limiter.reserve(endpoint)
+                if wait_time > 0:
+                    self.metrics.record_rate_limit_wait(endpoint, wait_time)
+                    await asyncio.sleep(wait_time)
+
+                self.metrics.log(f"[Async] {method} {url} (尝试 {attempts}/{max_retries})")
+
+                if method.upper() == 'GET':
+                    request = session.get(url, params=query)
+                elif method.upper() == 'POST':
+                    if data:
+                        request = session.post(url, params=query, json=data)
+                    else:
+                        request = session.post(url, params=query)
+                else:
+                    return {"code": -1, "msg": f"不支持的HTTP方法: {method}"}
+
+                attempt_started = time.monotonic()
+                async with request as response:
+                    status_code = response.status
+                    text = await response.text()
+
+                self.metrics.record_attempt(endpoint, time.monotonic() - attempt_started)
+                self.metrics.log(f"[Async] Response status: {status_code}")
+                self.circuit_breaker.record_success()
+
+                # 检查HTTP状态码
+                if status_code != 200:
+                    cause = f"http_{status_code}"
+                    if attempt < max_retries - 1:
+                        self.metrics.log(f"[Async] HTTP错误 {status_code}，等待{retry_delay}秒后重试...")
+                        await self._backoff(endpoint, cause, retry_delay)
+                        retry_delay *= 2
+                        continue
+                    return self._finish_request(endpoint, started, attempts, cause, {
+                        "code": -1, "msg": f"HTTP错误: {status_code}", "data": None})
+
+                # 解析JSON响应
+                try:
+                    result = json.loads(text)
+
+                    # 检查是否有频率限制错误
+                    if result.get("code") == -1 and "Too many request" in result.get("msg", ""):
+                        self.rate_limiter.on_rate_limited(endpoint)
+                        if attempt < max_retries - 1:
+                            self.metrics.log(f"[Async] 频率限制，等待{retry_delay * 2}秒后重试...")
+                            await self._backoff(endpoint, "rate_limit", retry_delay * 2)
+                            retry_delay *= 2
+                            continue
+                        else:
+                            return self._finish_request(endpoint, started, attempts, "rate_limit", {
+                                "code": -1, "msg": "API频率限制，请稍后重试", "data": None})
+
+                    self.rate_limiter.on_success(endpoint)
+                    return self._finish_request(endpoint, started, attempts, None, result)
+
+                except json.JSONDecodeError as e:
+                    self.metrics.log(f"[Async] JSON解析失败: {e}")
+                    if attempt < max_retries - 1:
+                        await self._backoff(endpoint, "json_decode", retry_delay)
+                        retry_delay *= 2
+                        continue
+                    return self._finish_request(endpoint, started, attempts, "json_decode", {
+                        "code": -1, "msg": "响应格式错误", "data": {"text": text}})
+
+            except asyncio.TimeoutError as e:
+                self.metrics.log(f"[Async] 请求超时 (尝试 {attempts}/{max_retries}): {e}")
+                self.circuit_breaker.record_failure()
+                if attempt < max_retries - 1 and not self.circuit_breaker.is_open():
+                    await self._backoff(endpoint, "timeout", retry_delay)
+                    retry_delay *= 2
+                    continue
+                return self._finish_request(endpoint, started, attempts, "timeout", {
+                    "code": -1, "msg": f"请求超时: {str(e)}", "data": None})
+
+            except aiohttp.ClientConnectionError as e:
+                self.metrics.log(f"[Async] 连接错误 (尝试 {attempts}/{max_retries}): {e}")
+                self.circuit_breaker.record_failure()
+                if attempt < max_retries - 1 and not self.circuit_breaker.is_open():
+                    await self._backoff(endpoint, "connection", retry_delay)
+                    retry_delay *= 2
+                    continue
+                return self._finish_request(endpoint, started, attempts, "connection", {
+                    "code": -1, "msg": "连接错误，请确保AdsPower正在运行且API已启用", "data": None})
+
+            except aiohttp.ClientError as e:
+                self.metrics.log(f"[Async] 请求异常 (尝试 {attempts}/{max_retries}): {e}")
+                if attempt < max_retries - 1:
+                    await self._backoff(endpoint, "request_error", retry_delay)
+                    retry_delay *= 2
+                    continue
+                return self._finish_request(endpoint, started, attempts, "request_error", {
+                    "code": -1, "msg": f"请求失败: {str(e)}", "data": None})
+
+            except Exception as e:
+                print(f"[AsyncAPI] 未知错误: {e}")
+                return self._finish_request(endpoint, started, attempts, "unknown", {
+                    "code": -1, "msg": f"未知错误: {str(e)}", "data": None})
+
+        return self._finish_request(endpoint, started, max_retries, "max_retries", {
+            "code": -1, "msg": "请求失败，已达到最大重试次数", "data": None})
+
+    async def _backoff(self, endpoint: str, cause: str, delay: float):
+        """重试前退避等待，并按原因记录重试指标"""
+        self.metrics.record_retry(endpoint, cause, delay)
+        await asyncio.sleep(delay)
+
+    def _finish_request(self, endpoint: str, started: float, attempts: int,
+                        failure_cause: Optional[str], result: Dict) -> Dict:
+        """记录整次调用的耗时和结果后返回"""
+        self.metrics.record_call(endpoint, time.monotonic() - started, attempts, failure_cause)
+        return result
+
+    def get_metrics(self) -> Dict:
+        """获取各接口的耗时分布、尝试次数、重试原因和退避等待统计"""
+        return self.metrics.get_metrics()
+
+    # ==================== 基础功能 ====================
+
+    async def test_connection(self) -> Dict:
+        """测试API连接 - 使用status接口"""
+        result = await self._make_request("GET", "/status")
+        if result.get("code") == 0 or "success" in str(result).lower():
+            return {"code": 0, "msg": "连接成功"}
+        else:
+            return {"code": -1, "msg": f"连接失败: {result.get('msg', '')}"}
+
+    async def check_api_status(self) -> Dict:
+        """检查API接口状态"""
+        return await self._make_request("GET", "/status")
+
+    # ==================== 环境管理 ====================
+
+    async def get_profiles(self, page: int = 1, page_size: int = 100,
+                           group_id: str = "", search: str = "", use_cache: bool = True) -> Dict:
+        """获取浏览器环境列表；use_cache为False时不读也不写响应缓存"""
+        cache_key = (self.base_url, page, page_size, group_id, search)
+        if use_cache:
+            cached = self.response_cache.get("profiles", cache_key)
+            if cached is not None:
+                return cached
+
+        params = {
+            "page": page,
+            "page_size": page_size
+        }
+
+        if group_id:
+            params["group_id"] = group_id
+        if search:
+            params["search"] = search
+
+        result = await self._make_request("GET", "/api/v1/user/list", params)
+        if use_cache and result.get("code") == 0:
+            self.response_cache.put("profiles", cache_key, result)
+        return result
+
+    async def get_profile_detail(self, user_id: str, use_cache: bool = True) -> Dict:
+        """获取单个环境的详细信息"""
+        cache_key = (self.base_url, user_id)
+        if use_cache:
+            cached = self.response_cache.get("profile_detail", cache_key)
+            if cached is not None:
+                return cached
+
+        params = {
+            "user_id": user_id,
+            "page_size": 1
+        }
+
+        result = await self._make_request("GET", "/api/v1/user/list", params)
+
+        if result.get("code") == 0:
+            profiles = result.get("data", {}).get("list", [])
+            if profiles:
+                enhanced_profile = self.enhance_profile_data(profiles[0])
+                if use_cache:
+                    self.response_cache.put("profile_detail", cache_key, enhanced_profile)
+                return enhanced_profile
+
+        # 未找到或调用失败时返回增强的空数据
+        return self.enhance_profile_data({"user_id": user_id})
+
+    async def iter_profiles(self, group_id: str = "", search: str = "",
+                            page_size: int = 100) -> AsyncIterator[Dict]:
+        """逐个返回所有环境（自动分页），处理当前页时已在请求下一页，内存中约保留两页数据
+
+        API返回失败时抛出AdsPowerAPIError
+        """
+        page = 1
+        # 流式读取不经过响应缓存
+        fetch = asyncio.ensure_future(self.get_profiles(page, page_size, group_id, search, use_cache=False))
+        try:
+            while fetch is not None:
+                result = await fetch
+                fetch = None
+                if result.get("code") != 0:
+                    raise AdsPowerAPIError(result)
+
+                profiles = result.get("data", {}).get("list", [])
+                # AdsPower API不返回total字段，通过返回的数据量判断是否还有更多页
+                if len(profiles) == page_size:
+                    page += 1
+                    fetch = asyncio.ensure_future(
+                        self.get_profiles(page, page_size, group_id, search, use_cache=False))
+                for profile in profiles:
+                    yield profile
+        finally:
+            # 调用方提前结束时取消预取
+            if fetch is not None:
+                fetch.cancel()
+
+    async def get_all_profiles(self, group_id: str = "", search: str = "") -> Dict:
+        """获取所有环境列表（自动分页）"""
+        try:
+            all_profiles = [profile async for profile in self.iter_profiles(group_id, search)]
+        except AdsPowerAPIError as e:
+            return e.result
+
+        return {
+            "code": 0,
+            "msg": "success",
+            "data": {
+                "list": all_profiles,
+                "total": len(all_profiles)
+            }
+        }
+
+    async def create_profile(self, profile_data: Dict) -> Dict:
+        """创建浏览器环境"""
+        result = await self._make_request("POST", "/api/v1/user/create", data=profile_data)
+        if result.get("code") == 0:
+            self.response_cache.invalidate("profiles")
+        return result
+
+    async def update_profile(self, user_id: str, profile_data: Dict) -> Dict:
+        """更新浏览器环境"""
+        profile_data["user_id"] = user_id
+        result = await self._make_request("POST", "/api/v1/user/update", data=profile_data)
+        if result.get("code") == 0:
+            self._invalidate_profile_cache([user_id])
+        return result
+
+    async def delete_profile(self, user_id: str) -> Dict:
+        """删除浏览器环境"""
+        params = {"user_id": user_id}
+        result = await self._make_request("POST", "/api/v1/user/delete", params)
+        if result.get("code") == 0:
+            self._invalidate_profile_cache([user_id])
+        return result
+
+    async def batch_delete_profiles(self, user_ids: List[str]) -> Dict:
+        """批量删除浏览器环境 - 一次请求删除全部，成功后统一清除缓存"""
+        data = {"user_ids": user_ids}
+        result = await self._make_request("POST", "/api/v1/user/delete", data=data)
+        if result.get("code") == 0:
+            self._invalidate_profile_cache(user_ids)
+        return result
+
+    # ==================== 浏览器控制 ====================
+
+    async def start_browser(self, user_id: str, **kwargs) -> Dict:
+        """启动浏览器"""
+        params = {"user_id": user_id}
+        params.update(kwargs)
+        return await self._make_request("GET", "/api/v1/browser/start", params)
+
+    async def close_browser(self, user_id: str) -> Dict:
+        """关闭浏览器"""
+        params = {"user_id": user_id}
+        return await self._make_request("GET", "/api/v1/browser/stop", params)
+
+    async def stop_browser(self, user_id: str) -> Dict:
+        """停止浏览器 - 与close_browser功能相同"""
+        return await self.close_browser(user_id)
+
+    async def check_browser_status(self, user_id: str) -> Dict:
+        """检查浏览器状态"""
+        return await self.get_browser_status(user_id)
+
+    async def get_browser_status(self, user_id: str) -> Dict:
+        """获取浏览器状态"""
+        params = {"user_id": user_id}
+        return await self._make_request("GET", "/api/v1/browser/active", params)
+
+    async def get_browser_debug_port(self, user_id: str):
+        """获取浏览器调试端口"""
+        result = await self.start_browser(user_id)
+        if result.get("code") == 0 and "data" in result:
+            return result["data"].get("debug_port", 0)
+        return 0
+
+    async def get_active_browsers(self) -> Dict:
+        """获取所有活跃的浏览器"""
+        return await self._make_request("GET", "/api/v1/browser/active/list")
+
+    # ==================== 分组管理 ====================
+
+    async def get_groups(self, use_cache: bool = True) -> Dict:
+        """获取分组列表"""
+        cache_key = self.base_url
+        if use_cache:
+            cached = self.response_cache.get("groups", cache_key)
+            if cached is not None:
+                return cached
+
+        result = await self._make_request("GET", "/api/v1/group/list")
+        if use_cache and result.get("code") == 0:
+            self.response_cache.put("groups", cache_key, result)
+        return result
+
+    async def create_group(self, group_name: str, remark: str = "") -> Dict:
+        """创建分组"""
+        data = {
+            "group_name": group_name,
+            "remark": remark
+        }
+        result = await self._make_request("POST", "/api/v1/group/create", data=data)
+        if result.get("code") == 0:
+            self.response_cache.invalidate("groups")
+        return result
+
+    async def update_group(self, group_id: str, group_name: str, remark: str = "") -> Dict:
+        """更新分组"""
+        data = {
+            "group_id": group_id,
+            "group_name": group_name,
+            "remark": remark
+        }
+        result = await self._make_request("POST", "/api/v1/group/update", data=data)
+        if result.get("code") == 0:
+            # 环境数据中包含分组名称，一并失效
+            self.response_cache.invalidate("groups")
+            self._invalidate_profile_cache()
+        return result
+
+    async def delete_group(self, group_id: str) -> Dict:
+        """删除分组"""
+        params = {"group_id": group_id}
+        result = await self._make_request("POST", "/api/v1/group/delete", params)
+        if result.get("code") == 0:
+            self.response_cache.invalidate("groups")
+            self._invalidate_profile_cache()
+        return result
+
+    async def move_profiles_to_group(self, user_ids: List[str], group_id: str) -> Dict:
+        """移动环境到分组"""
+        data = {
+            "user_ids": user_ids,
+            "group_id": group_id
+        }
+        result = await self._make_request("POST", "/api/v1/user/move", data=data)
+        if result.get("code") == 0:
+            self.response_cache.invalidate("groups")
+            self._invalidate_profile_cache(user_ids)
+        return result
+
+    # ==================== 批量操作 ====================
+
+    async def _iter_batch_operation(self, func, user_ids: List[str], max_concurrency: int = 10,
+                                    retry_failed: int = 1) -> AsyncIterator[Dict]:
+        """以限定并发数批量执行浏览器操作，每个环境完成后立即产出结果
+
+        失败的环境在本轮结束后单独重试，最多重试retry_failed轮，每个环境只产出一次最终结果
+        """
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def run_one(user_id):
+            async with semaphore:
+                try:
+                    return user_id, await func(user_id)
+                except Exception as e:
+                    return user_id, {"code": -1, "msg": f"未知错误: {str(e)}", "data": None}
+
+        pending = list(user_ids)
+        attempt = 0
+
+        while pending:
+            attempt += 1
+            is_last_round = attempt > retry_failed
+            failed = []
+
+            tasks = [asyncio.ensure_future(run_one(user_id)) for user_id in pending]
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    user_id, result = await next_done
+                    if result.get("code") != 0 and not is_last_round:
+                        failed.append(user_id)
+                        continue
+
+                    yield {
+                        "user_id": user_id,
+                        "result": result,
+                        "attempts": attempt
+                    }
+            finally:
+                # 调用方提前停止迭代时取消尚未完成的请求
+                for task in tasks:
+                    task.cancel()
+
+            if failed:
+                print(f"[AsyncAPI] 批量操作 {len(failed)} 个环境失败，第 {attempt} 次重试")
+            pending = failed
+
+    def iter_batch_start_browsers(self, user_ids: List[str], max_concurrency: int = 10,
+                                  retry_failed: int = 1) -> AsyncIterator[Dict]:
+        """批量启动浏览器 - 流式返回每个环境的结果"""
+        return self._iter_batch_operation(self.start_browser, user_ids, max_concurrency, retry_failed)
+
+    def iter_batch_close_browsers(self, user_ids: List[str], max_concurrency: int = 10,
+                                  retry_failed: int = 1) -> AsyncIterator[Dict]:
+        """批量关闭浏览器 - 流式返回每个环境的结果"""
+        return self._iter_batch_operation(self.close_browser, user_ids, max_concurrency, retry_failed)
+
+    async def _collect_batch(self, results: AsyncIterator[Dict], callback: Optional[Callable]) -> Dict:
+        items = []
+        async for item in results:
+            items.append(item)
+            if callback:
+                callback(item)
+
+        return {
+            "code": 0,
+            "msg": "批量操作完成",
+            "data": {"results": items}
+        }
+
+    async def batch_start_browsers(self, user_ids: List[str], max_concurrency: int = 10,
+                                   callback: Callable = None, retry_failed: int = 0) -> Dict:
+        """批量启动浏览器；callback在每个环境完成时以单条结果调用"""
+        return await self._collect_batch(
+            self.iter_batch_start_browsers(user_ids, max_concurrency, retry_failed), callback)
+
+    async def batch_close_browsers(self, user_ids: List[str], max_concurrency: int = 10,
+                                   callback: Callable = None, retry_failed: int = 0) -> Dict:
+        """批量关闭浏览器；callback在每个环境完成时以单条结果调用"""
+        return await self._collect_batch(
+            self.iter_batch_close_browsers(user_ids, max_concurrency, retry_failed), callback)
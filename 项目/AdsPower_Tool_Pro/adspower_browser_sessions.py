@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+AdsPower浏览器会话登记表
+按user_id记录启动接口返回的selenium/puppeteer地址、webdriver路径和调试端口，
+浏览器仍在运行时直接复用已有连接信息，只有真正关闭时才调用启动接口
+"""
+
+import socket
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from adspower_active_browsers import active_browser_index
+
+
+class BrowserSession:
+    """一个已打开浏览器的连接信息"""
+
+    def __init__(self, user_id: str, start_data: Dict = None):
+        start_data = start_data or {}
+        ws = start_data.get("ws") or {}
+        self.user_id = str(user_id)
+        self.selenium_address = ws.get("selenium", "")
+        self.puppeteer_ws = ws.get("puppeteer", "")
+        self.webdriver_path = start_data.get("webdriver", "")
+        self.debug_port = str(start_data.get("debug_port", "") or "")
+        self.started_at = time.time()
+        self.last_verified = time.monotonic()
+
+    def debug_address(self) -> Tuple[str, int]:
+        """解析调试地址的(host, port)，无法解析时端口为0"""
+        address = self.selenium_address.replace("ws://", "").split("/")[0]
+        host, _, port = address.rpartition(":")
+        if not port.isdigit() and self.debug_port.isdigit():
+            return "127.0.0.1", int(self.debug_port)
+        return host or "127.0.0.1", int(port) if port.isdigit() else 0
+
+    def to_start_data(self) -> Dict[str, Any]:
+        """转换为与启动接口data相同的格式"""
+        return {
+            "ws": {
+                "selenium": self.selenium_address,
+                "puppeteer": self.puppeteer_ws
+            },
+            "webdriver": self.webdriver_path,
+            "debug_port": self.debug_port
+        }
+
+
+class BrowserSessionRegistry:
+    """浏览器会话登记表 - 线程安全，同一环境的并发打开请求只会启动一次"""
+
+    def __init__(self, verify_interval: float = 2.0, connect_timeout: float = 0.5):
+        self.verify_interval = verify_interval  # 距上次验证不足该秒数时跳过存活检查
+        self.connect_timeout = connect_timeout  # 调试端口TCP连接超时
+
+        self._lock = threading.Lock()
+        self._sessions = {}    # user_id -> BrowserSession
+        self._user_locks = {}  # user_id -> Lock，串行化同一环境的打开流程
+
+        self.stats = {
+            "reused": 0,          # 复用登记表中的会话
+            "adopted": 0,         # 复用界面或其他程序已打开的浏览器
+            "started": 0,         # 实际调用启动接口
+            "stale_removed": 0    # 存活检查失败被移除的会话
+        }
+
+    def _count(self, name: str):
+        with self._lock:
+            self.stats[name] += 1
+
+    def _user_lock(self, user_id: str) -> threading.Lock:
+        with self._lock:
+            lock = self._user_locks.get(user_id)
+            if lock is None:
+                lock = self._user_locks[user_id] = threading.Lock()
+            return lock
+
+    # ==================== 登记 ====================
+
+    def register(self, user_id: str, start_data: Dict) -> BrowserSession:
+        """登记启动接口返回的连接信息"""
+        session = BrowserSession(user_id, start_data)
+        with self._lock:
+            self._sessions[session.user_id] = session
+        return session
+
+    def get(self, user_id: str) -> Optional[BrowserSession]:
+        """获取登记的会话（不做存活检查）"""
+        with self._lock:
+            return self._sessions.get(str(user_id))
+
+    def remove(self, user_id: str):
+        """移除会话（浏览器已关闭）"""
+        with self._lock:
+            self._sessions.pop(str(user_id), None)
+
+    def clear(self):
+        with self._lock:
+            self._sessions.clear()
+
+    def _on_browser_transition(self, user_id: str, is_open: bool, info: Optional[Dict]):
+        """活跃浏览器索引回调：浏览器被关闭时同步移除会话"""
+        if not is_open:
+            self.remove(user_id)
+
+    # ==================== 存活检查 ====================
+
+    def is_alive(self, session: BrowserSession, force: bool = False) -> bool:
+        """通过TCP连接调试端口检查浏览器是否仍在运行"""
+        if not force and time.monotonic() - session.last_verified < self.verify_interval:
+            return True
+
+        host, port = session.debug_address()
+        if not port:
+            return False
+        try:
+            with socket.create_connection((host, port), timeout=self.connect_timeout):
+                pass
+        except OSError:
+            return False
+        session.last_verified = time.monotonic()
+        return True
+
+    # ==================== 打开浏览器 ====================
+
+    def open(self, api_client, user_id: str, **start_kwargs) -> Dict[str, Any]:
+        """获取浏览器连接信息，仅在浏览器未运行时调用启动接口
+
+        返回与启动接口相同格式的结果，额外的reused字段表示是否复用了已打开的浏览器
+        """
+        user_id = str(user_id)
+        with self._user_lock(user_id):
+            session = self.get(user_id)
+            if session is not None:
+                if self.is_alive(session):
+                    self._count("reused")
+                    return self._result(session, reused=True)
+                self.remove(user_id)
+                self._count("stale_removed")
+                print(f"[API] 浏览器会话已失效，重新启动: {user_id}")
+
+            # 浏览器可能已由界面或AdsPower客户端打开
+            endpoint = active_browser_index.debug_endpoint(user_id)
+            if endpoint and endpoint.get("selenium"):
+                session = BrowserSession(user_id, {
+                    "ws": {"selenium": endpoint["selenium"], "puppeteer": endpoint.get("puppeteer", "")},
+                    "webdriver": endpoint.get("webdriver", ""),
+                    "debug_port": endpoint.get("debug_port", "")
+                })
+                if self.is_alive(session, force=True):
+                    with self._lock:
+                        self._sessions[user_id] = session
+                    self._count("adopted")
+                    return self._result(session, reused=True)
+
+            result = api_client.start_browser(user_id, **start_kwargs)
+            if result.get("code") != 0:
+                return result
+
+            self._count("started")
+            session = self.register(user_id, result.get("data") or {})
+            result = dict(result)
+            result["reused"] = False
+            return result
+
+    @staticmethod
+    def _result(session: BrowserSession, reused: bool) -> Dict[str, Any]:
+        return {"code": 0, "msg": "success", "data": session.to_start_data(), "reused": reused}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取复用统计"""
+        with self._lock:
+            stats = self.stats.copy()
+            stats["sessions"] = len(self._sessions)
+        total = stats["reused"] + stats["adopted"] + stats["started"]
+        stats["reuse_ratio"] = round((stats["reused"] + stats["adopted"]) / total, 4) if total else 0
+        return stats
+
+
+# 全局浏览器会话登记表 - 所有客户端和执行器共享
+browser_session_registry = BrowserSessionRegistry()
+active_browser_index.subscribe(browser_session_registry._on_browser_transition)
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+AdsPower API熔断器
+连续出现连接错误/超时后熔断，熔断期间请求立即失败，并在后台探测/status接口以自动恢复
+"""
+
+import threading
+import time
+import urllib.request
+from typing import Any, Callable, Dict, List
+
+
+class CircuitBreaker:
+    """熔断器 - 关闭(正常) / 打开(快速失败) / 半开(探测恢复)，线程安全"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 3, recovery_timeout: float = 5.0,
+                 max_recovery_timeout: float = 60.0, probe_timeout: float = 3.0):
+        self.failure_threshold = failure_threshold        # 连续失败多少次后熔断
+        self.recovery_timeout = recovery_timeout          # 熔断后首次探测的等待秒数
+        self.max_recovery_timeout = max_recovery_timeout  # 探测失败后等待时间翻倍的上限
+        self.probe_timeout = probe_timeout                # 探测请求超时
+
+        self._lock = threading.Lock()
+        self._closed_event = threading.Event()
+        self._closed_event.set()
+        self._listeners = []  # 状态变化回调 callback(old_state, new_state)
+
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.current_timeout = recovery_timeout
+        self.opened_at = None
+        self.next_probe_at = 0.0
+        self.probe_url = None
+        self._probing = False
+
+        self.stats = {
+            "failures": 0,      # 记录的连接失败次数
+            "rejected": 0,      # 熔断期间被快速拒绝的请求数
+            "opened": 0,        # 熔断次数
+            "probes": 0,        # 探测次数
+            "probe_failures": 0
+        }
+
+    # ==================== 配置 ====================
+
+    def set_probe_url(self, url: str):
+        """设置恢复探测地址（通常为 {base_url}/status）"""
+        with self._lock:
+            self.probe_url = url
+
+    def add_listener(self, callback: Callable[[str, str], None]):
+        """注册状态变化回调"""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[str, str], None]):
+        """移除状态变化回调"""
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    # ==================== 状态 ====================
+
+    def _set_state(self, new_state: str) -> List:
+        """切换状态（需持有锁），返回待通知的回调列表"""
+        old_state = self.state
+        if old_state == new_state:
+            return []
+        self.state = new_state
+        if new_state == self.CLOSED:
+            self._closed_event.set()
+        else:
+            self._closed_event.clear()
+        print(f"[API] 熔断器状态: {old_state} -> {new_state}")
+        return [(callback, old_state, new_state) for callback in list(self._listeners)]
+
+    def _notify(self, notifications: List):
+        for callback, old_state, new_state in notifications:
+            try:
+                callback(old_state, new_state)
+            except Exception as e:
+                print(f"[API] 熔断器回调错误: {e}")
+
+    def _open(self) -> List:
+        """进入打开状态（需持有锁）"""
+        now = time.monotonic()
+        if self.state == self.CLOSED:
+            self.stats["opened"] += 1
+            self.opened_at = now
+        self.next_probe_at = now + self.current_timeout
+        return self._set_state(self.OPEN)
+
+    def is_open(self) -> bool:
+        """是否处于熔断中（打开或半开），调度器据此暂停派发任务"""
+        return self.state != self.CLOSED
+
+    def get_state(self) -> str:
+        """获取当前状态"""
+        return self.state
+
+    def wait_until_closed(self, timeout: float = None) -> bool:
+        """阻塞直到熔断器恢复，返回是否已恢复（等待期间按时触发探测）"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            self._maybe_start_probe()
+            wait_time = 0.5 if deadline is None else min(0.5, deadline - time.monotonic())
+            if self._closed_event.wait(max(0.0, wait_time)):
+                return True
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+
+    # ==================== 请求接入 ====================
+
+    def allow_request(self) -> bool:
+        """请求前调用：关闭状态放行，熔断期间拒绝并按需触发后台探测"""
+        if self.state == self.CLOSED:
+            return True
+
+        notifications = []
+        allowed = False
+        with self._lock:
+            if self.state == self.CLOSED:
+                allowed = True
+            elif (self.state == self.OPEN and self.probe_url is None
+                  and time.monotonic() >= self.next_probe_at):
+                # 未配置探测地址时，放行一个真实请求作为试探
+                notifications = self._set_state(self.HALF_OPEN)
+                allowed = True
+            else:
+                self.stats["rejected"] += 1
+        self._notify(notifications)
+
+        if not allowed:
+            self._maybe_start_probe()
+        return allowed
+
+    def record_success(self):
+        """请求成功（收到HTTP响应）时调用"""
+        if self.state == self.CLOSED and self.consecutive_failures == 0:
+            return
+        with self._lock:
+            self.consecutive_failures = 0
+            self.current_timeout = self.recovery_timeout
+            notifications = self._set_state(self.CLOSED)
+        self._notify(notifications)
+
+    def record_failure(self):
+        """连接错误或超时时调用"""
+        notifications = []
+        with self._lock:
+            self.stats["failures"] += 1
+            self.consecutive_failures += 1
+            if self.state == self.HALF_OPEN:
+                self.current_timeout = min(self.max_recovery_timeout, self.current_timeout * 2)
+                notifications = self._open()
+            elif self.state == self.CLOSED and self.consecutive_failures >= self.failure_threshold:
+                notifications = self._open()
+        self._notify(notifications)
+
+    def reset(self):
+        """手动恢复为关闭状态"""
+        self.record_success()
+
+    # ==================== 恢复探测 ====================
+
+    def _maybe_start_probe(self):
+        """到达探测时间时启动后台探测线程"""
+        with self._lock:
+            if (self.state != self.OPEN or self._probing or self.probe_url is None
+                    or time.monotonic() < self.next_probe_at):
+                return
+            self._probing = True
+            probe_url = self.probe_url
+            notifications = self._set_state(self.HALF_OPEN)
+        self._notify(notifications)
+
+        thread = threading.Thread(target=self._probe, args=(probe_url,),
+                                  name="AdsPowerCircuitProbe", daemon=True)
+        thread.start()
+
+    def _probe(self, probe_url: str):
+        """探测/status接口，成功则关闭熔断，失败则延长等待后重新打开"""
+        self.stats["probes"] += 1
+        success = False
+        try:
+            with urllib.request.urlopen(probe_url, timeout=self.probe_timeout) as response:
+                success = response.status == 200
+        except Exception as e:
+            print(f"[API] 熔断探测失败: {e}")
+
+        with self._lock:
+            self._probing = False
+        if success:
+            print("[API] 熔断探测成功，API已恢复")
+            self.record_success()
+        else:
+            with self._lock:
+                self.stats["probe_failures"] += 1
+            self.record_failure()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取熔断器状态和统计"""
+        with self._lock:
+            stats = self.stats.copy()
+            stats.update({
+                "state": self.state,
+                "consecutive_failures": self.consecutive_failures,
+                "open_seconds": round(time.monotonic() - self.opened_at, 1)
+                if self.state != self.CLOSED and self.opened_at else 0,
+                "next_probe_in": round(max(0.0, self.next_probe_at - time.monotonic()), 1)
+                if self.state == self.OPEN else 0
+            })
+            return stats
+
+
+DEFAULT_BASE_URL = "http://local.adspower.net:50325"
+
+_breakers = {}  # API地址 -> 熔断器
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(base_url: str) -> CircuitBreaker:
+    """按API地址获取熔断器（同一地址的客户端共享），探测地址在创建时设置一次"""
+    base_url = base_url.rstrip('/')
+    with _breakers_lock:
+        breaker = _breakers.get(base_url)
+        if breaker is None:
+            breaker = CircuitBreaker()
+            breaker.set_probe_url(f"{base_url}/status")
+            _breakers[base_url] = breaker
+        return breaker
+
+
+# 默认API地址的熔断器 - 使用默认地址的客户端和调度器共享
+adspower_circuit_breaker = get_circuit_breaker(DEFAULT_BASE_URL)
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+AdsPower API请求指标
+按接口统计耗时分布、尝试次数、各原因的重试次数和退避等待时间，
+可通过get_metrics()读取，也可定期写入JSON文件；逐次请求日志默认关闭
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Optional, Sequence
+
+
+class LatencyHistogram:
+    """耗时直方图（秒），按固定边界分桶"""
+
+    DEFAULT_BOUNDS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+    def __init__(self, bounds: Sequence[float] = None):
+        self.bounds = tuple(bounds or self.DEFAULT_BOUNDS)
+        self.counts = [0] * (len(self.bounds) + 1)  # 最后一个桶为超出上限
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        index = len(self.bounds)
+        for i, bound in enumerate(self.bounds):
+            if value <= bound:
+                index = i
+                break
+        self.counts[index] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, q: float) -> float:
+        """按桶上界估算分位数"""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        cumulative = 0
+        for i, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= target:
+                return self.bounds[i] if i < len(self.bounds) else self.max
+        return self.max
+
+    def to_dict(self) -> Dict[str, Any]:
+        buckets = {f"<={bound}": count for bound, count in zip(self.bounds, self.counts)}
+        buckets["inf"] = self.counts[-1]
+        return {
+            "count": self.count,
+            "avg": round(self.total / self.count, 4) if self.count else 0,
+            "max": round(self.max, 4),
+            "p50": self.percentile(0.5),
+            "p90": self.percentile(0.9),
+            "p99": self.percentile(0.99),
+            "buckets": buckets
+        }
+
+
+class _EndpointMetrics:
+    """单个接口的指标"""
+
+    def __init__(self):
+        self.calls = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.latency = LatencyHistogram()          # 整次调用耗时（含重试和等待）
+        self.attempt_latency = LatencyHistogram()  # 单次HTTP往返耗时
+        self.attempts = {}                         # 尝试次数 -> 调用数
+        self.retries = {}                          # 重试原因 -> 次数
+        self.failures = {}                         # 最终失败原因 -> 次数
+        self.backoff_sleep = 0.0                   # 退避等待总秒数
+        self.rate_limit_wait = 0.0                 # 客户端限流等待总秒数
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "latency": self.latency.to_dict(),
+            "attempt_latency": self.attempt_latency.to_dict(),
+            "attempts": {str(k): v for k, v in sorted(self.attempts.items())},
+            "retries": dict(self.retries),
+            "failures": dict(self.failures),
+            "backoff_sleep": round(self.backoff_sleep, 3),
+            "rate_limit_wait": round(self.rate_limit_wait, 3)
+        }
+
+
+class APIMetrics:
+    """API指标收集器 - 线程安全"""
+
+    def __init__(self, verbose: bool = False):
+        self.verbose = verbose  # 为True时输出逐次请求日志（调试用）
+        self._lock = threading.Lock()
+        self._endpoints = {}    # endpoint -> _EndpointMetrics
+        self.started_at = time.time()
+
+        self._dump_thread = None
+        self._dump_stop = threading.Event()
+        self.dump_path = None
+
+    def _get(self, endpoint: str) -> _EndpointMetrics:
+        metrics = self._endpoints.get(endpoint)
+        if metrics is None:
+            metrics = self._endpoints[endpoint] = _EndpointMetrics()
+        return metrics
+
+    def log(self, message: str):
+        """逐次请求日志，仅在verbose时输出"""
+        if self.verbose:
+            print(f"[API] {message}")
+
+    # ==================== 记录 ====================
+
+    def record_attempt(self, endpoint: str, duration: float):
+        """记录一次HTTP往返耗时"""
+        with self._lock:
+            self._get(endpoint).attempt_latency.observe(duration)
+
+    def record_retry(self, endpoint: str, cause: str, sleep_seconds: float):
+        """记录一次重试及其退避等待时间"""
+        with self._lock:
+            metrics = self._get(endpoint)
+            metrics.retries[cause] = metrics.retries.get(cause, 0) + 1
+            metrics.backoff_sleep += sleep_seconds
+
+    def record_rate_limit_wait(self, endpoint: str, wait_seconds: float):
+        """记录客户端限流等待时间"""
+        if wait_seconds <= 0:
+            return
+        with self._lock:
+            self._get(endpoint).rate_limit_wait += wait_seconds
+
+    def record_call(self, endpoint: str, duration: float, attempts: int, failure_cause: Optional[str] = None):
+        """记录一次完整调用，failure_cause为None表示成功"""
+        with self._lock:
+            metrics = self._get(endpoint)
+            metrics.calls += 1
+            metrics.latency.observe(duration)
+            metrics.attempts[attempts] = metrics.attempts.get(attempts, 0) + 1
+            if failure_cause is None:
+                metrics.succeeded += 1
+            else:
+                metrics.failed += 1
+                metrics.failures[failure_cause] = metrics.failures.get(failure_cause, 0) + 1
+
+    # ==================== 读取 ====================
+
+    def get_metrics(self, endpoint: str = None) -> Dict[str, Any]:
+        """获取指标快照，指定endpoint时只返回该接口"""
+        with self._lock:
+            if endpoint is not None:
+                metrics = self._endpoints.get(endpoint)
+                return metrics.to_dict() if metrics else {}
+
+            endpoints = {name: metrics.to_dict() for name, metrics in self._endpoints.items()}
+            totals = {
+                "calls": sum(m.calls for m in self._endpoints.values()),
+                "failed": sum(m.failed for m in self._endpoints.values()),
+                "retries": sum(sum(m.retries.values()) for m in self._endpoints.values()),
+                "backoff_sleep": round(sum(m.backoff_sleep for m in self._endpoints.values()), 3),
+                "rate_limit_wait": round(sum(m.rate_limit_wait for m in self._endpoints.values()), 3)
+            }
+        return {
+            "since": self.started_at,
+            "generated_at": time.time(),
+            "totals": totals,
+            "endpoints": endpoints
+        }
+
+    def reset(self):
+        """清空指标"""
+        with self._lock:
+            self._endpoints.clear()
+            self.started_at = time.time()
+
+    # ==================== 定期写入文件 ====================
+
+    def dump(self, path: str = None):
+        """将当前指标写入JSON文件（先写临时文件再替换，避免读到半个文件）"""
+        path = path or self.dump_path
+        if not path:
+            return
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(self.get_metrics(), f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, path)
+
+    def start_periodic_dump(self, path: str, interval: float = 60):
+        """启动后台线程，每interval秒写入一次指标文件"""
+        self.stop_periodic_dump()
+        self.dump_path = path
+        self._dump_stop.clear()
+
+        def run():
+            while not self._dump_stop.wait(interval):
+                try:
+                    self.dump(path)
+                except Exception as e:
+                    print(f"[API] 写入指标文件失败: {e}")
+
+        self._dump_thread = threading.Thread(target=run, name="AdsPowerMetricsDump", daemon=True)
+        self._dump_thread.start()
+
+    def stop_periodic_dump(self, final_dump: bool = True):
+        """停止定期写入，默认停止前再写入一次"""
+        if self._dump_thread is None:
+            return
+        self._dump_stop.set()
+        self._dump_thread.join(timeout=5)
+        self._dump_thread = None
+        if final_dump:
+            try:
+                self.dump()
+            except Exception as e:
+                print(f"[API] 写入指标文件失败: {e}")
+
+
+# 全局API指标实例 - 同步和异步客户端共享
+adspower_metrics = APIMetrics()
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+AdsPower API频率限制器
+进程级令牌桶限流，按接口类别分别配置速率和突发量，并根据频率限制反馈自动调节
+"""
+
+import threading
+import time
+from typing import Dict, Any, Optional
+
+
+class TokenBucket:
+    """令牌桶 - 线程安全，采用预约方式分配令牌"""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self.tokens = float(burst)
+        self.last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        """按经过的时间补充令牌"""
+        elapsed = now - self.last_refill
+        if elapsed > 0:
+            self.tokens = min(self.burst, self.tokens + elapsed * self.rate)
+            self.last_refill = now
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """预约令牌，返回调用方需要等待的秒数（0表示可立即执行）"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.tokens -= tokens
+            if self.tokens >= 0:
+                return 0.0
+            # 令牌不足时记为欠账，后续请求依次排队，保证多线程下总速率不超限
+            return -self.tokens / self.rate
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """令牌充足时立即扣除并返回True，不足时返回False（不记欠账）"""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                return True
+            return False
+
+    def set_rate(self, rate: float):
+        """调整补充速率（先按旧速率结算已过去的时间）"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = float(rate)
+
+    def set_burst(self, burst: float):
+        """调整桶容量"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.burst = float(burst)
+            self.tokens = min(self.tokens, self.burst)
+
+
+class AdsPowerRateLimiter:
+    """AdsPower API频率限制器 - 进程内所有客户端共享"""
+
+    # 各接口类别的默认速率（请求/秒）和突发量
+    DEFAULT_LIMITS = {
+        "browser": {"rate": 2.0, "burst": 2},   # 浏览器启动/关闭
+        "list": {"rate": 2.0, "burst": 4},      # 环境列表、分组列表
+        "status": {"rate": 5.0, "burst": 10},   # API状态、浏览器状态
+        "default": {"rate": 2.0, "burst": 2}    # 其他接口
+    }
+
+    # 接口路径 -> 类别（按前缀匹配，越具体的越靠前）
+    ENDPOINT_CLASSES = [
+        ("/api/v1/browser/start", "browser"),
+        ("/api/v1/browser/stop", "browser"),
+        ("/api/v1/browser/active", "status"),
+        ("/status", "status"),
+        ("/api/v1/user/list", "list"),
+        ("/api/v1/group/list", "list")
+    ]
+
+    def __init__(self, limits: Dict[str, Dict[str, float]] = None,
+                 backoff_factor: float = 0.5, recovery_factor: float = 1.1,
+                 recovery_threshold: int = 20, min_rate: float = 0.2):
+        self.backoff_factor = backoff_factor          # 触发频率限制后速率乘以该系数
+        self.recovery_factor = recovery_factor        # 连续成功后速率乘以该系数
+        self.recovery_threshold = recovery_threshold  # 连续成功多少次后回升一次
+        self.min_rate = min_rate                      # 自动退避的速率下限
+
+        self._lock = threading.Lock()
+        self.max_rates = {}   # 类别 -> 配置的最大速率
+        self.buckets = {}     # 类别 -> TokenBucket
+        self.stats = {}       # 类别 -> 统计信息
+
+        merged = {name: dict(value) for name, value in self.DEFAULT_LIMITS.items()}
+        for name, value in (limits or {}).items():
+            merged.setdefault(name, {}).update(value)
+        for name, value in merged.items():
+            self.configure(name, value.get("rate"), value.get("burst"))
+
+    def classify(self, endpoint: str) -> str:
+        """获取接口所属类别"""
+        for prefix, endpoint_class in self.ENDPOINT_CLASSES:
+            if endpoint.startswith(prefix):
+                return endpoint_class
+        return "default"
+
+    def configure(self, endpoint_class: str, rate: float = None, burst: float = None):
+        """配置某类接口的速率和突发量"""
+        with self._lock:
+            defaults = self.DEFAULT_LIMITS["default"]
+            bucket = self.buckets.get(endpoint_class)
+            if bucket is None:
+                rate = rate or defaults["rate"]
+                burst = burst or max(1, rate)
+                self.buckets[endpoint_class] = TokenBucket(rate, burst)
+                self.max_rates[endpoint_class] = float(rate)
+                self.stats[endpoint_class] = {
+                    "requests": 0,
+                    "rate_limited": 0,
+                    "total_wait": 0.0,
+                    "success_streak": 0
+                }
+                return
+
+            if rate:
+                self.max_rates[endpoint_class] = float(rate)
+                bucket.set_rate(rate)
+                self.stats[endpoint_class]["success_streak"] = 0
+            if burst:
+                bucket.set_burst(burst)
+
+    def configure_from_dict(self, limits: Dict[str, Dict[str, float]]):
+        """从配置字典批量设置，格式同DEFAULT_LIMITS"""
+        for name, value in (limits or {}).items():
+            if isinstance(value, dict):
+                self.configure(name, value.get("rate"), value.get("burst"))
+
+    def _get_bucket(self, endpoint_class: str) -> TokenBucket:
+        bucket = self.buckets.get(endpoint_class)
+        if bucket is None:
+            bucket = self.buckets["default"]
+        return bucket
+
+    def reserve(self, endpoint: str) -> float:
+        """为一次请求预约令牌，返回需要等待的秒数（供异步客户端使用）"""
+        endpoint_class = self.classify(endpoint)
+        wait_time = self._get_bucket(endpoint_class).reserve()
+        with self._lock:
+            stats = self.stats.get(endpoint_class, self.stats["default"])
+            stats["requests"] += 1
+            stats["total_wait"] += wait_time
+        return wait_time
+
+    def acquire(self, endpoint: str) -> float:
+        """阻塞直到允许发送请求，返回实际等待的秒数"""
+        wait_time = self.reserve(endpoint)
+        if wait_time > 0:
+            time.sleep(wait_time)
+        return wait_time
+
+    def on_rate_limited(self, endpoint: str):
+        """收到"Too many request"时调用：降低该类接口速率"""
+        endpoint_class = self.classify(endpoint)
+        bucket = self._get_bucket(endpoint_class)
+        with self._lock:
+            stats = self.stats.get(endpoint_class, self.stats["default"])
+            stats["rate_limited"] += 1
+            stats["success_streak"] = 0
+            new_rate = max(self.min_rate, bucket.rate * self.backoff_factor)
+        bucket.set_rate(new_rate)
+
+    def on_success(self, endpoint: str):
+        """请求成功时调用：连续成功达到阈值后逐步恢复速率"""
+        endpoint_class = self.classify(endpoint)
+        bucket = self._get_bucket(endpoint_class)
+        with self._lock:
+            stats = self.stats.get(endpoint_class, self.stats["default"])
+            max_rate = self.max_rates.get(endpoint_class, self.max_rates["default"])
+            if bucket.rate >= max_rate:
+                stats["success_streak"] = 0
+                return
+            stats["success_streak"] += 1
+            if stats["success_streak"] < self.recovery_threshold:
+                return
+            stats["success_streak"] = 0
+            new_rate = min(max_rate, bucket.rate * self.recovery_factor)
+        bucket.set_rate(new_rate)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取各类接口的限流状态"""
+        with self._lock:
+            return {
+                name: {
+                    "rate": round(self.buckets[name].rate, 3),
+                    "max_rate": self.max_rates[name],
+                    "burst": self.buckets[name].burst,
+                    "requests": stats["requests"],
+                    "rate_limited": stats["rate_limited"],
+                    "total_wait": round(stats["total_wait"], 3)
+                }
+                for name, stats in self.stats.items()
+            }
+
+
+# 全局频率限制器实例 - 所有AdsPowerAPIClient共享
+adspower_rate_limiter = AdsPowerRateLimiter()
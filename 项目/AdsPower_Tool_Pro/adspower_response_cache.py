@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+AdsPower API响应缓存
+按资源类型设置TTL，按条目数和估算内存上限做LRU淘汰，写操作成功后由客户端主动失效
+"""
+
+import copy
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+
+class ResponseCache:
+    """API响应缓存 - 线程安全"""
+
+    # 各资源默认缓存时间（秒）
+    DEFAULT_TTLS = {
+        "profile_detail": 60,  # 单个环境详情
+        "profiles": 15,        # 环境列表分页
+        "groups": 120          # 分组列表
+    }
+
+    def __init__(self, ttls: Dict[str, float] = None, max_entries: int = 5000,
+                 max_bytes: int = 32 * 1024 * 1024):
+        self.ttls = dict(self.DEFAULT_TTLS)
+        self.ttls.update(ttls or {})
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes  # 按JSON长度估算的内存上限
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # (resource, key) -> (expires_at, value, size)
+        self.total_bytes = 0
+
+        self.stats = {}
+        self.evictions = 0
+        self.invalidations = 0
+
+    def _resource_stats(self, resource: str) -> Dict[str, int]:
+        stats = self.stats.get(resource)
+        if stats is None:
+            stats = self.stats[resource] = {"hits": 0, "misses": 0}
+        return stats
+
+    def _remove(self, entry_key):
+        _, _, size = self._entries.pop(entry_key)
+        self.total_bytes -= size
+
+    def get(self, resource: str, key: Hashable = None) -> Optional[Any]:
+        """读取缓存，未命中或已过期返回None（返回副本，调用方可自由修改）"""
+        entry_key = (resource, key)
+        with self._lock:
+            stats = self._resource_stats(resource)
+            entry = self._entries.get(entry_key)
+            if entry is None:
+                stats["misses"] += 1
+                return None
+            expires_at, value, _ = entry
+            if expires_at <= time.monotonic():
+                self._remove(entry_key)
+                stats["misses"] += 1
+                return None
+            self._entries.move_to_end(entry_key)
+            stats["hits"] += 1
+        return copy.deepcopy(value)
+
+    def put(self, resource: str, key: Hashable, value: Any, ttl: float = None):
+        """写入缓存，超出容量时淘汰最久未使用的条目"""
+        ttl = self.ttls.get(resource, 30) if ttl is None else ttl
+        if ttl <= 0:
+            return
+        try:
+            size = len(json.dumps(value, ensure_ascii=False, default=str))
+        except (TypeError, ValueError):
+            size = 0
+        if size > self.max_bytes:
+            return
+
+        value = copy.deepcopy(value)
+        entry_key = (resource, key)
+        with self._lock:
+            if entry_key in self._entries:
+                self._remove(entry_key)
+            self._entries[entry_key] = (time.monotonic() + ttl, value, size)
+            self.total_bytes += size
+
+            while self._entries and (len(self._entries) > self.max_entries or
+                                     self.total_bytes > self.max_bytes):
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+
+    def invalidate(self, resource: str, key: Hashable = None):
+        """失效缓存：指定key只失效该条目，key为None时失效整个资源"""
+        with self._lock:
+            if key is not None:
+                if (resource, key) in self._entries:
+                    self._remove((resource, key))
+                    self.invalidations += 1
+                return
+
+            for entry_key in [k for k in self._entries if k[0] == resource]:
+                self._remove(entry_key)
+                self.invalidations += 1
+
+    def clear(self):
+        """清空缓存"""
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取命中统计和容量信息"""
+        with self._lock:
+            resources = {}
+            for resource, stats in self.stats.items():
+                total = stats["hits"] + stats["misses"]
+                resources[resource] = {
+                    "hits": stats["hits"],
+                    "misses": stats["misses"],
+                    "hit_rate": round(stats["hits"] / total, 4) if total else 0
+                }
+            return {
+                "resources": resources,
+                "entries": len(self._entries),
+                "estimated_bytes": self.total_bytes,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations
+            }
+
+
+# 全局响应缓存实例 - 所有AdsPowerAPIClient共享，任一客户端的写操作都会使其失效
+adspower_response_cache = ResponseCache()
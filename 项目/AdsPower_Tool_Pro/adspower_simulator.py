@@ -0,0 +1,611 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+AdsPower Local API模拟服务器
+无需安装AdsPower即可测试AdsPowerAPIClient、RPAThreadManager、RPABatchManager，
+支持可配置的延迟分布、错误注入、频率限制注入和上万个环境数据（以data/profiles.json为模板生成）
+
+用法示例:
+    python adspower_simulator.py --port 50325 --profiles 10000 \\
+        --latency list=uniform:0.05,0.2 --latency browser_start=normal:2.5,0.5 \\
+        --rate-limit 1 --error-rate 0.01
+"""
+
+import argparse
+import copy
+import json
+import os
+import random
+import socket
+import string
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+from adspower_rate_limiter import TokenBucket
+
+
+RATE_LIMIT_MSG = "Too many request per second, please check"
+
+
+def parse_latency(spec: str) -> Callable[[], float]:
+    """解析延迟分布描述，返回生成延迟秒数的函数
+
+    支持: fixed:0.05 / uniform:0.02,0.2 / normal:均值,标准差 / lognormal:mu,sigma / exp:均值
+    """
+    kind, _, args = spec.partition(":")
+    values = [float(v) for v in args.split(",") if v.strip()] if args else []
+    kind = kind.strip().lower()
+
+    if kind == "fixed":
+        value = values[0] if values else 0.0
+        return lambda: value
+    if kind == "uniform":
+        low, high = values
+        return lambda: random.uniform(low, high)
+    if kind == "normal":
+        mean, std = values
+        return lambda: max(0.0, random.gauss(mean, std))
+    if kind == "lognormal":
+        mu, sigma = values
+        return lambda: random.lognormvariate(mu, sigma)
+    if kind == "exp":
+        mean = values[0]
+        return lambda: random.expovariate(1.0 / mean) if mean > 0 else 0.0
+    raise ValueError(f"不支持的延迟分布: {spec}")
+
+
+def _rpa_status_handler(status: str) -> Callable:
+    """生成修改RPA任务状态的接口处理函数"""
+    def handler(simulator, params):
+        task = simulator.rpa_tasks.get(str(params.get("task_id", "")))
+        if task is None:
+            return {"code": -1, "msg": "task_id is not exist"}
+        task["status"] = status
+        return simulator._ok()
+    return handler
+
+
+class AdsPowerSimulator:
+    """AdsPower Local API模拟器 - 内存中维护环境、分组、浏览器和RPA任务状态"""
+
+    # 接口路径 -> 延迟类别
+    LATENCY_CLASSES = {
+        "/status": "status",
+        "/api/v1/browser/start": "browser_start",
+        "/api/v1/browser/stop": "browser_stop",
+        "/api/v1/browser/active": "status",
+        "/api/v1/browser/active/list": "status",
+        "/api/v1/user/list": "list",
+        "/api/v1/group/list": "list"
+    }
+
+    DEFAULT_LATENCY = {
+        "status": "fixed:0.005",
+        "list": "uniform:0.02,0.08",
+        "browser_start": "normal:2.0,0.5",
+        "browser_stop": "uniform:0.3,0.8",
+        "default": "uniform:0.01,0.05"
+    }
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 50325, profile_count: int = 10000,
+                 seed_file: str = None, latency: Dict[str, str] = None,
+                 rate_limit: float = 0, rate_burst: float = 1,
+                 error_rate: float = 0, drop_rate: float = 0, hang_rate: float = 0,
+                 hang_seconds: float = 90, api_key: str = "", listen_debug_ports: bool = True,
+                 random_seed: int = None):
+        self.host = host
+        self.port = port
+        self.api_key = api_key
+        self.error_rate = error_rate        # 返回HTTP 500的概率
+        self.drop_rate = drop_rate          # 直接断开连接的概率（客户端表现为连接错误）
+        self.hang_rate = hang_rate          # 长时间不响应的概率（客户端表现为超时）
+        self.hang_seconds = hang_seconds
+        self.listen_debug_ports = listen_debug_ports  # 为启动的浏览器监听真实调试端口，便于存活检查
+        self.random = random.Random(random_seed)
+
+        latency_specs = dict(self.DEFAULT_LATENCY)
+        latency_specs.update(latency or {})
+        self.latency_specs = latency_specs
+        self.latency = {name: parse_latency(spec) for name, spec in latency_specs.items()}
+
+        # 频率限制 - AdsPower按接口计数，超出时返回code=-1的"Too many request"
+        self.rate_limit = rate_limit
+        self.rate_burst = rate_burst
+        self._buckets = {}
+
+        self._lock = threading.RLock()
+        self.profiles = {}        # user_id -> profile（保持插入顺序）
+        self.groups = {}          # group_id -> group
+        self.active_browsers = {} # user_id -> 浏览器信息
+        self._debug_sockets = {}  # user_id -> socket
+        self.rpa_tasks = {}       # task_id -> task
+        self._next_serial = 1
+
+        self.stats = {
+            "requests": 0,
+            "by_endpoint": {},
+            "rate_limited": 0,
+            "errors_injected": 0,
+            "drops_injected": 0,
+            "hangs_injected": 0
+        }
+
+        self._seed_profiles(seed_file, profile_count)
+
+        self.server = None
+        self._thread = None
+
+    # ==================== 数据 ====================
+
+    def _random_id(self, length: int = 8) -> str:
+        return "".join(self.random.choice(string.ascii_lowercase + string.digits) for _ in range(length))
+
+    def _seed_profiles(self, seed_file: Optional[str], profile_count: int):
+        """以profiles.json为模板生成指定数量的环境"""
+        if seed_file is None:
+            seed_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "profiles.json")
+
+        templates = []
+        if seed_file and os.path.exists(seed_file):
+            try:
+                with open(seed_file, "r", encoding="utf-8") as f:
+                    templates = json.load(f)
+            except Exception as e:
+                print(f"[模拟器] 读取种子数据失败: {e}")
+        if not templates:
+            templates = [{"name": "profile", "group_id": "0", "group_name": "未分组",
+                          "domain_name": "", "ip": "", "remark": "", "last_open_time": "0"}]
+
+        for template in templates:
+            group_id = str(template.get("group_id", "0"))
+            if group_id not in self.groups:
+                self.groups[group_id] = {
+                    "group_id": group_id,
+                    "group_name": template.get("group_name", f"分组{group_id}"),
+                    "remark": ""
+                }
+
+        for index in range(profile_count):
+            profile = copy.deepcopy(templates[index % len(templates)])
+            # 前len(templates)个保留原始user_id，其余生成新的
+            if index >= len(templates) or not profile.get("user_id"):
+                profile["user_id"] = self._random_id()
+                profile["name"] = f"{profile.get('name', 'profile')}-{index}"
+            profile["serial_number"] = str(self._next_serial)
+            self._next_serial += 1
+            self.profiles[profile["user_id"]] = profile
+
+    # ==================== 注入 ====================
+
+    def _latency_class(self, path: str) -> str:
+        return self.LATENCY_CLASSES.get(path, "default")
+
+    def _is_rate_limited(self, path: str) -> bool:
+        if self.rate_limit <= 0:
+            return False
+        with self._lock:
+            bucket = self._buckets.get(path)
+            if bucket is None:
+                bucket = self._buckets[path] = TokenBucket(self.rate_limit, self.rate_burst)
+        return not bucket.try_acquire()
+
+    def sleep_latency(self, path: str):
+        generator = self.latency.get(self._latency_class(path)) or self.latency["default"]
+        delay = generator()
+        if delay > 0:
+            time.sleep(delay)
+
+    def pick_fault(self) -> Optional[str]:
+        """按配置概率决定本次请求注入的故障类型"""
+        roll = self.random.random()
+        for fault, rate in (("drop", self.drop_rate), ("hang", self.hang_rate), ("error", self.error_rate)):
+            if roll < rate:
+                return fault
+            roll -= rate
+        return None
+
+    def _count(self, path: str, key: str = None):
+        with self._lock:
+            if key:
+                self.stats[key] += 1
+                return
+            self.stats["requests"] += 1
+            self.stats["by_endpoint"][path] = self.stats["by_endpoint"].get(path, 0) + 1
+
+    # ==================== 请求分发 ====================
+
+    def handle(self, method: str, path: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """处理一次API请求，返回JSON响应"""
+        if self.api_key and params.get("api_key") != self.api_key and path != "/status":
+            return {"code": -1, "msg": "api_key is invalid"}
+
+        if path != "/sim/stats" and self._is_rate_limited(path):
+            self._count(path, "rate_limited")
+            return {"code": -1, "msg": RATE_LIMIT_MSG}
+
+        handler = self.ROUTES.get((method, path)) or self.ROUTES.get(("*", path))
+        if handler is None:
+            return None
+        with self._lock:
+            return handler(self, params)
+
+    @staticmethod
+    def _ok(data: Any = None) -> Dict[str, Any]:
+        result = {"code": 0, "msg": "success"}
+        if data is not None:
+            result["data"] = data
+        return result
+
+    @staticmethod
+    def _ids(params: Dict[str, Any], key: str = "user_ids", single_key: str = "user_id") -> List[str]:
+        ids = params.get(key) or []
+        if isinstance(ids, str):
+            ids = [i for i in ids.split(",") if i]
+        if params.get(single_key):
+            ids = list(ids) + [str(params[single_key])]
+        return [str(i) for i in ids]
+
+    def _status(self, params):
+        return self._ok()
+
+    def _user_list(self, params):
+        page = max(1, int(params.get("page", 1) or 1))
+        page_size = max(1, min(100, int(params.get("page_size", 100) or 100)))
+        group_id = str(params.get("group_id", "") or "")
+        user_id = str(params.get("user_id", "") or "")
+        search = str(params.get("search", "") or "")
+
+        if user_id:
+            profiles = [self.profiles[user_id]] if user_id in self.profiles else []
+        else:
+            profiles = self.profiles.values()
+            if group_id:
+                profiles = [p for p in profiles if str(p.get("group_id")) == group_id]
+            if search:
+                profiles = [p for p in profiles
+                            if search in str(p.get("name", "")) or search in str(p.get("remark", ""))]
+            profiles = list(profiles)
+
+        start = (page - 1) * page_size
+        return self._ok({"list": copy.deepcopy(profiles[start:start + page_size]),
+                         "page": page, "page_size": page_size})
+
+    def _user_create(self, params):
+        user_id = self._random_id()
+        profile = {key: value for key, value in params.items() if key != "api_key"}
+        profile.update({"user_id": user_id, "serial_number": str(self._next_serial),
+                        "created_time": str(int(time.time())), "last_open_time": "0"})
+        group = self.groups.get(str(profile.get("group_id", "")))
+        profile["group_name"] = group["group_name"] if group else ""
+        self._next_serial += 1
+        self.profiles[user_id] = profile
+        return self._ok({"id": user_id, "serial_number": profile["serial_number"]})
+
+    def _user_update(self, params):
+        user_id = str(params.get("user_id", ""))
+        if user_id not in self.profiles:
+            return {"code": -1, "msg": "user_id is not exist"}
+        self.profiles[user_id].update({k: v for k, v in params.items() if k not in ("api_key", "user_id")})
+        return self._ok()
+
+    def _user_delete(self, params):
+        for user_id in self._ids(params):
+            self.profiles.pop(user_id, None)
+            self._stop_browser(user_id)
+        return self._ok()
+
+    def _user_move(self, params):
+        group_id = str(params.get("group_id", ""))
+        if group_id not in self.groups:
+            return {"code": -1, "msg": "group_id is not exist"}
+        for user_id in self._ids(params):
+            if user_id in self.profiles:
+                self.profiles[user_id]["group_id"] = group_id
+                self.profiles[user_id]["group_name"] = self.groups[group_id]["group_name"]
+        return self._ok()
+
+    def _browser_info(self, user_id: str, port: int) -> Dict[str, Any]:
+        return {
+            "ws": {
+                "selenium": f"127.0.0.1:{port}",
+                "puppeteer": f"ws://127.0.0.1:{port}/devtools/browser/{uuid.uuid4()}"
+            },
+            "debug_port": str(port),
+            "webdriver": ""
+        }
+
+    def _allocate_port(self, user_id: str) -> int:
+        if self.listen_debug_ports:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.bind(("127.0.0.1", 0))
+            sock.listen(16)
+            self._debug_sockets[user_id] = sock
+            return sock.getsockname()[1]
+        return 20000 + len(self.active_browsers)
+
+    def _browser_start(self, params):
+        user_id = str(params.get("user_id", ""))
+        if user_id not in self.profiles:
+            return {"code": -1, "msg": "user_id is not exist"}
+        if user_id not in self.active_browsers:
+            self.active_browsers[user_id] = self._browser_info(user_id, self._allocate_port(user_id))
+            self.profiles[user_id]["last_open_time"] = str(int(time.time()))
+        return self._ok(copy.deepcopy(self.active_browsers[user_id]))
+
+    def _stop_browser(self, user_id: str):
+        self.active_browsers.pop(user_id, None)
+        sock = self._debug_sockets.pop(user_id, None)
+        if sock:
+            sock.close()
+
+    def _browser_stop(self, params):
+        user_id = str(params.get("user_id", ""))
+        if user_id not in self.profiles:
+            return {"code": -1, "msg": "user_id is not exist"}
+        self._stop_browser(user_id)
+        return self._ok()
+
+    def _browser_active(self, params):
+        user_id = str(params.get("user_id", ""))
+        if user_id in self.active_browsers:
+            data = copy.deepcopy(self.active_browsers[user_id])
+            data["status"] = "Active"
+            return self._ok(data)
+        return self._ok({"status": "Inactive"})
+
+    def _browser_active_list(self, params):
+        browsers = []
+        for user_id, info in self.active_browsers.items():
+            item = copy.deepcopy(info)
+            item["user_id"] = user_id
+            browsers.append(item)
+        return self._ok({"list": browsers})
+
+    def _group_list(self, params):
+        page = max(1, int(params.get("page", 1) or 1))
+        page_size = max(1, int(params.get("page_size", 2000) or 2000))
+        groups = list(self.groups.values())
+        start = (page - 1) * page_size
+        return self._ok({"list": copy.deepcopy(groups[start:start + page_size]),
+                         "page": page, "page_size": page_size})
+
+    def _group_create(self, params):
+        group_id = str(max([int(g) for g in self.groups if g.isdigit()] or [0]) + 1)
+        self.groups[group_id] = {"group_id": group_id, "group_name": params.get("group_name", ""),
+                                 "remark": params.get("remark", "")}
+        return self._ok({"group_id": group_id, "group_name": params.get("group_name", "")})
+
+    def _group_update(self, params):
+        group_id = str(params.get("group_id", ""))
+        if group_id not in self.groups:
+            return {"code": -1, "msg": "group_id is not exist"}
+        for key in ("group_name", "remark"):
+            if key in params:
+                self.groups[group_id][key] = params[key]
+        for profile in self.profiles.values():
+            if str(profile.get("group_id")) == group_id:
+                profile["group_name"] = self.groups[group_id]["group_name"]
+        return self._ok()
+
+    def _group_delete(self, params):
+        group_id = str(params.get("group_id", ""))
+        if any(str(p.get("group_id")) == group_id for p in self.profiles.values()):
+            return {"code": -1, "msg": "group is not empty"}
+        self.groups.pop(group_id, None)
+        return self._ok()
+
+    def _rpa_create(self, params):
+        task_id = self._random_id(12)
+        self.rpa_tasks[task_id] = {"task_id": task_id, "status": "created",
+                                   "config": {k: v for k, v in params.items() if k != "api_key"}}
+        return self._ok({"task_id": task_id})
+
+    def _rpa_status(self, params):
+        task = self.rpa_tasks.get(str(params.get("task_id", "")))
+        if task is None:
+            return {"code": -1, "msg": "task_id is not exist"}
+        return self._ok({"task_id": task["task_id"], "status": task["status"]})
+
+    def _rpa_list(self, params):
+        return self._ok({"list": [{"task_id": t["task_id"], "status": t["status"]}
+                                  for t in self.rpa_tasks.values()]})
+
+    def _account_info(self, params):
+        return self._ok({"user_name": "simulator", "profile_count": len(self.profiles)})
+
+    def _system_info(self, params):
+        return self._ok({"version": "simulator", "active_browsers": len(self.active_browsers)})
+
+    def _sim_stats(self, params):
+        return self._ok(self.get_stats())
+
+    ROUTES = {
+        ("*", "/status"): _status,
+        ("GET", "/api/v1/user/list"): _user_list,
+        ("POST", "/api/v1/user/create"): _user_create,
+        ("POST", "/api/v1/user/update"): _user_update,
+        ("POST", "/api/v1/user/delete"): _user_delete,
+        ("POST", "/api/v1/user/move"): _user_move,
+        ("GET", "/api/v1/browser/start"): _browser_start,
+        ("GET", "/api/v1/browser/stop"): _browser_stop,
+        ("GET", "/api/v1/browser/active"): _browser_active,
+        ("GET", "/api/v1/browser/active/list"): _browser_active_list,
+        ("GET", "/api/v1/group/list"): _group_list,
+        ("POST", "/api/v1/group/create"): _group_create,
+        ("POST", "/api/v1/group/update"): _group_update,
+        ("POST", "/api/v1/group/delete"): _group_delete,
+        ("POST", "/api/v1/rpa/task/create"): _rpa_create,
+        ("POST", "/api/v1/rpa/task/start"): _rpa_status_handler("running"),
+        ("POST", "/api/v1/rpa/task/pause"): _rpa_status_handler("paused"),
+        ("POST", "/api/v1/rpa/task/resume"): _rpa_status_handler("running"),
+        ("POST", "/api/v1/rpa/task/stop"): _rpa_status_handler("stopped"),
+        ("GET", "/api/v1/rpa/task/status"): _rpa_status,
+        ("GET", "/api/v1/rpa/task/list"): _rpa_list,
+        ("GET", "/api/v1/account/info"): _account_info,
+        ("GET", "/api/v1/system/info"): _system_info,
+        ("GET", "/sim/stats"): _sim_stats
+    }
+
+    # ==================== 服务器 ====================
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def start(self):
+        """在后台线程启动服务器（port为0时自动分配端口）"""
+        self.server = ThreadingHTTPServer((self.host, self.port), _SimulatorRequestHandler)
+        self.server.daemon_threads = True
+        self.server.simulator = self
+        self.port = self.server.server_address[1]
+        self._thread = threading.Thread(target=self.server.serve_forever, name="AdsPowerSimulator", daemon=True)
+        self._thread.start()
+        print(f"[模拟器] 已启动: {self.url}，环境数 {len(self.profiles)}，分组数 {len(self.groups)}")
+        return self
+
+    def stop(self):
+        """停止服务器并释放调试端口"""
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+        with self._lock:
+            for user_id in list(self.active_browsers):
+                self._stop_browser(user_id)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取请求统计"""
+        with self._lock:
+            stats = copy.deepcopy(self.stats)
+            stats.update({
+                "profiles": len(self.profiles),
+                "groups": len(self.groups),
+                "active_browsers": len(self.active_browsers)
+            })
+            return stats
+
+
+class _SimulatorRequestHandler(BaseHTTPRequestHandler):
+    """HTTP请求处理 - 解析查询参数和JSON请求体后交给AdsPowerSimulator"""
+
+    protocol_version = "HTTP/1.1"
+
+    def _handle(self, method: str):
+        simulator = self.server.simulator
+        parsed = urlparse(self.path)
+        path = parsed.path.rstrip("/") or "/"
+        params = {key: values[-1] for key, values in parse_qs(parsed.query).items()}
+
+        length = int(self.headers.get("Content-Length", 0) or 0)
+        if length:
+            try:
+                body = json.loads(self.rfile.read(length).decode("utf-8"))
+                if isinstance(body, dict):
+                    params.update(body)
+            except (ValueError, UnicodeDecodeError):
+                self._send(400, {"code": -1, "msg": "invalid json"})
+                return
+
+        simulator._count(path)
+        simulator.sleep_latency(path)
+
+        fault = simulator.pick_fault() if path != "/sim/stats" else None
+        if fault == "drop":
+            simulator._count(path, "drops_injected")
+            self.close_connection = True
+            self.connection.shutdown(socket.SHUT_RDWR)
+            return
+        if fault == "hang":
+            simulator._count(path, "hangs_injected")
+            time.sleep(simulator.hang_seconds)
+        if fault == "error":
+            simulator._count(path, "errors_injected")
+            self._send(500, {"code": -1, "msg": "internal server error (injected)"})
+            return
+
+        result = simulator.handle(method, path, params)
+        if result is None:
+            self._send(404, {"code": -1, "msg": f"not found: {path}"})
+        else:
+            self._send(200, result)
+
+    def _send(self, status: int, payload: Dict[str, Any]):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def log_message(self, format, *args):
+        # 默认不输出每个请求的访问日志，避免刷屏
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AdsPower Local API模拟服务器")
+    parser.add_argument("--host", default="127.0.0.1", help="监听地址")
+    parser.add_argument("--port", type=int, default=50325, help="监听端口（0为自动分配）")
+    parser.add_argument("--profiles", type=int, default=10000, help="生成的环境数量")
+    parser.add_argument("--seed-file", default=None, help="环境模板文件，默认data/profiles.json")
+    parser.add_argument("--latency", action="append", default=[], metavar="类别=分布",
+                        help="延迟分布，类别为status/list/browser_start/browser_stop/default，"
+                             "例如 list=uniform:0.05,0.2，可重复指定")
+    parser.add_argument("--rate-limit", type=float, default=0, help="每个接口每秒允许的请求数（0为不限制）")
+    parser.add_argument("--rate-burst", type=float, default=1, help="频率限制的突发量")
+    parser.add_argument("--error-rate", type=float, default=0, help="返回HTTP 500的概率")
+    parser.add_argument("--drop-rate", type=float, default=0, help="直接断开连接的概率")
+    parser.add_argument("--hang-rate", type=float, default=0, help="长时间不响应的概率")
+    parser.add_argument("--hang-seconds", type=float, default=90, help="不响应时的挂起秒数")
+    parser.add_argument("--api-key", default="", help="要求请求携带的api_key（为空不校验）")
+    parser.add_argument("--no-debug-ports", action="store_true", help="启动浏览器时不监听真实调试端口")
+    parser.add_argument("--random-seed", type=int, default=None, help="随机种子，便于复现")
+    args = parser.parse_args()
+
+    latency = {}
+    for item in args.latency:
+        name, _, spec = item.partition("=")
+        parse_latency(spec)  # 提前校验格式
+        latency[name.strip()] = spec.strip()
+
+    simulator = AdsPowerSimulator(
+        host=args.host, port=args.port, profile_count=args.profiles, seed_file=args.seed_file,
+        latency=latency, rate_limit=args.rate_limit, rate_burst=args.rate_burst,
+        error_rate=args.error_rate, drop_rate=args.drop_rate, hang_rate=args.hang_rate,
+        hang_seconds=args.hang_seconds, api_key=args.api_key,
+        listen_debug_ports=not args.no_debug_ports, random_seed=args.random_seed
+    )
+    simulator.start()
+    print("[模拟器] 按 Ctrl+C 停止，统计信息: GET /sim/stats")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        simulator.stop()
+        print(f"[模拟器] 已停止，统计: {json.dumps(simulator.get_stats()['by_endpoint'], ensure_ascii=False)}")
+
+
+if __name__ == "__main__":
+    main()
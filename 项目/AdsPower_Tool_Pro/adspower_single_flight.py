@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+AdsPower API请求合并
+同一时刻发起的相同读请求只发送一次，结果分发给所有等待者
+"""
+
+import asyncio
+import copy
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class _InFlightCall:
+    """正在执行中的一次请求"""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """请求合并组 - 相同key的并发调用共享同一次执行结果"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}  # key -> _InFlightCall
+        self.stats = {
+            "calls": 0,       # 总调用次数
+            "executed": 0,    # 实际执行次数
+            "coalesced": 0    # 被合并（节省）的调用次数
+        }
+
+    def do(self, key: Hashable, func: Callable[[], Any]) -> Any:
+        """执行func；若相同key的调用正在进行，则等待并复用其结果"""
+        with self._lock:
+            self.stats["calls"] += 1
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.stats["coalesced"] += 1
+                is_leader = False
+            else:
+                call = _InFlightCall()
+                self._calls[key] = call
+                self.stats["executed"] += 1
+                is_leader = True
+
+        if not is_leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            # 返回副本，避免多个调用方修改同一份数据
+            return copy.deepcopy(call.result)
+
+        result = None
+        try:
+            result = func()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+                has_waiters = call.waiters > 0
+            if has_waiters and call.error is None:
+                # 等待方从快照复制，调用方修改返回值不影响等待方
+                call.result = copy.deepcopy(result)
+            call.event.set()
+
+        return result
+
+    def in_flight(self) -> int:
+        """当前正在执行的请求数"""
+        with self._lock:
+            return len(self._calls)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取合并统计"""
+        with self._lock:
+            stats = self.stats.copy()
+        stats["saved_ratio"] = round(stats["coalesced"] / stats["calls"], 4) if stats["calls"] else 0
+        return stats
+
+    def reset_stats(self):
+        """重置统计"""
+        with self._lock:
+            for key in self.stats:
+                self.stats[key] = 0
+
+
+class AsyncSingleFlight:
+    """协程版请求合并组 - 同一事件循环中相同key的并发调用共享同一次执行结果（非线程安全，每个事件循环一个）"""
+
+    def __init__(self):
+        self._calls = {}    # key -> [Task, 等待方数量]
+        self.stats = {
+            "calls": 0,
+            "executed": 0,
+            "coalesced": 0
+        }
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """执行func()；若相同key的调用正在进行，则等待并复用其结果"""
+        self.stats["calls"] += 1
+        call = self._calls.get(key)
+        if call is not None:
+            call[1] += 1
+            self.stats["coalesced"] += 1
+            # shield：某个调用方被取消不影响其他等待方
+            result = await asyncio.shield(call[0])
+            return copy.deepcopy(result)
+
+        self.stats["executed"] += 1
+        call = [asyncio.ensure_future(func()), 0]
+        self._calls[key] = call
+        try:
+            result = await asyncio.shield(call[0])
+        finally:
+            if self._calls.get(key) is call:
+                del self._calls[key]
+        # 有等待方时返回副本，任务结果保持不变供等待方复制
+        return copy.deepcopy(result) if call[1] else result
+
+    def in_flight(self) -> int:
+        """当前正在执行的请求数"""
+        return len(self._calls)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取合并统计"""
+        stats = self.stats.copy()
+        stats["saved_ratio"] = round(stats["coalesced"] / stats["calls"], 4) if stats["calls"] else 0
+        return stats
+
+
+# 全局请求合并实例 - 所有AdsPowerAPIClient共享，UI与各执行线程的相同读请求可互相合并
+adspower_single_flight = SingleFlight()
@@ -68,7 +68,9 @@ def install_packages():
         "pandas",
         "Pillow",
         "pyautogui",
-        "webdriver-manager"
+        "webdriver-manager",
+        "aiohttp",
+        "psutil"
     ]
     
     # Upgrade pip first
@@ -103,7 +105,9 @@ def verify_installation():
         ("pandas", "pandas"),
         ("Pillow", "PIL"),
         ("pyautogui", "pyautogui"),
-        ("webdriver-manager", "webdriver_manager")
+        ("webdriver-manager", "webdriver_manager"),
+        ("aiohttp", "aiohttp"),
+        ("psutil", "psutil")
     ]
     
     for package_name, import_name in test_imports:
@@ -242,6 +242,9 @@ if not RPA_AVAILABLE:
 class EnvironmentManagement(QWidget):
     """环境管理页面 - 完全复刻AdsPower界面"""
     
+    # 活跃浏览器索引在后台线程发布状态变化，经信号转到界面线程处理
+    browser_state_changed = pyqtSignal(str, bool)
+    
     def __init__(self, api):
         super().__init__()
         self.api = api
@@ -252,6 +255,14 @@ class EnvironmentManagement(QWidget):
         self.window_states = {}  # 浏览器状态缓存
         self.selected_profiles = set()
         self.show_opened_only = False
+        self.batch_max_workers = 5  # 批量打开/关闭浏览器的并发数
+        self._table_refresh_pending = False
+        
+        # 订阅活跃浏览器索引，浏览器状态由一次列表轮询统一更新
+        self.browser_state_changed.connect(self.on_browser_state_changed)
+        if RPA_AVAILABLE:
+            from adspower_active_browsers import active_browser_index
+            active_browser_index.subscribe(self._on_active_browser_transition)
         
         self.init_ui()
         self.load_groups()
@@ -980,6 +991,30 @@ class EnvironmentManagement(QWidget):
         }
         return status_map.get(status, '已关闭')
 
+    def _on_active_browser_transition(self, user_id, is_open, info):
+        """活跃浏览器索引回调（轮询线程），转发到界面线程"""
+        self.browser_state_changed.emit(str(user_id), is_open)
+
+    def on_browser_state_changed(self, user_id, is_open):
+        """浏览器打开/关闭状态变化"""
+        # 打开中/关闭中由界面操作维护，操作结束后再以索引为准
+        if self.window_states.get(user_id) in ('opening', 'closing'):
+            return
+        new_state = 'opened' if is_open else 'closed'
+        if self.window_states.get(user_id, 'closed') == new_state:
+            return
+        self.window_states[user_id] = new_state
+
+        # 合并短时间内的多次变化，只刷新一次表格
+        if not self._table_refresh_pending:
+            self._table_refresh_pending = True
+            QTimer.singleShot(200, self._flush_table_refresh)
+
+    def _flush_table_refresh(self):
+        self._table_refresh_pending = False
+        if hasattr(self, 'table'):
+            self.update_table()
+
     def on_selection_changed(self, user_id, state):
         """处理选择状态变化"""
         if state == Qt.Checked:
@@ -1005,6 +1040,9 @@ class EnvironmentManagement(QWidget):
 
     def refresh_data(self):
         """刷新数据"""
+        # 手动刷新时跳过响应缓存，确保显示最新数据
+        if hasattr(self.api, 'invalidate_cache'):
+            self.api.invalidate_cache()
         self.load_groups()
         self.load_profiles()
         QMessageBox.information(self, "提示", "数据已刷新")
@@ -1071,22 +1109,26 @@ class EnvironmentManagement(QWidget):
         progress.setWindowModality(Qt.WindowModal)
         progress.show()
 
+        # 设置打开中状态
+        user_ids = list(self.selected_profiles)
+        for user_id in user_ids:
+            self.window_states[user_id] = 'opening'
+        self.update_table()
+        QApplication.processEvents()
+
         success_count = 0
-        for i, user_id in enumerate(self.selected_profiles):
+        results = self._iter_batch_results('start', user_ids)
+        for i, item in enumerate(results):
             if progress.wasCanceled():
+                results.close()
                 break
 
-            progress.setValue(i)
-            progress.setLabelText(f"正在打开浏览器 {i+1}/{len(self.selected_profiles)} (ID: {user_id})")
-            QApplication.processEvents()
-
-            # 设置打开中状态
-            self.window_states[user_id] = 'opening'
-            self.update_table()
-            QApplication.processEvents()
+            user_id = item['user_id']
+            progress.setValue(i + 1)
+            progress.setLabelText(f"已完成 {i+1}/{len(user_ids)} (ID: {user_id})")
 
             try:
-                result = self.api.start_browser(user_id)
+                result = item['result']
                 if result.get('code') == 0:
                     success_count += 1
                     self.window_states[user_id] = 'opened'
@@ -1107,6 +1149,12 @@ class EnvironmentManagement(QWidget):
                     print(f"打开浏览器 {user_id} 失败: {e}")
 
             self.update_table()
+            QApplication.processEvents()
+
+        # 取消后未处理的环境恢复为关闭状态
+        for user_id in user_ids:
+            if self.window_states.get(user_id) == 'opening':
+                self.window_states[user_id] = 'closed'
 
         progress.setValue(len(self.selected_profiles))
         QMessageBox.information(self, "结果", f"成功打开 {success_count}/{len(self.selected_profiles)} 个浏览器")
@@ -1132,22 +1180,26 @@ class EnvironmentManagement(QWidget):
         progress.setWindowModality(Qt.WindowModal)
         progress.show()
 
+        # 设置关闭中状态
+        user_ids = list(self.selected_profiles)
+        for user_id in user_ids:
+            self.window_states[user_id] = 'closing'
+        self.update_table()
+        QApplication.processEvents()
+
         success_count = 0
-        for i, user_id in enumerate(self.selected_profiles):
+        results = self._iter_batch_results('close', user_ids)
+        for i, item in enumerate(results):
             if progress.wasCanceled():
+                results.close()
                 break
 
-            progress.setValue(i)
-            progress.setLabelText(f"正在关闭浏览器 {i+1}/{len(self.selected_profiles)} (ID: {user_id})")
-            QApplication.processEvents()
-
-            # 设置关闭中状态
-            self.window_states[user_id] = 'closing'
-            self.update_table()
-            QApplication.processEvents()
+            user_id = item['user_id']
+            progress.setValue(i + 1)
+            progress.setLabelText(f"已完成 {i+1}/{len(user_ids)} (ID: {user_id})")
 
             try:
-                result = self.api.close_browser(user_id)
+                result = item['result']
                 if result.get('code') == 0:
                     success_count += 1
                     self.window_states[user_id] = 'closed'
@@ -1159,12 +1211,36 @@ class EnvironmentManagement(QWidget):
                 print(f"关闭浏览器 {user_id} 失败: {e}")
 
             self.update_table()
+            QApplication.processEvents()
+
+        # 取消后未处理的环境恢复为打开状态
+        for user_id in user_ids:
+            if self.window_states.get(user_id) == 'closing':
+                self.window_states[user_id] = 'opened'
 
         progress.setValue(len(self.selected_profiles))
         QMessageBox.information(self, "结果", f"成功关闭 {success_count}/{len(self.selected_profiles)} 个浏览器")
         self.selected_profiles.clear()
         self.update_table()
 
+    def _iter_batch_results(self, action, user_ids):
+        """批量打开/关闭浏览器，按完成顺序逐个返回结果"""
+        if action == 'start' and hasattr(self.api, 'iter_batch_start_browsers'):
+            yield from self.api.iter_batch_start_browsers(user_ids, max_workers=self.batch_max_workers)
+            return
+        if action == 'close' and hasattr(self.api, 'iter_batch_close_browsers'):
+            yield from self.api.iter_batch_close_browsers(user_ids, max_workers=self.batch_max_workers)
+            return
+
+        # 简化版API客户端不支持并发批量操作，逐个执行
+        operation = self.api.start_browser if action == 'start' else self.api.close_browser
+        for user_id in user_ids:
+            try:
+                result = operation(user_id)
+            except Exception as e:
+                result = {"code": -1, "msg": str(e)}
+            yield {"user_id": user_id, "result": result}
+
     # 分页控制
     def prev_page(self):
         """上一页"""
@@ -5517,7 +5593,30 @@ class AdsPowerMainWindow(QMainWindow):
             url = self.config.get("api_url", "http://local.adspower.com:50325")
             key = self.config.get("api_key", "")
             print(f"[API] 初始化API连接: {url}")
+
+            # 应用config.json中的频率限制配置（格式同AdsPowerRateLimiter.DEFAULT_LIMITS）
+            rate_limits = self.config.get("rate_limits")
+            if RPA_AVAILABLE and rate_limits:
+                from adspower_rate_limiter import adspower_rate_limiter
+                adspower_rate_limiter.configure_from_dict(rate_limits)
+
+            # API请求指标：api_verbose_log开启逐次请求日志，metrics_file设置后定期写入指标文件
+            if RPA_AVAILABLE:
+                from adspower_metrics import adspower_metrics
+                adspower_metrics.verbose = bool(self.config.get("api_verbose_log", False))
+                metrics_file = self.config.get("metrics_file")
+                if metrics_file:
+                    adspower_metrics.start_periodic_dump(metrics_file, self.config.get("metrics_interval", 60))
+
             self.api = AdsPowerAPI(url, key)
+
+            # 后台轮询活跃浏览器列表，替代逐个环境查询状态
+            if RPA_AVAILABLE:
+                from adspower_active_browsers import active_browser_index
+                active_browser_index.interval = self.config.get("browser_poll_interval", 3)
+                active_browser_index.set_api(self.api)
+                active_browser_index.start()
+                active_browser_index.request_refresh()
         except Exception as e:
             print(f"[API] 初始化失败: {e}")
             self.api = None
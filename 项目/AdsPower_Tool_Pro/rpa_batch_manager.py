@@ -13,6 +13,11 @@ import concurrent.futures
 from datetime import datetime
 from typing import List, Dict, Any, Optional, Callable
 from enum import Enum
+from adspower_circuit_breaker import adspower_circuit_breaker
+from rpa_driver_pool import webdriver_pool
+from rpa_browser_prewarmer import browser_prewarmer
+from rpa_flow_compiler import flow_compiler
+from rpa_flow_interpreter import FlowInterpreter
 
 class BatchExecutionMode(Enum):
     """批量执行模式"""
@@ -64,6 +69,7 @@ class RPABatchManager:
         self.running_tasks = {}
         self.task_counter = 0
         self.max_concurrent_tasks = 2
+        self.prewarm_lookahead = 1  # 提前预热后续几个环境的浏览器（0表示不预热）
         
         # 导入必要模块
         try:
@@ -140,8 +146,13 @@ class RPABatchManager:
             
             total_envs = len(env_list)
             
+            # 流程只编译一次，所有环境共享执行计划
+            plan = self._compile_flow(task)
+            if plan is None:
+                return
+            
             for i, env_id in enumerate(env_list):
-                if task.status == BatchTaskStatus.CANCELLED:
+                if not self._wait_for_api_available(task):
                     break
                 
                 # 更新当前环境和进度
@@ -152,8 +163,11 @@ class RPABatchManager:
                 if task.progress_callback:
                     task.progress_callback(task.task_id, task.progress, env_id)
                 
+                # 当前环境执行期间预热后续环境的浏览器
+                self._prewarm_envs(env_list, i + 1)
+                
                 # 执行单个环境的RPA任务
-                result = self._execute_single_env_task(env_id, task.flow_data)
+                result = self._execute_single_env_task(env_id, task.flow_data, plan, task)
                 task.results[env_id] = result
                 
                 if result.get("success", False):
@@ -175,7 +189,7 @@ class RPABatchManager:
         
         finally:
             task.end_time = datetime.now()
-            if task_id in self.running_tasks:
+            if task.task_id in self.running_tasks:
                 del self.running_tasks[task.task_id]
             
             # 执行完成回调
@@ -195,12 +209,17 @@ class RPABatchManager:
             total_envs = len(env_list)
             completed_count = 0
             
+            # 流程只编译一次，所有环境共享执行计划
+            plan = self._compile_flow(task)
+            if plan is None:
+                return
+            
             # 使用线程池执行并行任务
             with concurrent.futures.ThreadPoolExecutor(max_workers=task.max_parallel) as executor:
                 # 提交所有任务
                 future_to_env = {
-                    executor.submit(self._execute_single_env_task, env_id, task.flow_data): env_id
-                    for env_id in env_list
+                    executor.submit(self._execute_env_when_available, task, env_list, index, plan): env_id
+                    for index, env_id in enumerate(env_list)
                 }
                 
                 # 处理完成的任务
@@ -248,52 +267,107 @@ class RPABatchManager:
             if task.completion_callback:
                 task.completion_callback(task.task_id, task.status, task.results)
     
-    def _execute_single_env_task(self, env_id: str, flow_data: Dict[str, Any]) -> Dict[str, Any]:
-        """执行单个环境的RPA任务"""
+    def _wait_for_api_available(self, task: RPABatchTask) -> bool:
+        """AdsPower API熔断期间暂停派发，恢复后返回True，任务被取消返回False"""
+        if adspower_circuit_breaker.is_open():
+            print(f"批量任务 {task.task_id} 暂停：AdsPower API不可用，等待恢复...")
+        while adspower_circuit_breaker.is_open():
+            if task.status == BatchTaskStatus.CANCELLED:
+                return False
+            adspower_circuit_breaker.wait_until_closed(timeout=1)
+        return task.status != BatchTaskStatus.CANCELLED
+
+    def _compile_flow(self, task: RPABatchTask):
+        """编译任务流程，校验失败时任务直接失败，不连接任何浏览器"""
+        plan = flow_compiler.compile(task.flow_data)
+        if not plan.valid:
+            task.status = BatchTaskStatus.FAILED
+            task.error_messages.append(f"流程校验失败: {'; '.join(plan.errors)}")
+            return None
+        return plan
+
+    def _execute_env_when_available(self, task: RPABatchTask, env_list: List[str], index: int,
+                                    plan=None) -> Dict[str, Any]:
+        """并行模式下的单环境执行：API熔断时等待恢复后再连接浏览器"""
+        if not self._wait_for_api_available(task):
+            return {"success": False, "error": "任务已取消"}
+        # 当前并行窗口之后的环境将在有线程空出时执行，提前预热
+        self._prewarm_envs(env_list, index + task.max_parallel)
+        return self._execute_single_env_task(env_list[index], task.flow_data, plan, task)
+
+    def _prewarm_envs(self, env_list: List[str], start: int):
+        """预热env_list中从start开始的prewarm_lookahead个环境"""
+        if self.prewarm_lookahead <= 0 or not self.rpa_available:
+            return
+        upcoming = env_list[start:start + self.prewarm_lookahead]
+        if upcoming:
+            browser_prewarmer.prewarm(upcoming)
+
+    def _execute_single_env_task(self, env_id: str, flow_data: Dict[str, Any], plan=None,
+                                 task: RPABatchTask = None) -> Dict[str, Any]:
+        """执行单个环境的RPA任务，plan为编译后的执行计划（未传入时按流程内容从缓存获取），批量任务取消时停止执行"""
         if not self.rpa_available:
             return {"success": False, "error": "RPA功能不可用"}
         
+        executor = None
         try:
             # 导入RPA执行器
             from rpa_executor import RPAExecutor
             
+            if plan is None:
+                plan = flow_compiler.compile(flow_data)
+            if not plan.valid:
+                return {"success": False, "error": f"流程校验失败: {'; '.join(plan.errors)}"}
+            
             # 创建执行器
-            executor = RPAExecutor(task_name=f"BatchTask-{env_id}")
+            # 流程可通过backend指定执行后端（selenium / cdp）
+            executor = RPAExecutor(task_name=f"BatchTask-{env_id}",
+                                   backend=flow_data.get('backend', 'selenium'))
+            executor.screenshot_dir = flow_data.get('screenshot_dir', '')
             
-            # 连接到AdsPower浏览器
-            connect_result = executor.connect_to_adspower_browser(env_id)
+            # 连接到AdsPower浏览器（同一环境的后续任务及预热过的环境复用连接池中的WebDriver）
+            browser_prewarmer.consume(env_id)
+            connect_result = executor.connect_to_adspower_browser(env_id, driver_pool=webdriver_pool)
             if not connect_result.get("success"):
                 return {"success": False, "error": f"连接浏览器失败: {connect_result.get('message')}"}
+            if plan.needs_network_capture:
+                executor.start_network_capture()
+            if flow_data.get('resource_policy'):
+                executor.set_resource_policy(flow_data['resource_policy'])
             
-            # 执行流程步骤
-            steps = flow_data.get('steps', [])
-            step_results = []
-            
-            for step in steps:
-                step_result = executor.execute_step(step)
-                step_results.append(step_result)
-                
-                # 如果步骤失败且设置为停止，则终止执行
-                if not step_result.get("success") and step.get("on_error") == "stop":
-                    executor.disconnect_from_adspower_browser()
-                    return {
-                        "success": False,
-                        "error": f"步骤执行失败: {step_result.get('message')}",
-                        "completed_steps": len(step_results)
-                    }
-            
-            # 断开浏览器连接
-            executor.disconnect_from_adspower_browser()
+            # 执行流程步骤（循环和条件块由解释器按跳转目标执行）
+            cancelled = lambda: task is not None and task.status == BatchTaskStatus.CANCELLED
+            result = FlowInterpreter(executor, plan, should_stop=cancelled).run()
+            screenshot_errors = executor.wait_screenshots()
+            if screenshot_errors and result["success"]:
+                # 截图步骤提交后即返回成功，写入失败在这里计入环境结果
+                result = dict(result, success=False, error=f"截图保存失败: {'; '.join(screenshot_errors)}")
+            if cancelled():
+                return {"success": False, "error": "任务已取消", "completed_steps": result["completed_steps"]}
+            if not result["success"]:
+                return {
+                    "success": False,
+                    "error": result["error"],
+                    "completed_steps": result["completed_steps"]
+                }
             
             return {
                 "success": True,
                 "message": "RPA任务执行成功",
-                "completed_steps": len(step_results),
-                "step_results": step_results
+                "completed_steps": result["completed_steps"],
+                "step_results": result["results"],
+                "resource_stats": executor.get_resource_stats()
             }
             
         except Exception as e:
             return {"success": False, "error": f"RPA任务执行异常: {str(e)}"}
+        
+        finally:
+            # 等待截图写入磁盘，断开浏览器连接（连接池中的连接归还连接池）
+            if executor is not None:
+                executor.wait_screenshots()
+            if executor is not None and executor.current_env_id:
+                executor.disconnect_from_adspower_browser()
     
     def cancel_batch_task(self, task_id: str) -> bool:
         """取消批量任务"""
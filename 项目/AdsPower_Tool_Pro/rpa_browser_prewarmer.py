@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+RPA浏览器预热
+调度器把即将执行的任务的环境交给预热器，预热器在后台启动浏览器并连接WebDriver后放入连接池，
+工作线程空出后可直接执行步骤；预热有独立的并发数和启动速率限制，并受已预热数量和内存上限约束
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable
+
+from adspower_rate_limiter import TokenBucket
+from adspower_circuit_breaker import adspower_circuit_breaker
+from rpa_driver_pool import webdriver_pool
+
+# 可选依赖：用于检查系统剩余内存
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+
+class BrowserPrewarmer:
+    """浏览器预热器 - 线程安全"""
+
+    def __init__(self, max_concurrency: int = 2, start_rate: float = 0.5,
+                 max_warm: int = 4, min_free_memory_mb: int = 1024):
+        self.max_concurrency = max_concurrency        # 同时预热的浏览器数
+        self.max_warm = max_warm                      # 已预热未使用 + 正在预热的上限
+        self.min_free_memory_mb = min_free_memory_mb  # 系统可用内存低于该值时不再预热（需psutil）
+        self.start_bucket = TokenBucket(start_rate, 1)  # 预热启动速率（个/秒）
+
+        self._lock = threading.Lock()
+        self._pool = None
+        self._pending = set()  # 正在预热的环境
+        self._warm = set()     # 已预热、等待任务使用的环境
+        self._memory_warned = False  # 未安装psutil的提示只输出一次
+
+        self.stats = {
+            "scheduled": 0,        # 提交预热
+            "warmed": 0,           # 预热成功
+            "failed": 0,           # 预热失败
+            "consumed": 0,         # 任务使用了预热好的浏览器
+            "expired": 0,          # 预热后未被使用即被连接池关闭
+            "skipped_limit": 0,    # 因数量上限跳过
+            "skipped_memory": 0    # 因内存不足跳过
+        }
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_concurrency,
+                                            thread_name_prefix="RPA-Prewarm")
+        return self._pool
+
+    def configure(self, max_concurrency: int = None, start_rate: float = None,
+                  max_warm: int = None, min_free_memory_mb: int = None):
+        """调整预热参数"""
+        if max_concurrency and max_concurrency != self.max_concurrency:
+            self.max_concurrency = max_concurrency
+            with self._lock:
+                old_pool, self._pool = self._pool, None
+            if old_pool:
+                old_pool.shutdown(wait=False)
+        if start_rate:
+            self.start_bucket.set_rate(start_rate)
+        if max_warm is not None:
+            self.max_warm = max_warm
+        if min_free_memory_mb is not None:
+            self.min_free_memory_mb = min_free_memory_mb
+
+    def has_memory_headroom(self) -> bool:
+        """系统可用内存是否高于下限（未安装psutil时不限制）"""
+        if not self.min_free_memory_mb:
+            return True
+        if not PSUTIL_AVAILABLE:
+            if not self._memory_warned:
+                self._memory_warned = True
+                print(f"[预热] 未安装psutil，不检查可用内存下限（{self.min_free_memory_mb}MB）：pip install psutil")
+            return True
+        try:
+            return psutil.virtual_memory().available / (1024 * 1024) >= self.min_free_memory_mb
+        except Exception:
+            return True
+
+    # ==================== 预热 ====================
+
+    def prewarm(self, env_ids: Iterable[str]) -> int:
+        """提交预热，已预热、正在预热或超出上限的环境会被跳过，返回本次提交数"""
+        if adspower_circuit_breaker.is_open():
+            return 0
+
+        # 预热后未被使用、已被连接池按空闲超时关闭的环境不再计入
+        with self._lock:
+            stale = [env_id for env_id in self._warm if not webdriver_pool.has_idle(env_id)]
+            for env_id in stale:
+                self._warm.discard(env_id)
+                self.stats["expired"] += 1
+
+        submitted = 0
+        for env_id in env_ids:
+            env_id = str(env_id)
+            with self._lock:
+                if env_id in self._pending or env_id in self._warm:
+                    continue
+                if len(self._pending) + len(self._warm) >= self.max_warm:
+                    self.stats["skipped_limit"] += 1
+                    break
+                if not self.has_memory_headroom():
+                    self.stats["skipped_memory"] += 1
+                    break
+                self._pending.add(env_id)
+                self.stats["scheduled"] += 1
+            self._get_pool().submit(self._warm_up, env_id)
+            submitted += 1
+        return submitted
+
+    def _warm_up(self, env_id: str):
+        """启动浏览器并连接WebDriver，连接归还连接池等待任务取用"""
+        success = False
+        try:
+            wait_time = self.start_bucket.reserve()
+            if wait_time > 0:
+                time.sleep(wait_time)
+
+            # 内存可能在排队期间被占用，启动前再检查一次
+            if not self.has_memory_headroom():
+                with self._lock:
+                    self.stats["skipped_memory"] += 1
+                return
+
+            from rpa_executor import RPAExecutor
+            executor = RPAExecutor(task_name=f"Prewarm-{env_id}")
+            result = executor.connect_to_adspower_browser(env_id, driver_pool=webdriver_pool)
+            if result.get("success"):
+                executor.disconnect_from_adspower_browser()
+                success = True
+            else:
+                print(f"[预热] 环境 {env_id} 预热失败: {result.get('message')}")
+        except Exception as e:
+            print(f"[预热] 环境 {env_id} 预热异常: {e}")
+        finally:
+            with self._lock:
+                self._pending.discard(env_id)
+                if success:
+                    self._warm.add(env_id)
+                    self.stats["warmed"] += 1
+                else:
+                    self.stats["failed"] += 1
+
+    def consume(self, env_id: str) -> bool:
+        """任务开始执行时调用，返回该环境是否已预热"""
+        with self._lock:
+            if str(env_id) in self._warm:
+                self._warm.discard(str(env_id))
+                self.stats["consumed"] += 1
+                return True
+            return False
+
+    def is_warm(self, env_id: str) -> bool:
+        with self._lock:
+            return str(env_id) in self._warm
+
+    def discard(self, env_ids: Iterable[str] = None):
+        """取消预热记录（任务取消后调用），浏览器由连接池按空闲超时关闭"""
+        with self._lock:
+            if env_ids is None:
+                self._warm.clear()
+            else:
+                for env_id in env_ids:
+                    self._warm.discard(str(env_id))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取预热统计"""
+        with self._lock:
+            stats = self.stats.copy()
+            stats.update({
+                "pending": len(self._pending),
+                "warm": len(self._warm),
+                "psutil_available": PSUTIL_AVAILABLE
+            })
+            return stats
+
+
+# 全局浏览器预热器 - 线程管理器和批量管理器共享
+browser_prewarmer = BrowserPrewarmer()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+RPA批量元素提取
+按选择器和字段定义在一次页面脚本调用中提取所有匹配元素的数据（文本、属性、HTML、位置尺寸、可见性、子元素），
+返回可直接保存到变量的JSON；page可以是Selenium WebDriver或CDPPage
+
+字段定义可以是：
+    字典  {"title": "text", "link": "@href", "price": {"selector": ".price", "type": "text"}}
+    列表  ["text", "@href"]（字段名即类型）
+    字符串 "title=text, link=@href, price=.price::text, tags=.tag::text[]"（也可以是上述JSON）
+字段类型：text / text_content / html / outer_html / value / tag / rect / location / size /
+    visible / enabled / selected / children / @属性名 / prop:属性名；
+    "子选择器::类型" 在元素内查找，类型后加[]时返回所有匹配子元素的值
+"""
+
+import json
+from typing import Any, Dict, List, Union
+
+from rpa_cdp_backend import FIND_ELEMENTS_JS
+
+FIELD_TYPES = ("text", "text_content", "html", "outer_html", "value", "tag", "rect", "location",
+               "size", "visible", "enabled", "selected", "children", "attr", "prop")
+
+# 元素数据"对象"模式的字段（与逐项读取WebElement时的结果一致）
+OBJECT_FIELDS = {
+    "tag_name": "tag",
+    "text": "text",
+    "id": "@id",
+    "class": "@class",
+    "name": "@name",
+    "value": "prop:value",
+    "href": "prop:href",
+    "src": "prop:src",
+    "location": "location",
+    "size": "size",
+    "is_displayed": "visible",
+    "is_enabled": "enabled",
+    "is_selected": "selected"
+}
+
+# arguments: selector, strategy, fields, start, limit, elements（Selenium可直接传入元素）
+BULK_EXTRACT_JS = FIND_ELEMENTS_JS + """
+const selector = arguments[0], strategy = arguments[1], fields = arguments[2];
+const start = arguments[3] || 0, limit = arguments[4] || 0;
+const found = arguments[5] || __rpaFind(selector, strategy);
+const nodes = Array.prototype.slice.call(found, start, limit ? start + limit : undefined);
+
+function text(el, max) {
+    const value = (el.innerText !== undefined ? el.innerText : el.textContent || '').trim();
+    return max ? value.slice(0, max) : value;
+}
+function read(el, field) {
+    if (!el) return null;
+    switch (field.type) {
+        case 'text': return text(el, field.max_text);
+        case 'text_content': return el.textContent;
+        case 'html': return el.innerHTML;
+        case 'outer_html': return el.outerHTML;
+        case 'value': return el.value === undefined ? null : el.value;
+        case 'tag': return el.tagName.toLowerCase();
+        case 'attr': return el.getAttribute(field.attr);
+        case 'prop': {
+            const value = el[field.attr];
+            return ['string', 'number', 'boolean'].includes(typeof value) ? value : el.getAttribute(field.attr);
+        }
+        case 'rect': {
+            const r = el.getBoundingClientRect();
+            return {x: r.left + scrollX, y: r.top + scrollY, width: r.width, height: r.height};
+        }
+        case 'location': {
+            const r = el.getBoundingClientRect();
+            return {x: Math.round(r.left + scrollX), y: Math.round(r.top + scrollY)};
+        }
+        case 'size': {
+            const r = el.getBoundingClientRect();
+            return {width: Math.round(r.width), height: Math.round(r.height)};
+        }
+        case 'visible': {
+            const style = getComputedStyle(el), r = el.getBoundingClientRect();
+            return style.display !== 'none' && style.visibility !== 'hidden' && parseFloat(style.opacity) > 0
+                && r.width > 0 && r.height > 0;
+        }
+        case 'enabled': return !el.disabled;
+        case 'selected': return !!(el.selected || el.checked);
+        case 'children': return Array.from(el.children).map(child => ({
+            tag_name: child.tagName.toLowerCase(),
+            text: text(child, field.max_text || 100),
+            id: child.id,
+            class: child.getAttribute('class')
+        }));
+    }
+    return null;
+}
+
+const records = nodes.map((el, i) => {
+    const record = {index: start + i};
+    for (const field of fields) {
+        if (!field.selector) {
+            record[field.name] = read(el, field);
+        } else if (field.all) {
+            record[field.name] = Array.from(el.querySelectorAll(field.selector)).map(child => read(child, field));
+        } else {
+            record[field.name] = read(el.querySelector(field.selector), field);
+        }
+    }
+    return record;
+});
+return {total: found.length, records: records};
+"""
+
+
+def _parse_field(name: str, spec: Union[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """单个字段定义 -> {name, type, attr?, selector?, all?, max_text?}"""
+    if isinstance(spec, dict):
+        field = dict(spec)
+        field["name"] = name
+        kind = field.get("type", "text")
+    else:
+        field = {"name": name}
+        kind = str(spec).strip()
+        if "::" in kind:
+            selector, kind = kind.rsplit("::", 1)
+            field["selector"] = selector.strip()
+        if kind.endswith("[]"):
+            kind = kind[:-2]
+            field["all"] = True
+
+    if kind.startswith("@"):
+        kind, field["attr"] = "attr", kind[1:]
+    elif kind.startswith(("prop:", "attr:")):
+        kind, field["attr"] = kind.split(":", 1)
+    if kind not in FIELD_TYPES:
+        raise ValueError(f"不支持的字段类型: {kind}")
+    field["type"] = kind
+    return field
+
+
+def parse_fields(spec: Union[str, List, Dict[str, Any], None]) -> List[Dict[str, Any]]:
+    """解析字段定义，未指定时提取文本"""
+    if not spec:
+        return [_parse_field("text", "text")]
+    if isinstance(spec, str):
+        text = spec.strip()
+        if text.startswith(("{", "[")):
+            spec = json.loads(text)
+        else:
+            spec = {}
+            for item in filter(None, (part.strip() for part in text.split(","))):
+                name, _, kind = item.partition("=")
+                spec[name.strip()] = kind.strip() if kind else name.strip()
+    if isinstance(spec, dict):
+        return [_parse_field(name, value) for name, value in spec.items()]
+    return [_parse_field(str(item), item) for item in spec]
+
+
+def extract_elements(page, selector: str = "", strategy: str = "css", fields=None,
+                     start: int = 0, limit: int = 0, elements: List = None) -> Dict[str, Any]:
+    """一次调用提取所有匹配元素的字段，返回 {"total": 匹配总数, "records": [每个元素一条记录]}
+
+    elements为已找到的Selenium元素时直接提取（不再按选择器查找）；CDP后端只能按选择器查找
+    """
+    parsed = fields if isinstance(fields, list) and all(isinstance(f, dict) and "type" in f for f in fields) \
+        else parse_fields(fields)
+    result = page.execute_script("return (function() {" + BULK_EXTRACT_JS + "}).apply(null, arguments);",
+                                 selector, strategy, parsed, start, limit, elements)
+    if not isinstance(result, dict):
+        return {"total": 0, "records": []}
+    return result
@@ -0,0 +1,433 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+RPA CDP执行后端
+直接通过DevTools WebSocket与AdsPower浏览器通信，不经过chromedriver；
+提供导航、元素查找、鼠标键盘输入、Cookie和JS执行（截图见rpa_screenshot_writer），其余操作由执行器回退到Selenium
+"""
+
+import itertools
+import json
+import threading
+import time
+import urllib.request
+from typing import Any, Callable, Dict, List, Optional
+
+# 可选依赖：websocket-client
+try:
+    import websocket
+    CDP_AVAILABLE = True
+except ImportError:
+    CDP_AVAILABLE = False
+
+
+class CDPError(Exception):
+    """CDP调用失败"""
+
+
+class CDPConnection:
+    """单个DevTools WebSocket连接 - 后台线程接收消息，按id匹配响应并分发事件"""
+
+    def __init__(self, ws_url: str, timeout: float = 30):
+        if not CDP_AVAILABLE:
+            raise CDPError("未安装websocket-client，无法使用CDP后端")
+
+        self.ws_url = ws_url
+        self.timeout = timeout
+        self._ids = itertools.count(1)
+        self._send_lock = threading.Lock()
+        self._pending = {}    # id -> [Event, message]
+        self._listeners = {}  # 事件名 -> [callback]
+        self._listeners_lock = threading.Lock()
+        self.closed = False
+
+        # Chrome 111起校验Origin，不发送Origin头即可连接
+        self.ws = websocket.create_connection(ws_url, timeout=timeout, suppress_origin=True)
+        self.ws.settimeout(None)
+        self._reader = threading.Thread(target=self._read_loop, name="CDPReader", daemon=True)
+        self._reader.start()
+
+    @classmethod
+    def browser(cls, host: str, timeout: float = 30) -> "CDPConnection":
+        """连接到浏览器级调试地址（Target域自动附加的页面通过sessionId收发消息）"""
+        with urllib.request.urlopen(f"http://{host}/json/version", timeout=timeout) as response:
+            ws_url = json.loads(response.read().decode("utf-8"))["webSocketDebuggerUrl"]
+        return cls(ws_url, timeout)
+
+    def _read_loop(self):
+        try:
+            while not self.closed:
+                message = json.loads(self.ws.recv())
+                if "id" in message:
+                    waiter = self._pending.pop(message["id"], None)
+                    if waiter is not None:
+                        waiter[1] = message
+                        waiter[0].set()
+                else:
+                    params = message.get("params", {})
+                    if "sessionId" in message:
+                        # 附加的会话产生的事件，回调据此区分来源（Target事件自带的sessionId为新附加的会话，保持不变）
+                        params.setdefault("sessionId", message["sessionId"])
+                    self._dispatch(message.get("method", ""), params)
+        except Exception:
+            pass
+        finally:
+            self.closed = True
+            # 唤醒所有等待中的调用
+            for waiter in list(self._pending.values()):
+                waiter[0].set()
+            self._pending.clear()
+
+    def _dispatch(self, method: str, params: Dict):
+        with self._listeners_lock:
+            callbacks = list(self._listeners.get(method, ()))
+        for callback in callbacks:
+            try:
+                callback(params)
+            except Exception as e:
+                print(f"[CDP] 事件回调异常 {method}: {e}")
+
+    @staticmethod
+    def _message(message_id: int, method: str, params: Optional[Dict], session_id: Optional[str]) -> str:
+        message = {"id": message_id, "method": method, "params": params or {}}
+        if session_id:
+            message["sessionId"] = session_id
+        return json.dumps(message)
+
+    def send(self, method: str, params: Dict = None, timeout: float = None, session_id: str = None) -> Dict:
+        """发送命令并等待结果；session_id为附加的会话时发往对应目标"""
+        if self.closed:
+            raise CDPError("CDP连接已关闭")
+
+        message_id = next(self._ids)
+        waiter = [threading.Event(), None]
+        self._pending[message_id] = waiter
+        try:
+            with self._send_lock:
+                self.ws.send(self._message(message_id, method, params, session_id))
+        except Exception as e:
+            self._pending.pop(message_id, None)
+            raise CDPError(f"{method} 发送失败: {e}")
+
+        if not waiter[0].wait(timeout or self.timeout):
+            self._pending.pop(message_id, None)
+            raise CDPError(f"{method} 超时")
+        response = waiter[1]
+        if response is None:
+            raise CDPError("CDP连接已断开")
+        if "error" in response:
+            raise CDPError(f"{method} 失败: {response['error'].get('message', response['error'])}")
+        return response.get("result", {})
+
+    def post(self, method: str, params: Dict = None, session_id: str = None):
+        """发送命令不等待结果 - 可在事件回调中调用（读线程不能等待自己接收的响应）"""
+        if self.closed:
+            return
+        try:
+            with self._send_lock:
+                self.ws.send(self._message(next(self._ids), method, params, session_id))
+        except Exception as e:
+            print(f"[CDP] {method} 发送失败: {e}")
+
+    def on(self, method: str, callback: Callable[[Dict], None]):
+        """订阅事件"""
+        with self._listeners_lock:
+            self._listeners.setdefault(method, []).append(callback)
+
+    def off(self, method: str, callback: Callable[[Dict], None]):
+        """取消订阅"""
+        with self._listeners_lock:
+            callbacks = self._listeners.get(method, [])
+            if callback in callbacks:
+                callbacks.remove(callback)
+
+    def close(self):
+        self.closed = True
+        try:
+            self.ws.close()
+        except Exception:
+            pass
+
+
+# 页面内查找元素的公共脚本（CDP后端和批量提取共用）：返回匹配的元素数组
+# strategy: css / xpath / text（包含文本）/ auto（先按CSS，选择器无效时按XPath）
+FIND_ELEMENTS_JS = """
+function __rpaFind(selector, strategy) {
+    function byXPath(expression) {
+        const snapshot = document.evaluate(expression, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        const result = [];
+        for (let i = 0; i < snapshot.snapshotLength; i++) result.push(snapshot.snapshotItem(i));
+        return result;
+    }
+    if (strategy === 'xpath') return byXPath(selector);
+    if (strategy === 'text') return byXPath('//*[contains(text(), ' + JSON.stringify(selector) + ')]');
+    try {
+        return Array.from(document.querySelectorAll(selector));
+    } catch (e) {
+        if (strategy === 'auto') return byXPath(selector);
+        throw e;
+    }
+}
+"""
+
+_MOUSE_BUTTONS = {"left": "left", "right": "right", "middle": "middle"}
+
+
+class CDPPage:
+    """一个页面标签的CDP会话"""
+
+    def __init__(self, host: str, timeout: float = 30):
+        self.host = host  # 调试地址，如 127.0.0.1:9222
+        self.timeout = timeout
+        self.target_id = None
+        self.connection = None
+
+    @classmethod
+    def connect(cls, host: str, target_id: str = None, timeout: float = 30) -> "CDPPage":
+        """连接到浏览器的页面标签，未指定target_id时使用第一个普通页面"""
+        page = cls(host, timeout)
+        page.attach(target_id)
+        return page
+
+    def list_targets(self) -> List[Dict[str, Any]]:
+        """获取浏览器的所有调试目标"""
+        with urllib.request.urlopen(f"http://{self.host}/json/list", timeout=self.timeout) as response:
+            return json.loads(response.read().decode("utf-8"))
+
+    def attach(self, target_id: str = None):
+        """切换到指定页面标签"""
+        targets = [t for t in self.list_targets()
+                   if t.get("type") == "page" and not t.get("url", "").startswith("devtools://")]
+        if target_id:
+            targets = [t for t in targets if t.get("id") == target_id]
+        if not targets:
+            raise CDPError(f"未找到可连接的页面: {target_id or self.host}")
+
+        if self.connection is not None:
+            self.connection.close()
+        target = targets[0]
+        self.connection = CDPConnection(target["webSocketDebuggerUrl"], self.timeout)
+        self.target_id = target["id"]
+        self.connection.send("Page.enable")
+
+    def send(self, method: str, params: Dict = None, timeout: float = None) -> Dict:
+        return self.connection.send(method, params, timeout)
+
+    def post(self, method: str, params: Dict = None):
+        self.connection.post(method, params)
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    # ==================== JS执行 ====================
+
+    def evaluate(self, expression: str, await_promise: bool = False, timeout: float = None) -> Any:
+        """执行JS表达式并返回结果值"""
+        result = self.send("Runtime.evaluate", {
+            "expression": expression,
+            "returnByValue": True,
+            "awaitPromise": await_promise,
+            "userGesture": True
+        }, timeout)
+        if "exceptionDetails" in result:
+            details = result["exceptionDetails"]
+            text = details.get("exception", {}).get("description") or details.get("text", "")
+            raise CDPError(f"JS执行异常: {text}")
+        return result.get("result", {}).get("value")
+
+    def execute_script(self, script: str, *args, timeout: float = None) -> Any:
+        """与Selenium execute_script一致：脚本作为函数体执行，可用arguments读取参数（仅限可JSON序列化的值）；
+        timeout为等待结果的秒数，默认为连接超时"""
+        return self.evaluate(f"(function() {{ {script}\n}}).apply(window, {json.dumps(list(args))})",
+                             await_promise=True, timeout=timeout)
+
+    @property
+    def current_url(self) -> str:
+        return self.evaluate("location.href")
+
+    # ==================== 导航 ====================
+
+    # 导航完成的事件：页面load，或同一文档内导航（锚点、history.pushState，不会触发load）
+    _NAVIGATION_EVENTS = ("Page.loadEventFired", "Page.navigatedWithinDocument")
+
+    def _run_navigation(self, action: Callable[[], Any], wait_load: bool, timeout: float):
+        """执行导航动作，需要时等待导航完成；action返回False表示不会加载新文档，无需等待"""
+        loaded = threading.Event()
+        callback = lambda params: loaded.set()
+        for event in self._NAVIGATION_EVENTS:
+            self.connection.on(event, callback)
+        try:
+            if action() is False:
+                return
+            if wait_load and not loaded.wait(timeout or self.timeout):
+                # 往返缓存恢复的页面不触发load事件，以readyState为准
+                if self.evaluate("document.readyState") != "complete":
+                    raise CDPError("页面加载超时")
+        finally:
+            for event in self._NAVIGATION_EVENTS:
+                self.connection.off(event, callback)
+
+    def navigate(self, url: str, wait_load: bool = True, timeout: float = None):
+        """访问网址"""
+        def action():
+            result = self.send("Page.navigate", {"url": url}, timeout)
+            if result.get("errorText"):
+                raise CDPError(f"访问失败: {result['errorText']}")
+            # 同一文档内导航没有loaderId，已经完成
+            return bool(result.get("loaderId"))
+        self._run_navigation(action, wait_load, timeout)
+
+    def reload(self, wait_load: bool = True, timeout: float = None):
+        """刷新页面"""
+        self._run_navigation(lambda: self.send("Page.reload"), wait_load, timeout)
+
+    def go_back(self, wait_load: bool = True, timeout: float = None) -> bool:
+        """页面后退，没有可后退的记录时返回False"""
+        history = self.send("Page.getNavigationHistory")
+        index = history.get("currentIndex", 0)
+        if index <= 0:
+            return False
+        entry_id = history["entries"][index - 1]["id"]
+        self._run_navigation(lambda: self.send("Page.navigateToHistoryEntry", {"entryId": entry_id}),
+                             wait_load, timeout)
+        return True
+
+    # ==================== 元素操作 ====================
+
+    def element_call(self, selector: str, strategy: str, index: int, body: str) -> Optional[Dict[str, Any]]:
+        """在第index个匹配元素上执行函数体（变量el为元素），未找到元素时返回None"""
+        expression = (
+            f"(() => {{ {FIND_ELEMENTS_JS}\n"
+            f"const els = __rpaFind({json.dumps(selector)}, {json.dumps(strategy)});\n"
+            f"const el = els[{int(index)}];\n"
+            f"if (!el) return {{found: false, count: els.length}};\n"
+            f"return {{found: true, value: ((el) => {{ {body} }})(el)}};\n"
+            f"}})()"
+        )
+        result = self.evaluate(expression)
+        if not result or not result.get("found"):
+            return None
+        return result.get("value") or {}
+
+    def count_elements(self, selector: str, strategy: str = "auto") -> int:
+        return self.evaluate(f"(() => {{ {FIND_ELEMENTS_JS}\n"
+                             f"return __rpaFind({json.dumps(selector)}, {json.dumps(strategy)}).length; }})()")
+
+    def _element_center(self, selector: str, strategy: str, index: int) -> Optional[Dict[str, Any]]:
+        """滚动元素到可见区域中央并返回中心坐标"""
+        return self.element_call(selector, strategy, index, """
+            el.scrollIntoView({block: 'center', inline: 'center'});
+            const rect = el.getBoundingClientRect();
+            return {x: rect.left + rect.width / 2, y: rect.top + rect.height / 2,
+                    tag: el.tagName.toLowerCase(), text: (el.innerText || el.value || '').slice(0, 50)};
+        """)
+
+    def _mouse(self, event_type: str, x: float, y: float, button: str = "none", click_count: int = 0):
+        self.send("Input.dispatchMouseEvent", {
+            "type": event_type, "x": x, "y": y, "button": button, "clickCount": click_count
+        })
+
+    def click(self, selector: str, strategy: str = "auto", index: int = 0,
+              button: str = "left", click_count: int = 1) -> Optional[Dict[str, Any]]:
+        """用真实鼠标事件点击元素，未找到元素时返回None"""
+        info = self._element_center(selector, strategy, index)
+        if info is None:
+            return None
+        button = _MOUSE_BUTTONS.get(button, "left")
+        x, y = info["x"], info["y"]
+        self._mouse("mouseMoved", x, y)
+        for count in range(1, click_count + 1):
+            self._mouse("mousePressed", x, y, button, count)
+            self._mouse("mouseReleased", x, y, button, count)
+        return info
+
+    def hover(self, selector: str, strategy: str = "auto", index: int = 0) -> Optional[Dict[str, Any]]:
+        """鼠标移动到元素上"""
+        info = self._element_center(selector, strategy, index)
+        if info is not None:
+            self._mouse("mouseMoved", info["x"], info["y"])
+        return info
+
+    def focus(self, selector: str, strategy: str = "auto", index: int = 0) -> Optional[Dict[str, Any]]:
+        """聚焦元素"""
+        return self.element_call(selector, strategy, index, """
+            el.scrollIntoView({block: 'center'});
+            el.focus();
+            return {tag: el.tagName.toLowerCase()};
+        """)
+
+    def type_text(self, selector: str, text: str, strategy: str = "auto", index: int = 0,
+                  clear: bool = True, interval: float = 0) -> Optional[Dict[str, Any]]:
+        """点击元素后输入文本，interval大于0时逐字符输入"""
+        info = self.click(selector, strategy, index)
+        if info is None:
+            return None
+
+        if clear:
+            self.element_call(selector, strategy, index, """
+                if ('value' in el) { el.value = ''; } else if (el.isContentEditable) { el.textContent = ''; }
+                el.dispatchEvent(new Event('input', {bubbles: true}));
+            """)
+
+        if interval > 0:
+            for char in text:
+                self.send("Input.insertText", {"text": char})
+                time.sleep(interval)
+        elif text:
+            self.send("Input.insertText", {"text": text})
+
+        # 触发change事件确保内容被识别
+        self.element_call(selector, strategy, index, """
+            el.dispatchEvent(new Event('input', {bubbles: true}));
+            el.dispatchEvent(new Event('change', {bubbles: true}));
+        """)
+        return info
+
+    # ==================== Cookie ====================
+
+    @staticmethod
+    def _to_selenium_cookie(cookie: Dict[str, Any]) -> Dict[str, Any]:
+        """转换为与Selenium get_cookies()一致的格式"""
+        result = {
+            "name": cookie.get("name"),
+            "value": cookie.get("value"),
+            "domain": cookie.get("domain"),
+            "path": cookie.get("path"),
+            "secure": cookie.get("secure", False),
+            "httpOnly": cookie.get("httpOnly", False)
+        }
+        if cookie.get("sameSite"):
+            result["sameSite"] = cookie["sameSite"]
+        if not cookie.get("session") and cookie.get("expires", -1) > 0:
+            result["expiry"] = int(cookie["expires"])
+        return result
+
+    def get_cookies(self) -> List[Dict[str, Any]]:
+        """获取当前页面可见的Cookie"""
+        cookies = self.send("Network.getCookies").get("cookies", [])
+        return [self._to_selenium_cookie(cookie) for cookie in cookies]
+
+    def get_cookie(self, name: str) -> Optional[Dict[str, Any]]:
+        for cookie in self.get_cookies():
+            if cookie["name"] == name:
+                return cookie
+        return None
+
+    def delete_cookie(self, name: str, domain: str = None, path: str = None):
+        """删除当前页面的指定Cookie"""
+        params = {"name": name}
+        if domain:
+            params["domain"] = domain
+            if path:
+                params["path"] = path
+        else:
+            params["url"] = self.current_url
+        self.send("Network.deleteCookies", params)
+
+    def delete_all_cookies(self):
+        """删除当前页面可见的所有Cookie（与Selenium一致，不清除其他站点的Cookie）"""
+        for cookie in self.get_cookies():
+            self.delete_cookie(cookie["name"], cookie.get("domain"), cookie.get("path"))
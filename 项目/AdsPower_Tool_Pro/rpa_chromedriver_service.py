@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+chromedriver服务进程池
+按webdriver路径共享chromedriver进程，多个debuggerAddress会话复用同一进程，
+避免每次连接浏览器都启动新的chromedriver；进程退出或无法连接时才重新启动
+"""
+
+import atexit
+import threading
+import time
+from typing import Any, Dict
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+
+from adspower_metrics import LatencyHistogram
+
+
+class SharedChromeService(Service):
+    """共享的chromedriver服务 - 进程由服务池管理，WebDriver.quit()时不停止进程"""
+
+    def __init__(self, *args, on_spawn=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.on_spawn = on_spawn  # 每次真正启动进程后回调
+        self._start_lock = threading.Lock()
+
+    def start(self):
+        # 多个会话可能同时创建，只有第一个真正启动进程
+        with self._start_lock:
+            if self.is_running():
+                return
+            if getattr(self, "process", None) is not None:
+                # 进程存在但无法连接（卡死），先结束再启动
+                self.terminate()
+            super().start()
+            if self.on_spawn:
+                self.on_spawn()
+
+    def stop(self):
+        # 会话结束时WebDriver会调用stop()，共享进程由服务池统一关闭
+        pass
+
+    def is_running(self) -> bool:
+        """进程存活且端口可连接"""
+        process = getattr(self, "process", None)
+        if process is None or process.poll() is not None:
+            return False
+        try:
+            return self.is_connectable()
+        except Exception:
+            return False
+
+    def has_exited(self) -> bool:
+        """进程曾启动且已退出（崩溃或被结束）"""
+        process = getattr(self, "process", None)
+        return process is not None and process.poll() is not None
+
+    def terminate(self):
+        """真正停止chromedriver进程"""
+        try:
+            super().stop()
+        except Exception as e:
+            print(f"[chromedriver] 停止服务失败: {e}")
+
+
+class ChromeDriverServicePool:
+    """chromedriver服务池 - 线程安全，每个webdriver路径一个进程"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._services = {}  # webdriver_path -> SharedChromeService
+        self._path_locks = {}  # webdriver_path -> Lock，避免同一路径并发启动多个进程
+        self.attach_latency = LatencyHistogram()
+
+        self.stats = {
+            "spawns": 0,           # 启动chromedriver进程次数
+            "restarts": 0,         # 进程崩溃或无法连接后重启次数
+            "attaches": 0,         # 成功创建的WebDriver会话
+            "attach_failures": 0   # 创建会话失败次数
+        }
+
+    def _get_path_lock(self, webdriver_path: str) -> threading.Lock:
+        with self._lock:
+            lock = self._path_locks.get(webdriver_path)
+            if lock is None:
+                lock = self._path_locks[webdriver_path] = threading.Lock()
+            return lock
+
+    def _on_spawn(self):
+        with self._lock:
+            self.stats["spawns"] += 1
+
+    def get_service(self, webdriver_path: str = "") -> SharedChromeService:
+        """获取该路径的chromedriver服务，进程已退出时重新创建
+
+        进程在创建WebDriver时按需启动；webdriver_path为空时由Selenium自动查找chromedriver
+        """
+        webdriver_path = webdriver_path or ""
+        with self._get_path_lock(webdriver_path):
+            service = self._services.get(webdriver_path)
+            if service is not None and not service.has_exited():
+                return service
+
+            if service is not None:
+                print(f"[chromedriver] 服务进程已退出，重新启动: {webdriver_path or '默认'}")
+                service.terminate()
+                with self._lock:
+                    self.stats["restarts"] += 1
+
+            if webdriver_path:
+                service = SharedChromeService(webdriver_path, on_spawn=self._on_spawn)
+            else:
+                service = SharedChromeService(on_spawn=self._on_spawn)
+            with self._lock:
+                self._services[webdriver_path] = service
+            return service
+
+    def create_driver(self, webdriver_path: str = "", options=None):
+        """在共享的chromedriver服务上创建WebDriver会话（如连接到debuggerAddress）"""
+        started = time.monotonic()
+        for attempt in range(2):
+            service = self.get_service(webdriver_path)
+            try:
+                driver = webdriver.Chrome(service=service, options=options)
+            except Exception:
+                # 进程崩溃导致的失败重启一次再试
+                if attempt == 0 and service.has_exited():
+                    continue
+                with self._lock:
+                    self.stats["attach_failures"] += 1
+                raise
+            with self._lock:
+                self.stats["attaches"] += 1
+                self.attach_latency.observe(time.monotonic() - started)
+            return driver
+
+    def shutdown(self):
+        """停止所有chromedriver进程"""
+        with self._lock:
+            services = list(self._services.values())
+            self._services.clear()
+        for service in services:
+            service.terminate()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取服务池统计"""
+        with self._lock:
+            stats = self.stats.copy()
+            stats["attach_latency"] = self.attach_latency.to_dict()
+            stats["services"] = {
+                path or "default": service.is_running()
+                for path, service in self._services.items()
+            }
+        return stats
+
+
+# 全局chromedriver服务池 - 执行器和API客户端共享
+chromedriver_services = ChromeDriverServicePool()
+atexit.register(chromedriver_services.shutdown)
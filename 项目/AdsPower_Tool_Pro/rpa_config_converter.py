@@ -242,7 +242,7 @@ class AdsPowerConfigConverter:
             },
             "页面截图": {
                 "required": [],
-                "optional": ["screenshot_name", "full_page", "image_format", "jpeg_quality"]
+                "optional": ["screenshot_name", "full_page", "image_format", "jpeg_quality", "screenshot_dir"]
             },
             "等待时间": {
                 "required": ["wait_type"],
@@ -200,9 +200,9 @@ class AdsPowerStandardConfig:
                 "image_format": {
                     "type": "select",
                     "label": "图片格式",
-                    "options": ["png", "jpeg"],
+                    "options": ["png", "jpeg", "webp"],
                     "default": "png",
-                    "help": "选取输出图片的格式为png或jpeg"
+                    "help": "选取输出图片的格式为png、jpeg或webp"
                 },
                 "jpeg_quality": {
                     "type": "number",
@@ -211,7 +211,13 @@ class AdsPowerStandardConfig:
                     "max": 100,
                     "default": 80,
                     "visible_when": "image_format=jpeg",
-                    "help": "选择jpeg时，可以选择输出图片的质量"
+                    "help": "选择jpeg或webp时，可以选择输出图片的质量"
+                },
+                "screenshot_dir": {
+                    "type": "string",
+                    "label": "保存目录",
+                    "placeholder": "可输入截图保存的目录",
+                    "help": "默认：任务配置的截图目录，未配置时为当前目录"
                 }
             }
         }
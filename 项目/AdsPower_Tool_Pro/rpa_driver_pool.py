@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+RPA WebDriver连接池
+按环境ID缓存已连接的WebDriver，同一环境的后续任务直接复用，
+空闲超时、超出空闲上限或健康检查失败时才断开连接并关闭浏览器
+"""
+
+import threading
+import time
+from typing import Any, Dict, Optional
+
+
+class PooledDriver:
+    """连接池中的一个WebDriver连接"""
+
+    def __init__(self, env_id: str, driver, selenium_config: Dict = None,
+                 api_client=None, close_browser: bool = True):
+        self.env_id = str(env_id)
+        self.driver = driver
+        self.selenium_config = selenium_config or {}
+        self.api_client = api_client          # 驱逐时用于关闭浏览器
+        self.close_browser = close_browser    # 驱逐时是否关闭浏览器（复用的已打开浏览器不关闭）
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.uses = 1
+        self.in_use = True
+
+
+class WebDriverPool:
+    """WebDriver连接池 - 线程安全，每个环境最多保留一个连接"""
+
+    def __init__(self, idle_timeout: float = 120, max_idle: int = 10, reap_interval: float = 10):
+        self.idle_timeout = idle_timeout    # 空闲超过该秒数后驱逐
+        self.max_idle = max_idle            # 最多保留的空闲连接数，超出时驱逐最久未用的
+        self.reap_interval = reap_interval  # 空闲检查间隔
+
+        self._lock = threading.Lock()
+        self._entries = {}  # env_id -> PooledDriver
+        self._reaper = None
+        self._stop_event = threading.Event()
+
+        self.stats = {
+            "hits": 0,              # 复用池中连接
+            "misses": 0,            # 池中无可用连接
+            "adopted": 0,           # 新连接加入连接池
+            "health_failures": 0,   # 健康检查失败
+            "evicted_idle": 0,      # 空闲超时驱逐
+            "evicted_overflow": 0,  # 超出空闲上限驱逐
+            "evicted_other": 0      # 其他原因驱逐（健康检查失败、手动关闭）
+        }
+
+    # ==================== 获取与归还 ====================
+
+    def acquire(self, env_id: str) -> Optional[PooledDriver]:
+        """取出该环境的空闲连接，健康检查失败或无可用连接时返回None"""
+        env_id = str(env_id)
+        with self._lock:
+            entry = self._entries.get(env_id)
+            if entry is None or entry.in_use:
+                self.stats["misses"] += 1
+                return None
+            entry.in_use = True
+
+        if not self.is_healthy(entry):
+            with self._lock:
+                self.stats["health_failures"] += 1
+                self.stats["misses"] += 1
+            self._evict(entry, "other")
+            return None
+
+        with self._lock:
+            entry.uses += 1
+            entry.last_used = time.monotonic()
+            self.stats["hits"] += 1
+        return entry
+
+    def adopt(self, env_id: str, driver, selenium_config: Dict = None,
+              api_client=None, close_browser: bool = True) -> Optional[PooledDriver]:
+        """将新建的连接纳入连接池（标记为使用中），该环境已有连接时返回None"""
+        env_id = str(env_id)
+        with self._lock:
+            if env_id in self._entries:
+                return None
+            entry = PooledDriver(env_id, driver, selenium_config, api_client, close_browser)
+            self._entries[env_id] = entry
+            self.stats["adopted"] += 1
+        self._ensure_reaper()
+        return entry
+
+    def release(self, entry: PooledDriver, healthy: bool = True):
+        """任务结束后归还连接；healthy为False时直接驱逐"""
+        if not healthy:
+            self._evict(entry, "other")
+            return
+
+        overflow = []
+        with self._lock:
+            if self._entries.get(entry.env_id) is not entry:
+                return
+            entry.in_use = False
+            entry.last_used = time.monotonic()
+
+            idle = sorted((e for e in self._entries.values() if not e.in_use), key=lambda e: e.last_used)
+            if len(idle) > self.max_idle:
+                overflow = idle[:len(idle) - self.max_idle]
+        for old_entry in overflow:
+            self._evict(old_entry, "overflow")
+
+    # ==================== 健康检查与驱逐 ====================
+
+    @staticmethod
+    def is_healthy(entry: PooledDriver) -> bool:
+        """检查浏览器窗口是否仍可操作"""
+        try:
+            entry.driver.current_window_handle
+            return True
+        except Exception:
+            return False
+
+    def _evict(self, entry: PooledDriver, reason: str):
+        """移出连接池并断开连接，必要时关闭浏览器"""
+        with self._lock:
+            if self._entries.get(entry.env_id) is entry:
+                del self._entries[entry.env_id]
+            self.stats[f"evicted_{reason}"] += 1
+
+        try:
+            entry.driver.quit()
+        except Exception as e:
+            print(f"[连接池] 断开WebDriver失败 {entry.env_id}: {e}")
+
+        if entry.close_browser and entry.api_client is not None:
+            try:
+                entry.api_client.close_browser(entry.env_id)
+            except Exception as e:
+                print(f"[连接池] 关闭浏览器失败 {entry.env_id}: {e}")
+
+    def evict(self, env_id: str) -> bool:
+        """手动驱逐某个环境的空闲连接"""
+        with self._lock:
+            entry = self._entries.get(str(env_id))
+            if entry is None or entry.in_use:
+                return False
+            entry.in_use = True
+        self._evict(entry, "other")
+        return True
+
+    def has_idle(self, env_id: str) -> bool:
+        """该环境是否有可直接取用的空闲连接"""
+        with self._lock:
+            entry = self._entries.get(str(env_id))
+            return entry is not None and not entry.in_use
+
+    def close_idle(self):
+        """驱逐所有空闲连接（使用中的连接在归还后按正常规则处理）"""
+        with self._lock:
+            idle = [e for e in self._entries.values() if not e.in_use]
+            for entry in idle:
+                entry.in_use = True
+        for entry in idle:
+            self._evict(entry, "other")
+
+    def _ensure_reaper(self):
+        if self._reaper and self._reaper.is_alive():
+            return
+        self._stop_event.clear()
+        self._reaper = threading.Thread(target=self._reap_loop, name="RPADriverPoolReaper", daemon=True)
+        self._reaper.start()
+
+    def _reap_loop(self):
+        while not self._stop_event.wait(self.reap_interval):
+            now = time.monotonic()
+            with self._lock:
+                expired = [e for e in self._entries.values()
+                           if not e.in_use and now - e.last_used >= self.idle_timeout]
+                for entry in expired:
+                    entry.in_use = True
+            for entry in expired:
+                print(f"[连接池] 空闲超时，关闭环境连接: {entry.env_id}")
+                self._evict(entry, "idle")
+
+    def shutdown(self):
+        """停止空闲检查并关闭所有空闲连接"""
+        self._stop_event.set()
+        self.close_idle()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取连接池统计"""
+        with self._lock:
+            stats = self.stats.copy()
+            stats.update({
+                "size": len(self._entries),
+                "idle": sum(1 for e in self._entries.values() if not e.in_use),
+                "in_use": sum(1 for e in self._entries.values() if e.in_use)
+            })
+        total = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / total, 4) if total else 0
+        return stats
+
+
+# 全局WebDriver连接池 - 线程管理器和批量管理器共享
+webdriver_pool = WebDriverPool()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+RPA元素句柄缓存
+连续步骤常操作同一选择器（经过→点击→读取数据），按 (frame, 选择器, 策略) 缓存find_elements的结果；
+命中时用一次页面脚本重新计算选择器，确认匹配数量不变且要用的元素仍在原来的位置（不创建新的元素引用），否则重新查找；
+页面跳转、切换标签和切换frame时整体失效。未指定类型的选择器只检测一次是CSS还是XPath
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from selenium.common.exceptions import InvalidSelectorException
+from selenium.webdriver.common.by import By
+
+from rpa_cdp_backend import FIND_ELEMENTS_JS
+
+# arguments: selector, strategy, 缓存的匹配数, [[序号, 元素], ...]
+# 选择器仍匹配同样多的元素且要用的元素在原位置（点击后不再匹配、前面插入新行等都会失效；
+# 跳转后旧元素的引用会抛出StaleElementReferenceException）
+_VALID_JS = ("return (function() {" + FIND_ELEMENTS_JS + """
+const found = __rpaFind(arguments[0], arguments[1]);
+if (found.length !== arguments[2]) return false;
+return arguments[3].every(function(probe) { return found[probe[0]] === probe[1]; });
+}).apply(null, arguments);""")
+
+# 未指定类型的选择器 -> 检测出的查找方式（与页面无关，进程内共享；按行渲染的模板选择器各不相同，按LRU限制数量）
+_detected_by = OrderedDict()
+_detected_lock = threading.Lock()
+_MAX_DETECTED = 1024
+
+
+def _looks_like_xpath(selector: str) -> bool:
+    return selector.startswith(("/", "./", "(", ".."))
+
+
+class ElementCache:
+    """一个浏览器会话的元素句柄缓存"""
+
+    def __init__(self, max_entries: int = 128):
+        self.max_entries = max_entries
+        self.frame = ""       # 当前frame标识，顶层文档为空
+        self._driver = None   # 缓存所属的WebDriver，更换驱动时整体失效
+        self._entries = OrderedDict()  # (frame, by, selector) -> [WebElement]
+        self.stats = {"hits": 0, "misses": 0, "stale": 0, "invalidations": 0}
+
+    # ==================== 查找方式 ====================
+
+    @staticmethod
+    def resolve_by(selector: str, selector_type: str = None):
+        """选择器类型 -> (By, 选择器)；类型未知且尚未检测过时返回 (None, 选择器)"""
+        if selector_type == 'XPath':
+            return By.XPATH, selector
+        if selector_type == 'Selector':
+            return By.CSS_SELECTOR, selector
+        if selector_type == '文本':
+            return By.XPATH, f"//*[contains(text(), '{selector}')]"
+        if _looks_like_xpath(selector):
+            return By.XPATH, selector
+        with _detected_lock:
+            by = _detected_by.get(selector)
+            if by is not None:
+                _detected_by.move_to_end(selector)
+        return by, selector
+
+    @staticmethod
+    def _detect(driver, selector: str):
+        """先按CSS查找，选择器不是合法CSS时按XPath，并记住结果；返回 (By, 元素列表)"""
+        try:
+            elements = driver.find_elements(By.CSS_SELECTOR, selector)
+            by = By.CSS_SELECTOR
+        except InvalidSelectorException:
+            elements = driver.find_elements(By.XPATH, selector)
+            by = By.XPATH
+        with _detected_lock:
+            _detected_by[selector] = by
+            if len(_detected_by) > _MAX_DETECTED:
+                _detected_by.popitem(last=False)
+        return by, elements
+
+    # ==================== 查找 ====================
+
+    def find(self, driver, selector: str, selector_type: str = None, index: int = None,
+             refresh: bool = False) -> Optional[List[Any]]:
+        """查找元素，命中缓存且要用的元素（index，未指定时为首尾元素）仍有效时直接返回；选择器无效返回None
+
+        refresh为True时总是重新查找（需要页面上的全部元素时）；结果为空时不缓存，以便等待中的元素出现后能被找到
+        """
+        if driver is not self._driver:
+            self._driver = driver
+            self._entries.clear()
+
+        by, query = self.resolve_by(selector, selector_type)
+        if by is not None and not refresh:
+            key = (self.frame, by, query)
+            elements = self._entries.get(key)
+            if elements is not None:
+                if (index is None or index < len(elements)) and self._valid(driver, by, query, elements, index):
+                    self._entries.move_to_end(key)
+                    self.stats["hits"] += 1
+                    return elements
+                self.stats["stale"] += 1
+                del self._entries[key]
+
+        self.stats["misses"] += 1
+        try:
+            if by is None:
+                by, elements = self._detect(driver, query)
+            else:
+                elements = driver.find_elements(by, query)
+        except Exception:
+            return None
+
+        key = (self.frame, by, query)
+        if elements:
+            self._entries[key] = elements
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        else:
+            self._entries.pop(key, None)
+        return elements
+
+    @staticmethod
+    def _valid(driver, by, query: str, elements: List[Any], index: int = None) -> bool:
+        positions = [index % len(elements)] if index is not None else sorted({0, len(elements) - 1})
+        probe = [[position, elements[position]] for position in positions]
+        strategy = "xpath" if by == By.XPATH else "css"
+        try:
+            return driver.execute_script(_VALID_JS, query, strategy, len(elements), probe) is True
+        except Exception:
+            return False
+
+    # ==================== 失效 ====================
+
+    def invalidate(self):
+        """页面跳转、切换标签或浏览器后调用，回到顶层文档"""
+        if self._entries:
+            self.stats["invalidations"] += 1
+        self._entries.clear()
+        self.frame = ""
+
+    def switch_frame(self, frame: str):
+        """切换到frame（空字符串为顶层文档），之前的元素句柄不再可用"""
+        self.invalidate()
+        self.frame = frame or ""
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = self.stats.copy()
+        stats["cached"] = len(self._entries)
+        stats["frame"] = self.frame
+        return stats
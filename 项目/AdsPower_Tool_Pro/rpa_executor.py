@@ -45,9 +45,18 @@ from selenium.webdriver.support import expected_conditions as EC
 from rpa_config_converter import convert_to_adspower_standard, validate_config
 from rpa_executor_standard import AdsPowerStandardExecutor
 from rpa_missing_functions import missing_functions
+from rpa_chromedriver_service import chromedriver_services
+from rpa_cdp_backend import CDPPage, CDPError, CDP_AVAILABLE
+from rpa_operation_registry import rpa_operation, rpa_operations
+from rpa_template import RAW_PARAMS, template_cache
+from rpa_readiness import wait_dom_quiet, wait_element_ready, wait_network_idle, wait_ready_state
+from rpa_network_capture import NetworkCapture, RequestFilter
+from rpa_bulk_extract import OBJECT_FIELDS, extract_elements
+from rpa_element_cache import ElementCache
+from rpa_screenshot_writer import BROWSER_FORMATS, capture_screenshot, normalize_format, screenshot_writer
+from rpa_resource_policy import ResourceBlocker, ResourcePolicy, ResourceStats
 from selenium.webdriver.support.ui import Select
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 
 # 导入变量管理、数据管理、日志、异常处理和AdsPower API模块
@@ -95,8 +104,65 @@ except ImportError:
 class RPAExecutor:
     """RPA执行引擎 - 集成变量管理、数据管理和日志系统"""
 
-    def __init__(self, browser_driver=None, task_name="RPA_Task"):
+    # 可直接通过CDP执行的操作（标准操作名），其余操作在CDP后端下按需连接Selenium执行
+    CDP_OPERATIONS = {
+        "访问网站": "_cdp_goto_url",
+        "刷新页面": "_cdp_refresh_page",
+        "页面后退": "_cdp_page_back",
+        "页面截图": "page_screenshot",
+        "点击元素": "_cdp_click_element",
+        "经过元素": "_cdp_hover_element",
+        "元素聚焦": "_cdp_focus_element",
+        "输入内容": "_cdp_input_content"
+    }
+    # 可能切换当前标签页的操作，Selenium执行后CDP需跟随切换
+    TAB_OPERATIONS = {"新建标签", "关闭标签", "关闭其他标签", "切换标签"}
+    # 执行后页面或frame会变化、缓存的元素句柄全部失效的操作
+    NAVIGATION_OPERATIONS = TAB_OPERATIONS | {"访问网站", "刷新页面", "页面后退", "页面前进", "iframe内点击",
+                                              "切换环境", "启动新浏览器", "关闭浏览器", "使用其他流程"}
+    # 步骤的resource_policy取此值时恢复流程的资源屏蔽策略
+    FLOW_RESOURCE_POLICY = "流程默认"
+
+    def __init__(self, browser_driver=None, task_name="RPA_Task", backend="selenium"):
+        self.backend = backend  # 执行后端：selenium / cdp
+        self.cdp = None         # CDP后端的页面会话
+        self.network_capture = None  # 当前标签页的网络事件捕获（独立的CDP连接，两种后端通用）
         self.driver = browser_driver
+        self.loop_stack = []  # 循环栈
+        self.ready_timeout = 3  # 元素就绪等待上限（秒），满足条件立即返回
+        self.element_cache = ElementCache()  # 选择器 -> 元素句柄缓存（Selenium）
+        self.screenshot_dir = ""        # 截图保存目录，为空时保存到当前目录
+        self.pending_screenshots = []   # 已提交、后台写入中的截图
+        self.resource_policy = None     # 流程的资源屏蔽策略
+        self.resource_blocker = None    # 浏览器所有标签页的资源屏蔽（独立的CDP连接，两种后端通用）
+        self.resource_stats = ResourceStats()
+
+        # 初始化变量管理、数据管理、日志、异常处理和AdsPower API系统
+        self.variable_manager = RPAVariableManager()
+        self.data_manager = RPADataManager()
+        self.logger = RPALogger(task_name)
+        self.exception_handler = RPAExceptionHandler(self.logger)
+        self.adspower_api = AdsPowerAPIClient()
+
+        # 兼容性：保持原有的variables属性
+        self.variables = self.variable_manager.variables
+
+        # AdsPower集成相关
+        self.current_env_id = None
+        self.adspower_driver = None
+        self.selenium_config = None
+        self.browser_reused = False  # 浏览器是否为复用的已打开浏览器（断开时不关闭）
+        self.driver_pool = None      # 连接来自WebDriver连接池时，断开即归还
+        self.pooled_driver = None
+
+        # 执行统计
+        self.execution_stats = {
+            "total_steps": 0,
+            "successful_steps": 0,
+            "failed_steps": 0,
+            "start_time": None,
+            "end_time": None
+        }
 
     def execute_with_standard_config(self, step_config: dict) -> dict:
         """使用标准配置执行步骤"""
@@ -134,9 +200,10 @@ class RPAExecutor:
 
         except Exception as e:
             error_msg = f"导入Excel失败: {str(e)}"
-            self.log_error(error_msg)
+            self.logger.error(error_msg)
             return {"success": False, "message": error_msg}
 
+    @rpa_operation("Excel字段提取")
     def excel_extract_field(self, config):
         """Excel字段提取 - 官方节点"""
         try:
@@ -147,9 +214,10 @@ class RPAExecutor:
 
         except Exception as e:
             error_msg = f"Excel字段提取失败: {str(e)}"
-            self.log_error(error_msg)
+            self.logger.error(error_msg)
             return {"success": False, "message": error_msg}
 
+    @rpa_operation("iframe内点击")
     def click_inside_iframe(self, config):
         """iframe内点击 - 官方节点"""
         try:
@@ -160,9 +228,10 @@ class RPAExecutor:
 
         except Exception as e:
             error_msg = f"iframe内点击失败: {str(e)}"
-            self.log_error(error_msg)
+            self.logger.error(error_msg)
             return {"success": False, "message": error_msg}
 
+    @rpa_operation("Else条件")
     def else_condition(self, config):
         """Else条件 - 官方节点"""
         try:
@@ -170,9 +239,10 @@ class RPAExecutor:
 
         except Exception as e:
             error_msg = f"Else条件执行失败: {str(e)}"
-            self.log_error(error_msg)
+            self.logger.error(error_msg)
             return {"success": False, "message": error_msg}
 
+    @rpa_operation("断点调试")
     def breakpoint_debug(self, config):
         """断点调试 - 官方节点"""
         try:
@@ -180,9 +250,10 @@ class RPAExecutor:
 
         except Exception as e:
             error_msg = f"断点调试失败: {str(e)}"
-            self.log_error(error_msg)
+            self.logger.error(error_msg)
             return {"success": False, "message": error_msg}
 
+    @rpa_operation("切换环境")
     def switch_profile(self, config):
         """切换环境 - 官方节点"""
         try:
@@ -197,9 +268,10 @@ class RPAExecutor:
 
         except Exception as e:
             error_msg = f"切换环境失败: {str(e)}"
-            self.log_error(error_msg)
+            self.logger.error(error_msg)
             return {"success": False, "message": error_msg}
 
+    @rpa_operation("设置线程延迟")
     def set_thread_delay(self, config):
         """设置线程延迟 - 官方节点"""
         try:
@@ -207,20 +279,21 @@ class RPAExecutor:
 
         except Exception as e:
             error_msg = f"设置线程延迟失败: {str(e)}"
-            self.log_error(error_msg)
+            self.logger.error(error_msg)
             return {"success": False, "message": error_msg}
 
+    @rpa_operation("抛出错误")
     def throw_error(self, config):
         """抛出错误 - 官方节点"""
         try:
-            missing_functions.execution_log = self.execution_log
             return missing_functions.throw_error(config)
 
         except Exception as e:
             error_msg = f"抛出错误失败: {str(e)}"
-            self.log_error(error_msg)
+            self.logger.error(error_msg)
             return {"success": False, "message": error_msg}
 
+    @rpa_operation("设置流程状态")
     def set_process_status(self, config):
         """设置流程状态 - 官方节点"""
         try:
@@ -229,9 +302,10 @@ class RPAExecutor:
 
         except Exception as e:
             error_msg = f"设置流程状态失败: {str(e)}"
-            self.log_error(error_msg)
+            self.logger.error(error_msg)
             return {"success": False, "message": error_msg}
 
+    @rpa_operation("OpenAI请求", aliases=("openAI", "OpenAI"))
     def openai_request(self, config):
         """OpenAI请求 - 官方节点"""
         try:
@@ -240,9 +314,10 @@ class RPAExecutor:
 
         except Exception as e:
             error_msg = f"OpenAI请求失败: {str(e)}"
-            self.log_error(error_msg)
+            self.logger.error(error_msg)
             return {"success": False, "message": error_msg}
 
+    @rpa_operation("HTTP请求")
     def http_request(self, config):
         """HTTP请求 - 官方节点"""
         try:
@@ -251,9 +326,10 @@ class RPAExecutor:
 
         except Exception as e:
             error_msg = f"HTTP请求失败: {str(e)}"
-            self.log_error(error_msg)
+            self.logger.error(error_msg)
             return {"success": False, "message": error_msg}
 
+    @rpa_operation("Google表格", aliases=("googleSheet", "Google Sheet"))
     def google_sheets(self, config):
         """Google表格 - 官方节点"""
         try:
@@ -261,9 +337,10 @@ class RPAExecutor:
 
         except Exception as e:
             error_msg = f"Google表格操作失败: {str(e)}"
-            self.log_error(error_msg)
+            self.logger.error(error_msg)
             return {"success": False, "message": error_msg}
 
+    @rpa_operation("Slack通知")
     def slack_webhook(self, config):
         """Slack通知 - 官方节点"""
         try:
@@ -271,9 +348,10 @@ class RPAExecutor:
 
         except Exception as e:
             error_msg = f"Slack通知失败: {str(e)}"
-            self.log_error(error_msg)
+            self.logger.error(error_msg)
             return {"success": False, "message": error_msg}
 
+    @rpa_operation("发送邮件")
     def send_email(self, config):
         """发送邮件 - 官方节点"""
         try:
@@ -281,33 +359,19 @@ class RPAExecutor:
 
         except Exception as e:
             error_msg = f"发送邮件失败: {str(e)}"
-            self.log_error(error_msg)
+            self.logger.error(error_msg)
             return {"success": False, "message": error_msg}
-        self.loop_stack = []  # 循环栈
 
-        # 初始化变量管理、数据管理、日志、异常处理和AdsPower API系统
-        self.variable_manager = RPAVariableManager()
-        self.data_manager = RPADataManager()
-        self.logger = RPALogger(task_name)
-        self.exception_handler = RPAExceptionHandler(self.logger)
-        self.adspower_api = AdsPowerAPIClient()
+    @property
+    def driver(self):
+        """Selenium WebDriver；CDP后端下首次使用时才连接"""
+        if self._driver is None and self.cdp is not None:
+            self._attach_fallback_driver()
+        return self._driver
 
-        # 兼容性：保持原有的variables属性
-        self.variables = self.variable_manager.variables
-
-        # AdsPower集成相关
-        self.current_env_id = None
-        self.adspower_driver = None
-        self.selenium_config = None
-
-        # 执行统计
-        self.execution_stats = {
-            "total_steps": 0,
-            "successful_steps": 0,
-            "failed_steps": 0,
-            "start_time": None,
-            "end_time": None
-        }
+    @driver.setter
+    def driver(self, driver):
+        self._driver = driver
 
     def set_driver(self, driver):
         """设置浏览器驱动"""
@@ -320,12 +384,8 @@ class RPAExecutor:
         self.variables = self.variable_manager.variables
 
     def get_variable_value(self, value_str):
-        """解析变量值 - 支持AdsPower变量语法"""
-        if isinstance(value_str, str) and value_str.startswith('${') and value_str.endswith('}'):
-            # 提取变量名
-            var_name = value_str[2:-1]
-            return self.variable_manager.get_variable(var_name, value_str)
-        return value_str
+        """解析变量值 - 支持AdsPower变量语法，字符串中的 ${name} / ${a.b} 均会替换"""
+        return template_cache.render(value_str, self.variables)
 
     def set_variable(self, name, value, var_type="custom"):
         """设置变量"""
@@ -335,13 +395,28 @@ class RPAExecutor:
 
     # ==================== AdsPower集成方法 ====================
 
-    def connect_to_adspower_browser(self, env_id: str) -> Dict[str, Any]:
-        """连接到AdsPower浏览器环境"""
+    def connect_to_adspower_browser(self, env_id: str, driver_pool=None) -> Dict[str, Any]:
+        """连接到AdsPower浏览器环境
+
+        传入driver_pool时优先复用池中该环境的WebDriver，新建的连接也会纳入连接池；
+        backend为cdp时直接连接DevTools，失败时回退到Selenium
+        """
+        if self.backend == "cdp":
+            result = self._connect_cdp(env_id)
+            if result.get("success"):
+                return result
+            self.logger.info(f"CDP后端不可用，改用Selenium: {result.get('message')}")
+
         try:
             self.logger.info(f"正在连接到AdsPower环境: {env_id}")
 
-            # 启动AdsPower浏览器
-            start_result = self.adspower_api.start_browser(env_id)
+            if driver_pool is not None:
+                entry = driver_pool.acquire(env_id)
+                if entry is not None:
+                    return self._attach_pooled_driver(driver_pool, entry)
+
+            # 获取浏览器连接信息 - 浏览器已打开时复用，只有真正关闭时才启动
+            start_result = self.adspower_api.open_browser_session(env_id)
 
             if start_result.get("code") != 0:
                 error_msg = f"启动AdsPower浏览器失败: {start_result.get('msg', '未知错误')}"
@@ -369,20 +444,31 @@ class RPAExecutor:
             chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
             chrome_options.add_experimental_option('useAutomationExtension', False)
 
-            # 创建WebDriver连接
-            if webdriver_path and os.path.exists(webdriver_path):
-                service = Service(webdriver_path)
-                driver = webdriver.Chrome(service=service, options=chrome_options)
-            else:
-                driver = webdriver.Chrome(options=chrome_options)
+            # 创建WebDriver连接（同一webdriver路径共享一个chromedriver进程）
+            if not (webdriver_path and os.path.exists(webdriver_path)):
+                webdriver_path = ""
+            driver = chromedriver_services.create_driver(webdriver_path, chrome_options)
 
             # 隐藏WebDriver特征
             driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
 
+            # 纳入连接池，任务结束后归还而不是断开
+            browser_reused = start_result.get("reused", False)
+            if driver_pool is not None:
+                entry = driver_pool.adopt(env_id, driver, {
+                    "selenium_address": selenium_address,
+                    "webdriver_path": webdriver_path,
+                    "debug_port": debug_port
+                }, self.adspower_api, close_browser=not browser_reused)
+                if entry is not None:
+                    self.driver_pool = driver_pool
+                    self.pooled_driver = entry
+
             # 保存连接信息
             self.driver = driver
             self.adspower_driver = driver
             self.current_env_id = env_id
+            self.browser_reused = browser_reused
             self.selenium_config = {
                 "selenium_address": selenium_address,
                 "webdriver_path": webdriver_path,
@@ -401,7 +487,8 @@ class RPAExecutor:
                 "data": {
                     "env_id": env_id,
                     "selenium_address": selenium_address,
-                    "debug_port": debug_port
+                    "debug_port": debug_port,
+                    "reused": start_result.get("reused", False)
                 }
             }
 
@@ -410,19 +497,236 @@ class RPAExecutor:
             self.logger.error(error_msg)
             return {"success": False, "message": error_msg}
 
-    def disconnect_from_adspower_browser(self) -> Dict[str, Any]:
-        """断开AdsPower浏览器连接"""
+    def _attach_pooled_driver(self, driver_pool, entry) -> Dict[str, Any]:
+        """使用连接池中已连接的WebDriver"""
+        self.driver = entry.driver
+        self.adspower_driver = entry.driver
+        self.current_env_id = entry.env_id
+        self.browser_reused = not entry.close_browser
+        self.selenium_config = dict(entry.selenium_config)
+        self.driver_pool = driver_pool
+        self.pooled_driver = entry
+
+        env_info = self.adspower_api.get_profile_detail(entry.env_id)
+        if env_info:
+            self.set_environment_data(env_info)
+
+        self.logger.success(f"复用连接池中的AdsPower环境连接: {entry.env_id}")
+        return {
+            "success": True,
+            "message": "连接成功（复用连接池）",
+            "data": {
+                "env_id": entry.env_id,
+                "selenium_address": self.selenium_config.get("selenium_address", ""),
+                "debug_port": self.selenium_config.get("debug_port", ""),
+                "reused": True,
+                "pooled": True
+            }
+        }
+
+    def _connect_cdp(self, env_id: str) -> Dict[str, Any]:
+        """通过DevTools WebSocket直接连接AdsPower浏览器（不启动chromedriver）"""
+        if not CDP_AVAILABLE:
+            return {"success": False, "message": "未安装websocket-client"}
+
         try:
+            self.logger.info(f"正在通过CDP连接到AdsPower环境: {env_id}")
+            start_result = self.adspower_api.open_browser_session(env_id)
+            if start_result.get("code") != 0:
+                return {"success": False, "message": f"启动AdsPower浏览器失败: {start_result.get('msg', '未知错误')}"}
+
+            data = start_result.get("data", {})
+            selenium_address = data.get("ws", {}).get("selenium", "")
+            debug_port = data.get("debug_port", "")
+            host = selenium_address or (f"127.0.0.1:{debug_port}" if debug_port else "")
+            if not host:
+                return {"success": False, "message": "未获取到调试地址"}
+
+            self.cdp = CDPPage.connect(host)
+            self.current_env_id = env_id
+            self.browser_reused = start_result.get("reused", False)
+            # 保留Selenium连接信息，遇到CDP不支持的操作时按需连接
+            self.selenium_config = {
+                "selenium_address": selenium_address,
+                "webdriver_path": data.get("webdriver", ""),
+                "debug_port": debug_port
+            }
+
+            env_info = self.adspower_api.get_profile_detail(env_id)
+            if env_info:
+                self.set_environment_data(env_info)
+
+            self.logger.success(f"成功通过CDP连接到AdsPower环境: {env_id}")
+            return {
+                "success": True,
+                "message": "连接成功（CDP）",
+                "data": {
+                    "env_id": env_id,
+                    "selenium_address": selenium_address,
+                    "debug_port": debug_port,
+                    "reused": self.browser_reused,
+                    "backend": "cdp"
+                }
+            }
+        except Exception as e:
+            if self.cdp is not None:
+                self.cdp.close()
+                self.cdp = None
+            return {"success": False, "message": f"CDP连接失败: {str(e)}"}
+
+    def _attach_fallback_driver(self):
+        """CDP后端遇到需要Selenium的操作时，连接到同一浏览器"""
+        config = self.selenium_config or {}
+        chrome_options = Options()
+        chrome_options.add_experimental_option("debuggerAddress", config.get("selenium_address", ""))
+        webdriver_path = config.get("webdriver_path", "")
+        if not (webdriver_path and os.path.exists(webdriver_path)):
+            webdriver_path = ""
+
+        self.logger.info("当前操作需要Selenium，正在连接WebDriver")
+        driver = chromedriver_services.create_driver(webdriver_path, chrome_options)
+        # 让Selenium操作CDP当前所在的标签页
+        for handle in driver.window_handles:
+            if handle.replace("CDwindow-", "") == self.cdp.target_id:
+                driver.switch_to.window(handle)
+                break
+        self._driver = driver
+        self.adspower_driver = driver
+
+    def _sync_cdp_target(self):
+        """Selenium切换标签页后，CDP跟随到同一标签页"""
+        if self.cdp is None or self._driver is None:
+            return
+        try:
+            target_id = self._driver.current_window_handle.replace("CDwindow-", "")
+            if target_id != self.cdp.target_id:
+                self.cdp.attach(target_id)
+        except Exception as e:
+            self.logger.error(f"CDP切换标签页失败: {str(e)}")
+
+    def _current_target(self):
+        """当前标签页的 (调试地址, target_id)"""
+        if self.cdp is not None:
+            return self.cdp.host, self.cdp.target_id
+        host = (self.selenium_config or {}).get("selenium_address", "")
+        return host, self.driver.current_window_handle.replace("CDwindow-", "")
+
+    def _network_capture(self) -> Optional[NetworkCapture]:
+        """当前标签页的网络事件捕获，首次使用或切换标签页后建立；未安装websocket-client或连接失败返回None"""
+        if not CDP_AVAILABLE or not self.current_env_id:
+            return None
+        try:
+            host, target_id = self._current_target()
+            capture = self.network_capture
+            if capture is not None and capture.alive and capture.target_id == target_id:
+                return capture
+
+            self.stop_network_capture()
+            capture = NetworkCapture(CDPPage.connect(host, target_id))
+            capture.start()
+            self.network_capture = capture
+            return capture
+        except Exception as e:
+            self.logger.error(f"开启网络捕获失败: {str(e)}")
+            return None
+
+    def start_network_capture(self) -> bool:
+        """开始捕获当前标签页的网络请求（流程含监听请求步骤时在连接后调用，之前发生的请求也能匹配）"""
+        return self._network_capture() is not None
+
+    def stop_network_capture(self):
+        if self.network_capture is not None:
+            self.network_capture.stop()
+            self.network_capture = None
+
+    def set_resource_policy(self, policy) -> bool:
+        """设置流程的资源屏蔽策略（连接浏览器后、访问网页前调用）：预设名称或 {"block_types", "block_urls"}，为空时不屏蔽"""
+        try:
+            self.resource_policy = ResourcePolicy.parse(policy)
+        except ValueError as e:
+            self.logger.error(str(e))
+            return False
+        return self._apply_resource_policy(self.resource_policy)
+
+    def _apply_resource_policy(self, policy) -> bool:
+        """在浏览器的所有标签页应用屏蔽策略，返回是否成功；未安装websocket-client或连接失败时不屏蔽"""
+        try:
+            if policy == self.FLOW_RESOURCE_POLICY:
+                policy = self.resource_policy
+            policy = ResourcePolicy.parse(policy)
+            blocker = self.resource_blocker
+            if policy is None and blocker is None:
+                return True
+            if not CDP_AVAILABLE or not self.current_env_id:
+                return False
+
+            if blocker is None or not blocker.alive:
+                self.stop_resource_blocking()
+                host, _ = self._current_target()
+                blocker = ResourceBlocker.connect(host, self.resource_stats)
+                blocker.start()
+                self.resource_blocker = blocker
+            blocker.apply(policy)
+            return True
+        except Exception as e:
+            self.logger.error(f"设置资源屏蔽失败: {str(e)}")
+            return False
+
+    def stop_resource_blocking(self):
+        if self.resource_blocker is not None:
+            self.resource_blocker.stop()
+            self.resource_blocker = None
+
+    def get_resource_stats(self) -> Dict[str, Any]:
+        """本执行器的资源屏蔽统计（屏蔽的请求数、已加载字节数和估算节省的字节数）"""
+        return self.resource_stats.get_stats()
+
+    def _page(self):
+        """页面级操作的执行对象：CDP后端为CDPPage，否则为WebDriver（两者接口一致）"""
+        return self.cdp if self.cdp is not None else self.driver
+
+    def disconnect_from_adspower_browser(self, close_browser: bool = None) -> Dict[str, Any]:
+        """断开AdsPower浏览器连接
+
+        close_browser为None时，只关闭由本次连接启动的浏览器，复用的已打开浏览器保持运行；
+        连接来自连接池时归还连接池，由连接池在驱逐时断开
+        """
+        self.stop_network_capture()
+        self.stop_resource_blocking()
+        if self.cdp is not None:
+            self.cdp.close()
+            self.cdp = None
+
+        if self.pooled_driver is not None:
+            self.driver_pool.release(self.pooled_driver)
+            self.logger.info(f"已将浏览器连接归还连接池: {self.current_env_id}")
+            self.pooled_driver = None
+            self.driver_pool = None
+            self.adspower_driver = None
+            self.driver = None
+            self.current_env_id = None
+            self.browser_reused = False
+            self.selenium_config = None
+            return {"success": True, "message": "已归还连接池"}
+
+        try:
+            if close_browser is None:
+                close_browser = not self.browser_reused
+
             if self.adspower_driver:
                 self.adspower_driver.quit()
                 self.adspower_driver = None
                 self.driver = None
 
             if self.current_env_id:
-                # 关闭AdsPower浏览器
-                close_result = self.adspower_api.close_browser(self.current_env_id)
-                self.logger.info(f"关闭AdsPower浏览器: {close_result.get('msg', '')}")
+                if close_browser:
+                    # 关闭AdsPower浏览器
+                    close_result = self.adspower_api.close_browser(self.current_env_id)
+                    self.logger.info(f"关闭AdsPower浏览器: {close_result.get('msg', '')}")
+                else:
+                    self.logger.info(f"保留已打开的AdsPower浏览器: {self.current_env_id}")
                 self.current_env_id = None
+                self.browser_reused = False
 
             self.selenium_config = None
             self.logger.info("已断开AdsPower浏览器连接")
@@ -451,144 +755,184 @@ class RPAExecutor:
             return False
         
     def execute_step(self, step_config):
-        """执行单个步骤 - 完整支持所有50个AdsPower RPA功能"""
+        """执行单个步骤 - 按操作注册表分发"""
         operation = step_config.get('operation', '')
+        entry = rpa_operations.resolve(operation)
+        if entry is None:
+            return rpa_operations.unknown_operation(operation)
+        template_params = [key for key, value in step_config.items()
+                           if key not in RAW_PARAMS and template_cache.has_template(value)]
+        if template_params:
+            step_config = template_cache.render_params(step_config, template_params, self.variables)
+        return self._dispatch(entry, step_config)
+
+    def execute_compiled_step(self, step):
+        """执行流程编译器生成的步骤（CompiledStep），操作和参数已在编译时解析"""
+        if step.entry is None:
+            return rpa_operations.unknown_operation(step.operation)
+        params = step.params
+        if step.template_params:
+            # 编译时已确定含变量引用的参数，只渲染这些参数
+            params = template_cache.render_params(params, step.template_params, self.variables)
+        return self._dispatch(step.entry, params)
+
+    def _dispatch(self, entry, step_config):
+        """执行已解析的操作"""
+        # CDP后端：支持的操作直接执行，储存的元素对象为Selenium元素，仍交给Selenium
+        handler = None
+        if self.cdp is not None:
+            cdp_method = self.CDP_OPERATIONS.get(entry.name)
+            if cdp_method and step_config.get('stored_element') in (None, '', '无'):
+                handler = getattr(RPAExecutor, cdp_method)
+
+        # 步骤可指定资源屏蔽策略，如验证码页面需要加载图片时设为"关闭"；验证码图片常在步骤返回后才异步加载，
+        # 所以策略一直生效到下一个指定策略的步骤（"流程默认"恢复流程的策略）
+        if 'resource_policy' in step_config:
+            self._apply_resource_policy(step_config['resource_policy'])
+        result = rpa_operations.call(entry, self, step_config, handler)
+
+        if entry.name in self.NAVIGATION_OPERATIONS:
+            self.element_cache.invalidate()
+        if self.cdp is not None and entry.name in self.TAB_OPERATIONS:
+            self._sync_cdp_target()
+        return result
+
+    def get_operation_stats(self) -> Dict[str, Any]:
+        """获取各操作的调用次数和耗时（进程内所有执行器共享）"""
+        return rpa_operations.get_stats()
+    
+    # ==================== CDP后端实现 ====================
+
+    # 选择器类型 -> CDP查找策略
+    CDP_SELECTOR_STRATEGIES = {"XPath": "xpath", "文本": "text", "Selector": "css"}
+
+    @staticmethod
+    def _resolve_element_order(order_config) -> int:
+        """元素序号配置（固定值或区间随机）转换为0基索引"""
+        if isinstance(order_config, dict):
+            if order_config.get('type', '固定值') == '区间随机':
+                return random.randint(order_config.get('value', 1), order_config.get('max_value', 1)) - 1
+            return order_config.get('value', 1) - 1
+        return order_config - 1 if order_config else 0
+
+    def _cdp_goto_url(self, config):
+        """前往网址（CDP）"""
+        url = config.get('goto_url', '')
+        if not url:
+            return {"success": False, "message": "未指定URL"}
+        try:
+            self.cdp.navigate(url, config.get('wait_load', True), config.get('timeout_seconds', 30))
+            return {"success": True, "message": f"成功访问: {url}"}
+        except CDPError as e:
+            return {"success": False, "message": f"访问网址失败: {str(e)}"}
 
+    def _cdp_refresh_page(self, config):
+        """刷新页面（CDP）"""
         try:
-            # 页面操作功能组 (10个功能)
-            if operation == "新建标签":
-                return self.new_tab(step_config)
-            elif operation == "关闭标签":
-                return self.close_tab(step_config)
-            elif operation == "关闭其他标签":
-                return self.close_other_tabs(step_config)
-            elif operation == "切换标签":
-                return self.switch_tab(step_config)
-            elif operation == "访问网站":
-                return self.goto_url(step_config)
-            elif operation == "刷新页面":
-                return self.refresh_page(step_config)
-            elif operation == "页面后退":
-                return self.page_back(step_config)
-            elif operation == "页面截图":
-                return self.page_screenshot(step_config)
-            elif operation == "经过元素":
-                return self.hover_element(step_config)
-            elif operation == "下拉选择器":
-                return self.select_dropdown(step_config)
-
-            # 元素操作功能组 (10个功能)
-            elif operation == "元素聚焦":
-                return self.focus_element(step_config)
-            elif operation == "点击元素":
-                return self.click_element(step_config)
-            elif operation == "输入内容":
-                return self.input_content(step_config)
-            elif operation == "上传附件":
-                return self.upload_file(step_config)
-            elif operation == "执行JS脚本":
-                return self.execute_javascript(step_config)
-            elif operation == "键盘按键":
-                return self.keyboard_key(step_config)
-            elif operation == "组合键":
-                return self.keyboard_combo(step_config)
-            elif operation == "等待时间":
-                return self.wait_time(step_config)
-            elif operation == "等待元素出现":
-                return self.wait_element(step_config)
-            elif operation == "等待请求完成":
-                return self.wait_request(step_config)
-
-            # 数据获取功能组 (9个功能)
-            elif operation == "获取URL":
-                return self.get_url(step_config)
-            elif operation == "获取粘贴板内容":
-                return self.get_clipboard(step_config)
-            elif operation == "元素数据":
-                return self.get_element_data(step_config)
-            elif operation == "当前焦点元素":
-                return self.get_focused_element(step_config)
-            elif operation == "存到文件":
-                return self.save_to_file(step_config)
-            elif operation == "存到Excel":
-                return self.save_to_excel(step_config)
-            elif operation == "导入txt":
-                return self.import_txt(step_config)
-            elif operation == "获取邮件":
-                return self.get_email(step_config)
-            elif operation == "身份验证器码":
-                return self.get_totp(step_config)
-
-            # 网络监听功能组 (5个功能)
-            elif operation == "监听请求触发":
-                return self.listen_request_trigger(step_config)
-            elif operation == "监听请求结果":
-                return self.listen_request_result(step_config)
-            elif operation == "停止页面监听":
-                return self.stop_page_listening(step_config)
-            elif operation == "获取页面Cookie":
-                return self.get_cookies(step_config)
-            elif operation == "清除页面Cookie":
-                return self.clear_cookies(step_config)
-
-            # 数据处理功能组 (5个功能)
-            elif operation == "文本中提取":
-                return self.extract_text(step_config)
-            elif operation == "转换Json对象":
-                return self.convert_json(step_config)
-            elif operation == "字段提取":
-                return self.extract_field(step_config)
-            elif operation == "随机提取":
-                return self.random_extract(step_config)
-            elif operation == "更新环境备注":
-                return self.update_env_note(step_config)
-
-            # 流程控制功能组 (7个功能)
-            elif operation == "更新环境标签":
-                return self.update_env_tag(step_config)
-            elif operation == "启动新浏览器":
-                return self.start_new_browser(step_config)
-            elif operation == "使用其他流程":
-                return self.use_other_flow(step_config)
-            elif operation == "IF条件":
-                return self.if_condition(step_config)
-            elif operation == "For循环元素":
-                return self.for_element_loop(step_config)
-            elif operation == "For循环次数":
-                return self.for_count_loop(step_config)
-            elif operation == "For循环数据":
-                return self.for_data_loop(step_config)
-
-            # 循环控制功能组 (3个功能)
-            elif operation == "While循环":
-                return self.while_loop(step_config)
-            elif operation == "退出循环":
-                return self.break_loop(step_config)
-            elif operation == "关闭浏览器":
-                return self.close_browser(step_config)
-
-            # 第三方工具功能组 (1个功能)
-            elif operation == "2Captcha验证码识别":
-                return self.solve_captcha(step_config)
-
-            # 兼容旧版本操作名称
-            elif operation in ["新建标签页"]:
-                return self.new_tab(step_config)
-            elif operation in ["前往网址"]:
-                return self.goto_url(step_config)
-            elif operation in ["身份验证密码"]:
-                return self.get_totp(step_config)
-            elif operation in ["2Captcha"]:
-                return self.solve_captcha(step_config)
+            self.cdp.reload(config.get('nav_wait_load', True), 30)
+            return {"success": True, "message": "刷新页面成功"}
+        except CDPError as e:
+            return {"success": False, "message": f"刷新页面失败: {str(e)}"}
 
-            else:
-                return {"success": False, "message": f"未实现的操作: {operation}"}
+    def _cdp_page_back(self, config):
+        """页面后退（CDP）"""
+        try:
+            self.cdp.go_back(config.get('nav_wait_load', True), 30)
+            return {"success": True, "message": "页面后退成功"}
+        except CDPError as e:
+            return {"success": False, "message": f"页面后退失败: {str(e)}"}
+
+    def _cdp_click_element(self, config):
+        """点击元素（CDP）：一次脚本调用完成查找和滚动，再派发鼠标事件"""
+        if 'selector' in config:
+            selector = config.get('selector', '')
+            element_order = self._resolve_element_order(config.get('element_order', 1))
+            click_action = config.get('key_type', '单击')
+        else:
+            selector = config.get('click_selector', '')
+            element_order = config.get('click_element_order', 1) - 1
+            click_action = config.get('click_action', '单击')
+        click_type = config.get('click_type', '鼠标左键')
+
+        if not selector:
+            return {"success": False, "message": "选择器或储存的元素对象不能为空"}
+
+        button = {"鼠标右键": "right", "鼠标中键": "middle"}.get(click_type, "left")
+        click_count = 2 if click_action == '双击' else 1
+        strategy = self.CDP_SELECTOR_STRATEGIES.get(config.get('selector_type'), "auto")
+        info = self.cdp.click(selector, strategy, element_order, button, click_count)
+        if info is None:
+            return {"success": False, "message": f"未找到指定元素 (序号: {element_order + 1})"}
+        return {"success": True, "message": f"点击元素成功 ({click_type} {click_action})", "element_text": info.get("text", "")}
+
+    def _cdp_hover_element(self, config):
+        """经过元素（CDP）"""
+        selector = config.get('hover_selector', '')
+        strategy = self.CDP_SELECTOR_STRATEGIES.get(config.get('hover_selector_type', 'Selector'), "css")
+        element_order = config.get('hover_element_order', 1) - 1
+        if not selector:
+            return {"success": False, "message": "未指定元素选择器"}
+
+        info = self.cdp.hover(selector, strategy, element_order)
+        if info is None:
+            return {"success": False, "message": f"未找到指定的元素 (序号: {element_order + 1})"}
+        time.sleep(config.get('hover_duration', 500) / 1000)
+        return {"success": True, "message": "经过元素成功", "element_text": info.get("text", "")}
+
+    def _cdp_focus_element(self, config):
+        """元素聚焦（CDP）"""
+        selector = config.get('focus_selector', '')
+        strategy = self.CDP_SELECTOR_STRATEGIES.get(config.get('focus_selector_type', 'Selector'), "css")
+        element_order = config.get('focus_element_order', 1) - 1
+        if not selector:
+            return {"success": False, "message": "未指定元素选择器"}
+
+        info = self.cdp.focus(selector, strategy, element_order)
+        if info is None:
+            return {"success": False, "message": f"未找到指定元素 (序号: {element_order + 1})"}
+        # 与Selenium实现一致：输入类元素再点击一次确保聚焦
+        if info.get("tag") in ('input', 'textarea', 'select'):
+            self.cdp.click(selector, strategy, element_order)
+        return {"success": True, "message": "元素聚焦成功", "element_tag": info.get("tag")}
+
+    def _cdp_input_content(self, config):
+        """输入内容（CDP）：以insertText输入，逐字符间隔与Selenium实现一致"""
+        if 'selector' in config:
+            selector = config.get('selector', '')
+            element_order = config.get('element_order', 1)
+            content = config.get('content', '')
+            content_type = config.get('content_type', '顺序选取')
+            input_interval = config.get('input_interval', 300) / 1000
+            clear_before = config.get('clear_before', True)
+        else:
+            selector = config.get('input_selector', '')
+            element_order = config.get('input_element_order', 1)
+            content = config.get('input_content', '')
+            content_type = '顺序选取'
+            input_interval = config.get('input_interval', 100) / 1000
+            clear_before = config.get('input_method', '覆盖') == '覆盖'
+
+        if not selector:
+            return {"success": False, "message": "选择器或储存的元素对象不能为空"}
+        if not content:
+            return {"success": False, "message": "未指定输入内容"}
+
+        selected_content = self._select_input_content(content, content_type)
+        element_index = self._resolve_element_order(element_order)
+        strategy = self.CDP_SELECTOR_STRATEGIES.get(config.get('selector_type'), "auto")
+        info = self.cdp.type_text(selector, selected_content, strategy, element_index, clear_before, input_interval)
+        if info is None:
+            return {"success": False, "message": f"未找到指定输入元素 (序号: {element_index + 1})"}
+        return {
+            "success": True,
+            "message": f"输入内容成功 - 选择器: {selector}, 内容长度: {len(selected_content)}",
+            "content_length": len(selected_content),
+            "content_type": content_type
+        }
 
-        except Exception as e:
-            return {"success": False, "message": f"执行错误: {str(e)}"}
-    
     # ==================== 页面操作实现 ====================
     
+    @rpa_operation("新建标签", aliases=("新建标签页", "newPage", "newTab"))
     def new_tab(self, config):
         """新建标签页 - 完全按照AdsPower原版实现"""
         try:
@@ -615,6 +959,7 @@ class RPAExecutor:
         except Exception as e:
             return {"success": False, "message": f"新建标签页失败: {str(e)}"}
     
+    @rpa_operation("访问网站", aliases=("前往网址", "gotoUrl", "accessWebsite"))
     def goto_url(self, config):
         """前往网址"""
         try:
@@ -635,6 +980,7 @@ class RPAExecutor:
         except Exception as e:
             return {"success": False, "message": f"访问网址失败: {str(e)}"}
     
+    @rpa_operation("等待时间", aliases=("waitTime",))
     def wait_time(self, config):
         """等待时间"""
         try:
@@ -652,11 +998,22 @@ class RPAExecutor:
         except Exception as e:
             return {"success": False, "message": f"等待时间失败: {str(e)}"}
     
+    @rpa_operation("滚动页面", aliases=("scrollPage",))
     def scroll_page(self, config):
         """滚动页面"""
         try:
             scroll_type = config.get('scroll_range_type', '窗口')
             distance = config.get('scroll_distance', 500)
+            position = config.get('scroll_position', '')
+            behavior = config.get('scroll_behavior', 'auto')
+            
+            # 滚动到指定位置（顶部/中间/底部）
+            if position and scroll_type != '元素':
+                ratio = {'top': 0, 'middle': 0.5, 'center': 0.5, 'bottom': 1}.get(position, 1)
+                self._page().execute_script(
+                    "window.scrollTo({top: (document.body.scrollHeight - window.innerHeight) * arguments[0], behavior: arguments[1]});",
+                    ratio, behavior)
+                return {"success": True, "message": f"滚动到 {position}"}
             
             if scroll_type == '元素':
                 selector = config.get('scroll_selector', '')
@@ -672,6 +1029,16 @@ class RPAExecutor:
         except Exception as e:
             return {"success": False, "message": f"滚动页面失败: {str(e)}"}
     
+    def _scroll_into_view(self, element):
+        """滚动到元素并等待其进入视口、位置稳定，超时后照常继续；未渲染的元素立即返回"""
+        if not wait_element_ready(self.driver, element, self.ready_timeout):
+            self.logger.info("元素未在就绪等待时间内稳定，继续执行")
+
+    def _find_elements(self, selector, selector_type=None, index=None, refresh=False):
+        """按选择器类型查找元素（经元素缓存，index为将要使用的元素序号）；类型未知时只检测一次CSS/XPath，选择器无效返回None"""
+        return self.element_cache.find(self.driver, selector, selector_type, index, refresh)
+
+    @rpa_operation("点击元素", aliases=("click", "clickElement"))
     def click_element(self, config):
         """点击元素 - 完全按照AdsPower官方标准"""
         try:
@@ -716,24 +1083,18 @@ class RPAExecutor:
                 if not elements[0]:
                     return {"success": False, "message": f"储存的元素对象不存在: {stored_element}"}
             else:
-                # 使用选择器查找元素 - AdsPower官方支持CSS选择器
-                try:
-                    elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                except:
-                    # 如果CSS选择器失败，尝试XPath
-                    try:
-                        elements = self.driver.find_elements(By.XPATH, selector)
-                    except:
-                        return {"success": False, "message": f"无效的选择器: {selector}"}
+                # 使用选择器查找元素 - 已知选择器类型时直接查找，否则先按CSS再按XPath
+                elements = self._find_elements(selector, config.get('selector_type'), element_order)
+                if elements is None:
+                    return {"success": False, "message": f"无效的选择器: {selector}"}
 
             if not elements or element_order >= len(elements):
                 return {"success": False, "message": f"未找到指定元素 (序号: {element_order + 1})"}
 
             element = elements[element_order]
 
-            # 滚动到元素可见
-            self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", element)
-            time.sleep(0.3)
+            # 滚动到元素可见并等待位置稳定
+            self._scroll_into_view(element)
 
             # 根据点击类型和按键类型执行点击
             action = ActionChains(self.driver)
@@ -765,6 +1126,7 @@ class RPAExecutor:
         except Exception as e:
             return {"success": False, "message": f"点击元素失败: {str(e)}"}
     
+    @rpa_operation("经过元素", aliases=("hover", "hoverElement"))
     def hover_element(self, config):
         """经过元素 - 完全按照AdsPower原版实现"""
         try:
@@ -776,22 +1138,16 @@ class RPAExecutor:
             if not selector:
                 return {"success": False, "message": "未指定元素选择器"}
 
-            # 根据选择器类型查找元素
-            if selector_type == 'XPath':
-                elements = self.driver.find_elements(By.XPATH, selector)
-            elif selector_type == '文本':
-                elements = self.driver.find_elements(By.XPATH, f"//*[contains(text(), '{selector}')]")
-            else:  # Selector (CSS)
-                elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
+            # 根据选择器类型查找元素（连续步骤使用同一选择器时复用缓存的元素）
+            elements = self._find_elements(selector, selector_type, element_order) or []
 
             if not elements or element_order >= len(elements):
                 return {"success": False, "message": f"未找到指定的元素 (序号: {element_order + 1})"}
 
             element = elements[element_order]
 
-            # 滚动到元素可见
-            self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", element)
-            time.sleep(0.3)
+            # 滚动到元素可见并等待位置稳定
+            self._scroll_into_view(element)
 
             # 执行鼠标悬停
             ActionChains(self.driver).move_to_element(element).perform()
@@ -804,6 +1160,7 @@ class RPAExecutor:
         except Exception as e:
             return {"success": False, "message": f"经过元素失败: {str(e)}"}
     
+    @rpa_operation("页面后退", aliases=("goBack", "pageBack"))
     def page_back(self, config):
         """页面后退"""
         try:
@@ -816,6 +1173,7 @@ class RPAExecutor:
         except Exception as e:
             return {"success": False, "message": f"页面后退失败: {str(e)}"}
     
+    @rpa_operation("页面前进")
     def page_forward(self, config):
         """页面前进"""
         try:
@@ -828,6 +1186,7 @@ class RPAExecutor:
         except Exception as e:
             return {"success": False, "message": f"页面前进失败: {str(e)}"}
     
+    @rpa_operation("刷新页面", aliases=("refreshPage",))
     def refresh_page(self, config):
         """刷新页面"""
         try:
@@ -840,6 +1199,7 @@ class RPAExecutor:
         except Exception as e:
             return {"success": False, "message": f"刷新页面失败: {str(e)}"}
     
+    @rpa_operation("关闭标签", aliases=("closePage", "closeTab"))
     def close_tab(self, config):
         """关闭标签页 - 完全按照AdsPower原版实现"""
         try:
@@ -889,6 +1249,7 @@ class RPAExecutor:
         except Exception as e:
             return {"success": False, "message": f"关闭标签页失败: {str(e)}"}
 
+    @rpa_operation("关闭其他标签", aliases=("closeOtherPage", "closeOtherTabs"))
     def close_other_tabs(self, config):
         """关闭其他标签页"""
         try:
@@ -903,36 +1264,44 @@ class RPAExecutor:
         except Exception as e:
             return {"success": False, "message": f"关闭其他标签页失败: {str(e)}"}
 
+    @rpa_operation("页面截图", aliases=("screenshotPage", "pageScreenshot"))
     def page_screenshot(self, config):
-        """页面截图"""
-        try:
-            screenshot_name = config.get('screenshot_name', f"screenshot_{int(time.time())}")
-            full_screen = config.get('full_screen', False)
-            image_format = config.get('image_format', 'png')
-
-            if full_screen:
-                # 截取整个网页长图
-                total_height = self.driver.execute_script("return document.body.scrollHeight")
-                viewport_height = self.driver.execute_script("return window.innerHeight")
-
-                # 设置窗口大小以截取完整页面
-                self.driver.set_window_size(1920, total_height)
-                time.sleep(1)
-
-                screenshot_data = self.driver.get_screenshot_as_base64()
+        """页面截图 - 整页截图直接截取视口外内容（不调整窗口大小），解码和写文件在后台线程完成"""
+        try:
+            screenshot_name = config.get('screenshot_name') or f"screenshot_{int(time.time())}"
+            full_screen = config.get('full_screen', config.get('full_page', False))
+            extension = config.get('image_format', 'png')
+            image_format = normalize_format(extension)
+            quality = config.get('jpeg_quality')
+
+            page = self._page()
+            if hasattr(page, "execute_cdp_cmd") or self.cdp is not None:
+                # 浏览器直接按目标格式和质量编码
+                screenshot_data = capture_screenshot(page, full_screen, image_format, quality)
+                source_format = image_format if image_format in BROWSER_FORMATS else "png"
             else:
-                # 截取当前可见区域
-                screenshot_data = self.driver.get_screenshot_as_base64()
-
-            # 保存截图
-            screenshot_path = f"{screenshot_name}.{image_format}"
-            with open(screenshot_path, "wb") as f:
-                f.write(base64.b64decode(screenshot_data))
+                # 不支持DevTools命令的驱动只能截取可见区域的PNG
+                screenshot_data = page.get_screenshot_as_base64()
+                source_format = "png"
+
+            # 保存截图（目录：步骤配置 > 任务配置 > 当前目录）
+            screenshot_dir = config.get('screenshot_dir') or self.screenshot_dir
+            screenshot_path = os.path.join(screenshot_dir, f"{screenshot_name}.{extension}") \
+                if screenshot_dir else f"{screenshot_name}.{extension}"
+            future = screenshot_writer.submit(screenshot_data, screenshot_path, image_format, source_format, quality)
+            self.pending_screenshots = [f for f in self.pending_screenshots if not f.done()]
+            self.pending_screenshots.append(future)
 
             return {"success": True, "message": f"页面截图成功: {screenshot_path}", "screenshot_path": screenshot_path}
         except Exception as e:
             return {"success": False, "message": f"页面截图失败: {str(e)}"}
+
+    def wait_screenshots(self, timeout: float = None) -> List[str]:
+        """等待本执行器提交的截图写入磁盘，返回写入失败的信息（任务结束前调用）"""
+        futures, self.pending_screenshots = self.pending_screenshots, []
+        return screenshot_writer.wait(futures, timeout)
     
+    @rpa_operation("切换标签", aliases=("switchPage", "switchTab"))
     def switch_tab(self, config):
         """切换标签页"""
         try:
@@ -966,6 +1335,7 @@ class RPAExecutor:
         except Exception as e:
             return {"success": False, "message": f"切换标签页失败: {str(e)}"}
 
+    @rpa_operation("下拉选择器", aliases=("passingSelector", "selectDropdown"))
     def select_dropdown(self, config):
         """下拉选择器 - 完全按照AdsPower原版实现"""
         try:
@@ -982,21 +1352,15 @@ class RPAExecutor:
             if not select_value:
                 return {"success": False, "message": "未指定选择值"}
 
-            # 根据选择器类型查找元素
-            if selector_type == 'XPath':
-                elements = self.driver.find_elements(By.XPATH, selector)
-            elif selector_type == '文本':
-                elements = self.driver.find_elements(By.XPATH, f"//*[contains(text(), '{selector}')]")
-            else:  # Selector (CSS)
-                elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
+            # 根据选择器类型查找元素（连续步骤使用同一选择器时复用缓存的元素）
+            elements = self._find_elements(selector, selector_type, element_order) or []
 
             if not elements or element_order >= len(elements):
                 return {"success": False, "message": f"未找到指定的select元素 (序号: {element_order + 1})"}
 
-            # 滚动到元素可见
+            # 滚动到元素可见并等待位置稳定
             element = elements[element_order]
-            self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", element)
-            time.sleep(0.3)
+            self._scroll_into_view(element)
 
             # 创建Select对象
             select_element = Select(element)
@@ -1032,6 +1396,7 @@ class RPAExecutor:
         except Exception as e:
             return {"success": False, "message": f"下拉选择器操作失败: {str(e)}"}
 
+    @rpa_operation("元素聚焦", aliases=("focus", "focusElement"))
     def focus_element(self, config):
         """元素聚焦 - 完全按照AdsPower原版实现"""
         try:
@@ -1043,22 +1408,16 @@ class RPAExecutor:
             if not selector:
                 return {"success": False, "message": "未指定元素选择器"}
 
-            # 根据选择器类型查找元素
-            if selector_type == 'XPath':
-                elements = self.driver.find_elements(By.XPATH, selector)
-            elif selector_type == '文本':
-                elements = self.driver.find_elements(By.XPATH, f"//*[contains(text(), '{selector}')]")
-            else:  # Selector (CSS)
-                elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
+            # 根据选择器类型查找元素（连续步骤使用同一选择器时复用缓存的元素）
+            elements = self._find_elements(selector, selector_type, element_order) or []
 
             if not elements or element_order >= len(elements):
                 return {"success": False, "message": f"未找到指定元素 (序号: {element_order + 1})"}
 
             element = elements[element_order]
 
-            # 滚动到元素可见
-            self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", element)
-            time.sleep(0.3)
+            # 滚动到元素可见并等待位置稳定
+            self._scroll_into_view(element)
 
             # AdsPower原版：聚焦元素（使用JavaScript focus方法）
             self.driver.execute_script("arguments[0].focus();", element)
@@ -1071,6 +1430,7 @@ class RPAExecutor:
         except Exception as e:
             return {"success": False, "message": f"元素聚焦失败: {str(e)}"}
 
+    @rpa_operation("输入内容", aliases=("inputContent", "inputText"))
     def input_content(self, config):
         """输入内容 - 完全按照AdsPower官方标准"""
         try:
@@ -1080,6 +1440,8 @@ class RPAExecutor:
                 selector = config.get('selector', '')
                 stored_element = config.get('stored_element')
                 element_order = config.get('element_order', 1)
+                if isinstance(element_order, dict):
+                    element_order = self._resolve_element_order(element_order) + 1
                 content = config.get('content', '')
                 content_type = config.get('content_type', '顺序选取')
                 input_interval = config.get('input_interval', 300) / 1000  # 转换为秒
@@ -1101,28 +1463,7 @@ class RPAExecutor:
                 return {"success": False, "message": "未指定输入内容"}
 
             # 处理多行内容和内容选取方式
-            content_lines = content.strip().split('\n') if isinstance(content, str) else [str(content)]
-
-            if content_type == '随机选取':
-                import random
-                selected_content = random.choice(content_lines)
-            elif content_type == '随机取数':
-                # 假设内容格式为 "min-max"
-                if '-' in content and len(content_lines) == 1:
-                    try:
-                        min_val, max_val = map(int, content.split('-'))
-                        selected_content = str(random.randint(min_val, max_val))
-                    except:
-                        selected_content = content_lines[0]
-                else:
-                    selected_content = content_lines[0]
-            elif content_type == '使用变量':
-                # 从变量中获取内容
-                var_name = content.strip()
-                selected_content = str(self.variables.get(var_name, content))
-            else:  # 顺序选取
-                # 这里可以根据环境ID或其他逻辑选择，暂时使用第一个
-                selected_content = content_lines[0]
+            selected_content = self._select_input_content(content, content_type)
 
             # 使用储存的元素对象或选择器查找元素
             if stored_element and stored_element != "无":
@@ -1131,15 +1472,10 @@ class RPAExecutor:
                 if not elements[0]:
                     return {"success": False, "message": f"储存的元素对象不存在: {stored_element}"}
             else:
-                # 使用选择器查找元素 - AdsPower官方支持CSS选择器
-                try:
-                    elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                except:
-                    # 如果CSS选择器失败，尝试XPath
-                    try:
-                        elements = self.driver.find_elements(By.XPATH, selector)
-                    except:
-                        return {"success": False, "message": f"无效的选择器: {selector}"}
+                # 使用选择器查找元素 - 已知选择器类型时直接查找，否则先按CSS再按XPath
+                elements = self._find_elements(selector, config.get('selector_type'), max(element_order - 1, 0))
+                if elements is None:
+                    return {"success": False, "message": f"无效的选择器: {selector}"}
 
             element_index = element_order - 1 if element_order > 0 else 0
             if not elements or element_index >= len(elements):
@@ -1147,9 +1483,8 @@ class RPAExecutor:
 
             element = elements[element_index]
 
-            # 滚动到元素可见
-            self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", element)
-            time.sleep(0.3)
+            # 滚动到元素可见并等待位置稳定
+            self._scroll_into_view(element)
 
             # 聚焦元素
             element.click()
@@ -1190,6 +1525,29 @@ class RPAExecutor:
         except Exception as e:
             return {"success": False, "message": f"输入内容失败: {str(e)}"}
 
+    def _select_input_content(self, content, content_type):
+        """按内容选取方式从多行内容中选出要输入的文本"""
+        content_lines = content.strip().split('\n') if isinstance(content, str) else [str(content)]
+
+        if content_type == '随机选取':
+            return random.choice(content_lines)
+        elif content_type == '随机取数':
+            # 假设内容格式为 "min-max"
+            if '-' in content and len(content_lines) == 1:
+                try:
+                    min_val, max_val = map(int, content.split('-'))
+                    return str(random.randint(min_val, max_val))
+                except:
+                    return content_lines[0]
+            return content_lines[0]
+        elif content_type == '使用变量':
+            # 从变量中获取内容
+            var_name = content.strip()
+            return str(self.variables.get(var_name, content))
+        # 顺序选取：这里可以根据环境ID或其他逻辑选择，暂时使用第一个
+        return content_lines[0]
+
+    @rpa_operation("上传附件", aliases=("uploadAttachment", "uploadFile"))
     def upload_file(self, config):
         """上传附件 - 完全按照AdsPower原版实现"""
         try:
@@ -1209,26 +1567,18 @@ class RPAExecutor:
 
             # 根据选择器类型查找文件输入元素
             try:
-                if selector_type == 'xpath':
-                    elements = self.driver.find_elements(By.XPATH, selector)
-                elif selector_type == 'text':
-                    elements = self.driver.find_elements(By.XPATH, f"//*[contains(text(), '{selector}')]")
-                else:  # selector (CSS)
-                    elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
+                selector_type = {'xpath': 'XPath', 'text': '文本'}.get(selector_type, 'Selector')
+                elements = self._find_elements(selector, selector_type, element_order) or []
 
                 if not elements or element_order >= len(elements):
                     return {"success": False, "message": f"未找到指定的文件输入元素 (序号: {element_order + 1})"}
 
                 element = elements[element_order]
 
-                # 验证元素是否为文件输入元素
+                # 验证元素是否为文件输入元素（文件选择框通常隐藏，send_keys不需要元素可见，无需滚动等待）
                 if element.tag_name.lower() != 'input' or element.get_attribute('type') != 'file':
                     return {"success": False, "message": "选择的元素不是文件输入元素"}
 
-                # 滚动到元素可见
-                self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", element)
-                time.sleep(0.2)
-
             except Exception as e:
                 return {"success": False, "message": f"查找文件输入元素失败: {str(e)}"}
 
@@ -1315,6 +1665,7 @@ class RPAExecutor:
 
     # ==================== 键盘操作实现 ====================
 
+    @rpa_operation("执行JS脚本", aliases=("javaScript", "executeJS"))
     def execute_javascript(self, config):
         """执行JS脚本"""
         try:
@@ -1322,15 +1673,17 @@ class RPAExecutor:
             if not js_code:
                 return {"success": False, "message": "未指定JS代码"}
 
+            page = self._page()
+
             # 注入变量到JS环境
             inject_vars = config.get('inject_variables', [])
             for var_name in inject_vars:
                 if var_name in self.variables:
                     var_value = self.variables[var_name]
                     # 将变量注入到window对象中
-                    self.driver.execute_script(f"window.{var_name} = arguments[0];", var_value)
+                    page.execute_script(f"window.{var_name} = arguments[0];", var_value)
 
-            result = self.driver.execute_script(js_code)
+            result = page.execute_script(js_code)
 
             # 保存返回值到变量
             return_var = config.get('return_variable', '')
@@ -1341,6 +1694,7 @@ class RPAExecutor:
         except Exception as e:
             return {"success": False, "message": f"JS脚本执行失败: {str(e)}"}
 
+    @rpa_operation("键盘按键", aliases=("keyboard", "keyboardKey"))
     def keyboard_key(self, config):
         """键盘按键"""
         try:
@@ -1370,6 +1724,7 @@ class RPAExecutor:
         except Exception as e:
             return {"success": False, "message": f"键盘按键失败: {str(e)}"}
 
+    @rpa_operation("组合键", aliases=("keyboardCombo",))
     def keyboard_combo(self, config):
         """组合键"""
         try:
@@ -1409,6 +1764,7 @@ class RPAExecutor:
 
     # ==================== 等待操作实现 ====================
 
+    @rpa_operation("等待元素出现", aliases=("waitForSelector", "waitElementAppear"))
     def wait_element(self, config):
         """等待元素"""
         try:
@@ -1438,29 +1794,35 @@ class RPAExecutor:
         except Exception as e:
             return {"success": False, "message": f"等待元素失败: {str(e)}"}
 
+    @rpa_operation("等待页面")
     def wait_page(self, config):
         """等待页面"""
         try:
             wait_type = config.get('page_wait_type', '页面加载完成')
             timeout = config.get('page_timeout', 30)
-
-            wait = WebDriverWait(self.driver, timeout)
+            page = self._page()
 
             if wait_type == '页面加载完成':
-                wait.until(lambda driver: driver.execute_script("return document.readyState") == "complete")
+                ready = wait_ready_state(page, 'complete', timeout)
             elif wait_type == 'DOM加载完成':
-                wait.until(lambda driver: driver.execute_script("return document.readyState") in ["interactive", "complete"])
+                ready = wait_ready_state(page, 'interactive', timeout)
             elif wait_type == '网络请求完成':
-                # 等待所有网络请求完成（简化实现）
-                time.sleep(2)
-                wait.until(lambda driver: driver.execute_script("return jQuery.active == 0") if self.driver.execute_script("return typeof jQuery !== 'undefined'") else True)
+                # 页面加载完成、jQuery请求结束且一段时间内没有新的资源请求
+                ready = wait_network_idle(page, config.get('idle_ms', 500), timeout)
+            elif wait_type == 'DOM稳定':
+                ready = wait_dom_quiet(page, config.get('idle_ms', 300), timeout)
+            else:
+                ready = True
 
+            if not ready:
+                return {"success": False, "message": "等待页面超时"}
             return {"success": True, "message": f"等待页面 {wait_type} 成功"}
         except TimeoutException:
             return {"success": False, "message": "等待页面超时"}
         except Exception as e:
             return {"success": False, "message": f"等待页面失败: {str(e)}"}
 
+    @rpa_operation("等待弹窗")
     def wait_popup(self, config):
         """等待弹窗"""
         try:
@@ -1488,6 +1850,7 @@ class RPAExecutor:
         except Exception as e:
             return {"success": False, "message": f"等待弹窗失败: {str(e)}"}
 
+    @rpa_operation("等待请求完成", aliases=("waitForResponse", "waitRequestComplete"))
     def wait_request(self, config):
         """等待请求完成"""
         try:
@@ -1496,23 +1859,19 @@ class RPAExecutor:
             wait_type = config.get('wait_type', '网络请求完成')
 
             if wait_type == '网络请求完成':
-                # 等待所有网络请求完成（简化实现）
-                wait = WebDriverWait(self.driver, timeout)
-
-                # 检查jQuery是否存在并等待Ajax完成
-                jquery_exists = self.driver.execute_script("return typeof jQuery !== 'undefined'")
-                if jquery_exists:
-                    wait.until(lambda driver: driver.execute_script("return jQuery.active == 0"))
-
-                # 等待页面加载状态
-                wait.until(lambda driver: driver.execute_script("return document.readyState") == "complete")
-
-                # 额外等待一段时间确保所有异步请求完成
-                time.sleep(2)
+                # 页面加载完成、jQuery请求结束且一段时间内没有新的资源请求，满足即返回
+                if not wait_network_idle(self._page(), config.get('idle_ms', 500), timeout):
+                    return {"success": False, "message": "等待请求超时"}
 
             elif wait_type == '特定请求':
-                # 等待特定URL的请求（需要更复杂的实现，这里简化）
-                time.sleep(timeout)
+                # 等待URL匹配的请求完成，请求完成事件到达即返回
+                capture = self._network_capture()
+                if capture is None:
+                    # 无法捕获网络事件时退化为等待网络空闲
+                    if not wait_network_idle(self._page(), config.get('idle_ms', 500), timeout):
+                        return {"success": False, "message": "等待请求超时"}
+                elif not capture.wait_for(RequestFilter(request_url), timeout, phase="finished"):
+                    return {"success": False, "message": f"等待请求超时: {request_url}"}
 
             return {"success": True, "message": "等待请求完成"}
         except TimeoutException:
@@ -1522,6 +1881,7 @@ class RPAExecutor:
 
     # ==================== 获取数据实现 ====================
 
+    @rpa_operation("获取URL", aliases=("getUrl", "getURL"))
     def get_url(self, config):
         """获取URL - 完全按照AdsPower原版实现"""
         try:
@@ -1531,10 +1891,11 @@ class RPAExecutor:
             if not save_var:
                 return {"success": False, "message": "未指定保存变量"}
 
-            if not self.driver:
+            page = self._page()
+            if not page:
                 return {"success": False, "message": "浏览器驱动未初始化"}
 
-            current_url = self.driver.current_url
+            current_url = page.current_url
 
             # AdsPower原版：支持多种URL获取方式
             if url_type == '完整地址':
@@ -1564,6 +1925,7 @@ class RPAExecutor:
         except Exception as e:
             return {"success": False, "message": f"获取URL失败: {str(e)}"}
 
+    @rpa_operation("获取粘贴板内容", aliases=("getClipboard", "获取粘贴板"))
     def get_clipboard(self, config):
         """获取粘贴板内容 - 完全按照AdsPower原版实现"""
         try:
@@ -1617,6 +1979,7 @@ class RPAExecutor:
         except Exception as e:
             return {"success": False, "message": f"获取粘贴板内容失败: {str(e)}"}
 
+    @rpa_operation("元素数据", aliases=("getElement", "getElementData", "获取元素数据"))
     def get_element_data(self, config):
         """获取元素数据 - 完全按照AdsPower原版实现"""
         try:
@@ -1631,25 +1994,34 @@ class RPAExecutor:
             if not selector or not save_var:
                 return {"success": False, "message": "缺少必要参数"}
 
+            if extract_type == '批量提取':
+                # 一次页面脚本调用提取所有匹配元素的字段（从element_data_order开始，最多element_data_limit个）
+                result = extract_elements(self._page(), selector, self.CDP_SELECTOR_STRATEGIES.get(selector_type, "css"),
+                                          config.get('element_data_fields'), start=max(element_order, 0),
+                                          limit=int(config.get('element_data_limit', 0) or 0))
+                data = result["records"]
+                self.variables[save_var] = data
+                return {
+                    "success": True,
+                    "message": f"批量提取 {len(data)} 个元素（共匹配 {result['total']} 个）",
+                    "data": data,
+                    "extract_type": extract_type,
+                    "total": result["total"]
+                }
+
             if not self.driver:
                 return {"success": False, "message": "浏览器驱动未初始化"}
 
-            # 根据选择器类型查找元素
-            if selector_type == 'XPath':
-                elements = self.driver.find_elements(By.XPATH, selector)
-            elif selector_type == '文本':
-                elements = self.driver.find_elements(By.XPATH, f"//*[contains(text(), '{selector}')]")
-            else:  # Selector (CSS)
-                elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
+            # 根据选择器类型查找元素（连续步骤使用同一选择器时复用缓存的元素）
+            elements = self._find_elements(selector, selector_type, element_order) or []
 
             if not elements or element_order >= len(elements):
                 return {"success": False, "message": "未找到指定元素 (序号: " + str(element_order + 1) + ")"}
 
             element = elements[element_order]
 
-            # 滚动到元素可见
-            self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", element)
-            time.sleep(0.2)
+            # 滚动到元素可见并等待位置稳定
+            self._scroll_into_view(element)
 
             # AdsPower原版：根据提取类型获取数据
             if extract_type == '文本':
@@ -1665,42 +2037,23 @@ class RPAExecutor:
                 if data is None:
                     data = ""
             elif extract_type == '对象':
-                # AdsPower原版：返回元素的完整信息对象
-                data = {
-                    'tag_name': element.tag_name,
-                    'text': element.text,
-                    'id': element.get_attribute('id'),
-                    'class': element.get_attribute('class'),
-                    'name': element.get_attribute('name'),
-                    'value': element.get_attribute('value'),
-                    'href': element.get_attribute('href'),
-                    'src': element.get_attribute('src'),
-                    'location': element.location,
-                    'size': element.size,
-                    'is_displayed': element.is_displayed(),
-                    'is_enabled': element.is_enabled(),
-                    'is_selected': element.is_selected() if element.tag_name.lower() in ['option', 'input'] else False
-                }
+                # AdsPower原版：返回元素的完整信息对象（一次脚本调用读取全部字段）
+                data = extract_elements(self.driver, fields=OBJECT_FIELDS, elements=[element])["records"][0]
+                data.pop('index', None)
             elif extract_type == 'IFrame框架':
                 # AdsPower原版：切换到iframe
                 try:
                     self.driver.switch_to.frame(element)
+                    self.element_cache.switch_frame(f"{selector_type}:{selector}:{element_order}")
                     data = "已切换到iframe框架"
                 except Exception as iframe_error:
                     data = f"切换iframe失败: {str(iframe_error)}"
             elif extract_type == '源码':
                 data = element.get_attribute('outerHTML')
             elif extract_type == '子元素':
-                # AdsPower原版：获取子元素信息
-                children = element.find_elements(By.XPATH, "./*")
-                data = []
-                for child in children:
-                    data.append({
-                        'tag_name': child.tag_name,
-                        'text': child.text[:100],  # 限制文本长度
-                        'id': child.get_attribute('id'),
-                        'class': child.get_attribute('class')
-                    })
+                # AdsPower原版：获取子元素信息（文本限制100字符）
+                data = extract_elements(self.driver, fields={'children': 'children'},
+                                        elements=[element])["records"][0]["children"]
             else:
                 data = element.text
 
@@ -1717,6 +2070,7 @@ class RPAExecutor:
         except Exception as e:
             return {"success": False, "message": f"获取元素数据失败: {str(e)}"}
 
+    @rpa_operation("当前焦点元素")
     def get_focused_element(self, config):
         """获取当前焦点元素"""
         try:
@@ -1742,6 +2096,7 @@ class RPAExecutor:
         except Exception as e:
             return {"success": False, "message": f"获取当前焦点元素失败: {str(e)}"}
 
+    @rpa_operation("存到文件")
     def save_to_file(self, config):
         """存到文件 - 完全按照AdsPower原版实现"""
         try:
@@ -1816,6 +2171,7 @@ class RPAExecutor:
         except Exception as e:
             return {"success": False, "message": f"保存文件失败: {str(e)}"}
 
+    @rpa_operation("存到Excel")
     def save_to_excel(self, config):
         """存到Excel"""
         try:
@@ -1854,6 +2210,7 @@ class RPAExecutor:
         except Exception as e:
             return {"success": False, "message": f"保存到Excel失败: {str(e)}"}
 
+    @rpa_operation("下载文件")
     def download_file(self, config):
         """下载文件"""
         try:
@@ -1880,6 +2237,7 @@ class RPAExecutor:
         except Exception as e:
             return {"success": False, "message": f"下载文件失败: {str(e)}"}
 
+    @rpa_operation("导入Excel", aliases=("导入Excel素材", "importExcel"))
     def import_excel(self, config):
         """导入Excel素材"""
         try:
@@ -1905,6 +2263,7 @@ class RPAExecutor:
         except Exception as e:
             return {"success": False, "message": f"导入Excel失败: {str(e)}"}
 
+    @rpa_operation("导入txt", aliases=("importTxt",))
     def import_txt(self, config):
         """导入txt"""
         try:
@@ -1935,6 +2294,7 @@ class RPAExecutor:
         except Exception as e:
             return {"success": False, "message": f"导入txt失败: {str(e)}"}
 
+    @rpa_operation("获取邮件")
     def get_email(self, config):
         """获取邮件"""
         try:
@@ -1996,6 +2356,7 @@ class RPAExecutor:
         except:
             return ""
 
+    @rpa_operation("身份验证器码", aliases=("身份验证密码",))
     def get_totp(self, config):
         """身份验证密码（TOTP）"""
         try:
@@ -2014,6 +2375,7 @@ class RPAExecutor:
         except Exception as e:
             return {"success": False, "message": f"生成TOTP验证码失败: {str(e)}"}
 
+    @rpa_operation("监听请求触发")
     def listen_request_trigger(self, config):
         """监听请求触发 - 完全按照AdsPower原版实现"""
         try:
@@ -2026,10 +2388,26 @@ class RPAExecutor:
             if not save_var:
                 return {"success": False, "message": "未指定保存变量"}
 
+            # 通过DevTools网络事件等待，请求到达即返回
+            capture = self._network_capture()
+            if capture is not None:
+                events = capture.wait_for(RequestFilter(url_pattern, listen_method), timeout, phase="request")
+                if not events:
+                    return {"success": False, "message": f"监听请求超时 ({timeout}秒)"}
+                request_data = [event.to_dict() for event in events]
+                self.variables[save_var] = request_data
+                return {
+                    "success": True,
+                    "message": f"监听到 {len(request_data)} 个请求",
+                    "data": request_data,
+                    "url_pattern": url_pattern,
+                    "method_filter": listen_method
+                }
+
             if not self.driver:
                 return {"success": False, "message": "浏览器驱动未初始化"}
 
-            # AdsPower原版：注入JavaScript来监听网络请求
+            # 无法使用DevTools时：注入JavaScript来监听网络请求
             method_filter = "" if listen_method == "所有方法" else f"&& method.toUpperCase() === '{listen_method.upper()}'"
 
             js_code = f"""
@@ -2117,6 +2495,7 @@ class RPAExecutor:
         except Exception as e:
             return {"success": False, "message": f"监听请求触发失败: {str(e)}"}
 
+    @rpa_operation("监听请求结果")
     def listen_request_result(self, config):
         """监听请求结果 - 完全按照AdsPower原版实现"""
         try:
@@ -2131,10 +2510,31 @@ class RPAExecutor:
             if not save_var:
                 return {"success": False, "message": "未指定保存变量"}
 
+            # 通过DevTools网络事件等待，响应到达即返回；只有需要时才读取响应体
+            capture = self._network_capture()
+            if capture is not None:
+                need_body = extract_type in ('完整响应', '响应体', 'JSON字段')
+                events = capture.wait_for(RequestFilter(url_pattern, status=status_code), timeout,
+                                          phase="finished" if need_body else "response")
+                if not events:
+                    return {"success": False, "message": f"监听请求结果超时 ({timeout}秒)"}
+                response_data = []
+                for event in events:
+                    response_data.append({
+                        "url": event.url,
+                        "status": event.status,
+                        "statusText": event.status_text,
+                        "headers": event.response_headers,
+                        "body": capture.get_body(event) if need_body else None,
+                        "timestamp": event.timestamp,
+                        "type": event.resource_type.lower()
+                    })
+                return self._save_response_data(response_data, extract_type, json_path, save_var)
+
             if not self.driver:
                 return {"success": False, "message": "浏览器驱动未初始化"}
 
-            # AdsPower原版：状态码过滤条件
+            # 无法使用DevTools时：状态码过滤条件
             status_filter = ""
             if status_code != "所有状态":
                 status_filter = f"&& response.status == {status_code}"
@@ -2232,47 +2632,7 @@ class RPAExecutor:
                 try:
                     response_data = self.driver.execute_script("return window.adspower_response_data || [];")
                     if response_data and len(response_data) > 0:
-                        # AdsPower原版：根据提取类型处理数据
-                        processed_data = []
-                        for resp in response_data:
-                            if extract_type == '完整响应':
-                                processed_data.append(resp)
-                            elif extract_type == '响应体':
-                                processed_data.append(resp.get('body', ''))
-                            elif extract_type == '响应头':
-                                processed_data.append(resp.get('headers', {}))
-                            elif extract_type == '状态码':
-                                processed_data.append(resp.get('status', 0))
-                            elif extract_type == 'JSON字段' and json_path:
-                                try:
-                                    import json
-                                    body = resp.get('body', '{}')
-                                    json_data = json.loads(body)
-                                    # 简单的JSON路径解析
-                                    value = json_data
-                                    for key in json_path.split('.'):
-                                        if key and isinstance(value, dict):
-                                            value = value.get(key)
-                                        else:
-                                            value = None
-                                            break
-                                    processed_data.append(value)
-                                except:
-                                    processed_data.append(None)
-                            else:
-                                processed_data.append(resp)
-
-                        # 保存到变量
-                        final_data = processed_data if len(processed_data) > 1 else (processed_data[0] if processed_data else None)
-                        self.variables[save_var] = final_data
-
-                        return {
-                            "success": True,
-                            "message": f"监听到 {len(response_data)} 个响应",
-                            "data": final_data,
-                            "raw_count": len(response_data),
-                            "extract_type": extract_type
-                        }
+                        return self._save_response_data(response_data, extract_type, json_path, save_var)
                 except Exception as js_error:
                     # JavaScript执行错误，继续等待
                     pass
@@ -2283,6 +2643,49 @@ class RPAExecutor:
         except Exception as e:
             return {"success": False, "message": f"监听请求结果失败: {str(e)}"}
 
+    def _save_response_data(self, response_data, extract_type, json_path, save_var):
+        """按提取类型处理监听到的响应并保存到变量"""
+        processed_data = []
+        for resp in response_data:
+            if extract_type == '完整响应':
+                processed_data.append(resp)
+            elif extract_type == '响应体':
+                processed_data.append(resp.get('body', ''))
+            elif extract_type == '响应头':
+                processed_data.append(resp.get('headers', {}))
+            elif extract_type == '状态码':
+                processed_data.append(resp.get('status', 0))
+            elif extract_type == 'JSON字段' and json_path:
+                try:
+                    body = resp.get('body') or '{}'
+                    json_data = json.loads(body)
+                    # 简单的JSON路径解析
+                    value = json_data
+                    for key in json_path.split('.'):
+                        if key and isinstance(value, dict):
+                            value = value.get(key)
+                        else:
+                            value = None
+                            break
+                    processed_data.append(value)
+                except Exception:
+                    processed_data.append(None)
+            else:
+                processed_data.append(resp)
+
+        # 保存到变量
+        final_data = processed_data if len(processed_data) > 1 else (processed_data[0] if processed_data else None)
+        self.variables[save_var] = final_data
+
+        return {
+            "success": True,
+            "message": f"监听到 {len(response_data)} 个响应",
+            "data": final_data,
+            "raw_count": len(response_data),
+            "extract_type": extract_type
+        }
+
+    @rpa_operation("停止页面监听")
     def stop_page_listening(self, config):
         """停止页面监听"""
         try:
@@ -2293,11 +2696,13 @@ class RPAExecutor:
             // 恢复原始的fetch和XMLHttpRequest（简化实现）
             """
 
+            self.stop_network_capture()
             self.driver.execute_script(js_code)
             return {"success": True, "message": "停止页面监听成功"}
         except Exception as e:
             return {"success": False, "message": f"停止页面监听失败: {str(e)}"}
 
+    @rpa_operation("获取页面Cookie")
     def get_cookies(self, config):
         """获取页面Cookie - 完全按照AdsPower原版实现"""
         try:
@@ -2309,27 +2714,28 @@ class RPAExecutor:
             if not save_var:
                 return {"success": False, "message": "未指定保存变量"}
 
-            if not self.driver:
+            page = self._page()
+            if not page:
                 return {"success": False, "message": "浏览器驱动未初始化"}
 
             # AdsPower原版：根据Cookie类型获取数据
             if cookie_type == '所有Cookie':
-                data = self.driver.get_cookies()
+                data = page.get_cookies()
                 message = f"获取所有Cookie成功，共 {len(data)} 个"
             elif cookie_type == '指定Cookie':
                 if not cookie_name:
                     return {"success": False, "message": "未指定Cookie名称"}
-                data = self.driver.get_cookie(cookie_name)
+                data = page.get_cookie(cookie_name)
                 if data is None:
                     return {"success": False, "message": f"Cookie '{cookie_name}' 不存在"}
                 message = f"获取Cookie '{cookie_name}' 成功"
             elif cookie_type == 'Cookie数量':
-                all_cookies = self.driver.get_cookies()
+                all_cookies = page.get_cookies()
                 data = len(all_cookies)
                 message = f"获取Cookie数量成功: {data} 个"
             else:
                 # 默认获取所有Cookie
-                data = self.driver.get_cookies()
+                data = page.get_cookies()
                 message = f"获取所有Cookie成功，共 {len(data)} 个"
 
             # 保存到变量
@@ -2344,6 +2750,7 @@ class RPAExecutor:
         except Exception as e:
             return {"success": False, "message": f"获取Cookie失败: {str(e)}"}
 
+    @rpa_operation("清除页面Cookie")
     def clear_cookies(self, config):
         """清除页面Cookie - 完全按照AdsPower原版实现"""
         try:
@@ -2351,14 +2758,15 @@ class RPAExecutor:
             clear_type = config.get('clear_cookie_type', '所有Cookie')
             target = config.get('clear_cookie_target', '')
 
-            if not self.driver:
+            page = self._page()
+            if not page:
                 return {"success": False, "message": "浏览器驱动未初始化"}
 
             # AdsPower原版：根据清除类型执行操作
             if clear_type == '所有Cookie':
                 # 获取清除前的Cookie数量
-                before_count = len(self.driver.get_cookies())
-                self.driver.delete_all_cookies()
+                before_count = len(page.get_cookies())
+                page.delete_all_cookies()
                 message = f"清除所有Cookie成功，共清除 {before_count} 个Cookie"
 
             elif clear_type == '指定Cookie':
@@ -2366,11 +2774,11 @@ class RPAExecutor:
                     return {"success": False, "message": "未指定Cookie名称"}
 
                 # 检查Cookie是否存在
-                cookie = self.driver.get_cookie(target)
+                cookie = page.get_cookie(target)
                 if cookie is None:
                     return {"success": False, "message": f"Cookie '{target}' 不存在"}
 
-                self.driver.delete_cookie(target)
+                page.delete_cookie(target)
                 message = f"清除Cookie '{target}' 成功"
 
             elif clear_type == '指定域名Cookie':
@@ -2378,7 +2786,7 @@ class RPAExecutor:
                     return {"success": False, "message": "未指定域名"}
 
                 # AdsPower原版：清除指定域名的Cookie
-                all_cookies = self.driver.get_cookies()
+                all_cookies = page.get_cookies()
                 cleared_count = 0
 
                 for cookie in all_cookies:
@@ -2386,7 +2794,7 @@ class RPAExecutor:
                     # 检查域名匹配（支持子域名）
                     if target in cookie_domain or cookie_domain.endswith('.' + target):
                         try:
-                            self.driver.delete_cookie(cookie['name'])
+                            page.delete_cookie(cookie['name'])
                             cleared_count += 1
                         except:
                             # 某些Cookie可能无法删除，继续处理其他Cookie
@@ -2398,12 +2806,12 @@ class RPAExecutor:
                     message = f"域名 '{target}' 没有找到可清除的Cookie"
             else:
                 # 默认清除所有Cookie
-                before_count = len(self.driver.get_cookies())
-                self.driver.delete_all_cookies()
+                before_count = len(page.get_cookies())
+                page.delete_all_cookies()
                 message = f"清除所有Cookie成功，共清除 {before_count} 个Cookie"
 
             # 验证清除结果
-            remaining_cookies = len(self.driver.get_cookies())
+            remaining_cookies = len(page.get_cookies())
 
             return {
                 "success": True,
@@ -2417,6 +2825,7 @@ class RPAExecutor:
 
     # ==================== 环境信息实现 ====================
 
+    @rpa_operation("更新环境备注", aliases=("updateEnvRemark",))
     def update_env_note(self, config):
         """更新环境备注"""
         try:
@@ -2443,6 +2852,7 @@ class RPAExecutor:
         except Exception as e:
             return {"success": False, "message": f"更新环境备注失败: {str(e)}"}
 
+    @rpa_operation("更新环境标签", aliases=("updateEnvTags",))
     def update_env_tag(self, config):
         """更新环境标签"""
         try:
@@ -2477,6 +2887,7 @@ class RPAExecutor:
 
     # ==================== 流程管理实现 ====================
 
+    @rpa_operation("启动新浏览器", aliases=("startNewBrowser",))
     def start_new_browser(self, config):
         """启动新浏览器"""
         try:
@@ -2510,6 +2921,7 @@ class RPAExecutor:
         except Exception as e:
             return {"success": False, "message": f"启动新浏览器失败: {str(e)}"}
 
+    @rpa_operation("使用其他流程", aliases=("useOtherFlow",))
     def use_other_flow(self, config):
         """使用其他流程"""
         try:
@@ -2539,6 +2951,7 @@ class RPAExecutor:
         except Exception as e:
             return {"success": False, "message": f"使用其他流程失败: {str(e)}"}
 
+    @rpa_operation("关闭浏览器", aliases=("closeBrowser",))
     def close_browser(self, config):
         """关闭浏览器"""
         try:
@@ -2596,6 +3009,7 @@ class RPAExecutor:
 
     # ==================== 数据处理实现 ====================
 
+    @rpa_operation("文本中提取", aliases=("extractText",))
     def extract_text(self, config):
         """文本中提取 - 完全按照AdsPower原版实现"""
         try:
@@ -2678,6 +3092,7 @@ class RPAExecutor:
         except Exception as e:
             return {"success": False, "message": f"文本提取失败: {str(e)}"}
 
+    @rpa_operation("转换Json对象", aliases=("convertJson",))
     def convert_json(self, config):
         """转换JSON对象"""
         try:
@@ -2707,6 +3122,7 @@ class RPAExecutor:
         except Exception as e:
             return {"success": False, "message": f"JSON转换失败: {str(e)}"}
 
+    @rpa_operation("字段提取")
     def extract_field(self, config):
         """字段提取"""
         try:
@@ -2737,6 +3153,7 @@ class RPAExecutor:
         except Exception as e:
             return {"success": False, "message": f"字段提取失败: {str(e)}"}
 
+    @rpa_operation("随机提取", aliases=("randomExtract",))
     def random_extract(self, config):
         """随机提取 - 完全按照AdsPower原版实现"""
         try:
@@ -2814,6 +3231,7 @@ class RPAExecutor:
 
     # ==================== 流程管理实现 ====================
 
+    @rpa_operation("IF条件", aliases=("ifCondition",))
     def if_condition(self, config):
         """IF条件判断"""
         try:
@@ -2824,40 +3242,41 @@ class RPAExecutor:
             if not variable:
                 return {"success": False, "message": "未指定判断变量"}
 
-            var_value = self.variables.get(variable)
-
-            # 执行条件判断
-            if condition == '存在':
-                condition_result = var_value is not None
-            elif condition == '不存在':
-                condition_result = var_value is None
-            elif condition == '等于':
-                condition_result = str(var_value) == str(result_value)
-            elif condition == '不等于':
-                condition_result = str(var_value) != str(result_value)
-            elif condition == '大于':
-                condition_result = float(var_value) > float(result_value)
-            elif condition == '大于等于':
-                condition_result = float(var_value) >= float(result_value)
-            elif condition == '小于':
-                condition_result = float(var_value) < float(result_value)
-            elif condition == '小于等于':
-                condition_result = float(var_value) <= float(result_value)
-            elif condition == '包含':
-                condition_result = str(result_value) in str(var_value)
-            elif condition == '不包含':
-                condition_result = str(result_value) not in str(var_value)
-            elif condition == '在其中':
-                condition_result = str(var_value) in str(result_value).split(',')
-            elif condition == '不在其中':
-                condition_result = str(var_value) not in str(result_value).split(',')
-            else:
-                condition_result = False
-
+            condition_result = self._evaluate_condition(self.variables.get(variable), condition, result_value)
             return {"success": True, "condition_result": condition_result, "message": f"条件判断: {condition_result}"}
         except Exception as e:
             return {"success": False, "message": f"IF条件判断失败: {str(e)}"}
 
+    @staticmethod
+    def _evaluate_condition(var_value, condition, result_value):
+        """IF条件/While循环的条件判断"""
+        if condition == '存在':
+            return var_value is not None
+        elif condition == '不存在':
+            return var_value is None
+        elif condition == '等于':
+            return str(var_value) == str(result_value)
+        elif condition == '不等于':
+            return str(var_value) != str(result_value)
+        elif condition == '大于':
+            return float(var_value) > float(result_value)
+        elif condition == '大于等于':
+            return float(var_value) >= float(result_value)
+        elif condition == '小于':
+            return float(var_value) < float(result_value)
+        elif condition == '小于等于':
+            return float(var_value) <= float(result_value)
+        elif condition == '包含':
+            return str(result_value) in str(var_value)
+        elif condition == '不包含':
+            return str(result_value) not in str(var_value)
+        elif condition == '在其中':
+            return str(var_value) in str(result_value).split(',')
+        elif condition == '不在其中':
+            return str(var_value) not in str(result_value).split(',')
+        return False
+
+    @rpa_operation("For循环元素", aliases=("forLoopElement",))
     def for_element_loop(self, config):
         """For循环元素"""
         try:
@@ -2868,7 +3287,15 @@ class RPAExecutor:
             if not selector:
                 return {"success": False, "message": "未指定元素选择器"}
 
-            elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
+            if config.get('for_element_fields'):
+                # 指定了字段时一次提取所有元素的数据，循环对象为字段记录（可用 ${对象.字段} 引用）
+                strategy = self.CDP_SELECTOR_STRATEGIES.get(config.get('selector_type'), "auto")
+                elements = extract_elements(self._page(), selector, strategy, config['for_element_fields'])["records"]
+            else:
+                # 循环需要当前页面上的全部元素，重新查找并更新缓存
+                elements = self._find_elements(selector, config.get('selector_type'), refresh=True)
+            if elements is None:
+                return {"success": False, "message": f"无效的选择器: {selector}"}
 
             loop_info = {
                 "type": "for_element",
@@ -2884,10 +3311,11 @@ class RPAExecutor:
         except Exception as e:
             return {"success": False, "message": f"For循环元素失败: {str(e)}"}
 
+    @rpa_operation("For循环次数", aliases=("forLoopCount",))
     def for_count_loop(self, config):
         """For循环次数"""
         try:
-            count = config.get('for_count_times', 5)
+            count = int(config.get('for_count_times', 5))
             save_index = config.get('for_count_save_index', '')
 
             loop_info = {
@@ -2903,6 +3331,7 @@ class RPAExecutor:
         except Exception as e:
             return {"success": False, "message": f"For循环次数失败: {str(e)}"}
 
+    @rpa_operation("For循环数据", aliases=("forLoopData",))
     def for_data_loop(self, config):
         """For循环数据"""
         try:
@@ -2934,6 +3363,7 @@ class RPAExecutor:
         except Exception as e:
             return {"success": False, "message": f"For循环数据失败: {str(e)}"}
 
+    @rpa_operation("退出循环", aliases=("exitLoop", "breakLoop"))
     def break_loop(self, config):
         """退出循环"""
         try:
@@ -2945,6 +3375,7 @@ class RPAExecutor:
         except Exception as e:
             return {"success": False, "message": f"退出循环失败: {str(e)}"}
 
+    @rpa_operation("While循环", aliases=("whileLoop",))
     def while_loop(self, config):
         """While循环"""
         try:
@@ -2968,8 +3399,47 @@ class RPAExecutor:
         except Exception as e:
             return {"success": False, "message": f"While循环失败: {str(e)}"}
 
+    @rpa_operation("结束循环", aliases=("结束条件", "endLoop", "endIf", "endBlock"))
+    def end_block(self, config):
+        """循环/条件块结束标记，跳转由流程解释器处理"""
+        return {"success": True, "message": "块结束"}
+
+    def next_loop_iteration(self, loop_info):
+        """进入循环的下一次迭代并写入循环变量，循环结束返回False
+
+        loop_info为循环开始时压入loop_stack的字典，原地更新索引，迭代间不复制数据
+        """
+        index = loop_info.get("current_index", loop_info.get("current_iteration", 0))
+        loop_type = loop_info["type"]
+
+        if loop_type == "for_element" or loop_type == "for_data":
+            items = loop_info["elements"] if loop_type == "for_element" else loop_info["data"]
+            if index >= len(items):
+                return False
+            if loop_info.get("save_object"):
+                self.variables[loop_info["save_object"]] = items[index]
+        elif loop_type == "for_count":
+            if index >= loop_info["total_count"]:
+                return False
+        elif loop_type == "while":
+            if index >= int(loop_info.get("max_iterations") or 100):
+                return False
+            var_value = self.variables.get(loop_info["variable"]) if loop_info["variable"] else None
+            if not self._evaluate_condition(var_value, loop_info["condition"], loop_info["result_value"]):
+                return False
+            loop_info["current_iteration"] = index + 1
+            return True
+        else:
+            return False
+
+        if loop_info.get("save_index"):
+            self.variables[loop_info["save_index"]] = index
+        loop_info["current_index"] = index + 1
+        return True
+
     # ==================== 第三方工具实现 ====================
 
+    @rpa_operation("2Captcha验证码识别", aliases=("2Captcha", "2captcha"))
     def solve_captcha(self, config):
         """2Captcha验证码识别"""
         try:
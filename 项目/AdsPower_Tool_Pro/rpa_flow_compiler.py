@@ -0,0 +1,457 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+RPA流程编译
+流程执行前只规范化一次：解析操作处理函数、统一时间单位（毫秒/秒）、转换AdsPower官方导出的参数名、
+预解析选择器和变量引用并校验必填参数；编译结果按流程内容哈希缓存，批量任务的所有环境共享同一份执行计划
+
+循环和条件块（嵌套children或平铺的结束标记）展开为线性指令，跳转目标在编译时确定，由rpa_flow_interpreter执行
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict, namedtuple
+from types import MappingProxyType
+from typing import Any, Dict, List, Optional, Tuple
+
+from rpa_operation_registry import rpa_operations
+from rpa_template import RAW_PARAMS, template_cache
+
+# 预解析的选择器：strategy为 css / xpath / text
+ParsedSelector = namedtuple("ParsedSelector", ["value", "strategy"])
+
+# 官方 selectorRadio -> 执行器 selector_type
+SELECTOR_TYPES = {"CSS": "Selector", "Selector": "Selector", "XPath": "XPath", "Text": "文本", "文本": "文本"}
+SELECTOR_STRATEGIES = {"Selector": "css", "XPath": "xpath", "文本": "text"}
+
+# 官方键盘按键 -> 执行器 key_type
+KEY_NAMES = {
+    "Enter": "回车键",
+    "Backspace": "退格键",
+    "Tab": "Tab键",
+    "Space": "空格键",
+    "Escape": "Esc键",
+    "Delete": "删除键",
+    "ArrowUp": "方向上键",
+    "ArrowDown": "方向下键",
+    "ArrowLeft": "方向左键",
+    "ArrowRight": "方向右键"
+}
+
+MOUSE_BUTTONS = {"left": "鼠标左键", "right": "鼠标右键", "middle": "鼠标中键"}
+
+# 必填参数：每组中至少有一个非空
+REQUIRED_PARAMS = {
+    "访问网站": [("goto_url",)],
+    "点击元素": [("selector", "stored_element", "click_selector")],
+    "输入内容": [("selector", "stored_element", "input_selector"), ("content", "input_content")],
+    "执行JS脚本": [("js_code",)],
+    "经过元素": [("hover_selector",)],
+    "元素聚焦": [("focus_selector",)],
+    "获取URL": [("get_url_save_var",)],
+    "获取页面Cookie": [("cookie_save_var",)]
+}
+
+
+def _seconds(value_ms, default: float = 0) -> float:
+    """毫秒转换为秒"""
+    try:
+        return float(value_ms) / 1000
+    except (TypeError, ValueError):
+        return default
+
+
+def _int(value, default: int = 1) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _element_order(config: Dict[str, Any]):
+    """官方 serialType/serial/serialMin/serialMax 转换为执行器的 element_order"""
+    if config.get("serialType") == "randomInterval":
+        return {"type": "区间随机", "value": _int(config.get("serialMin")), "max_value": _int(config.get("serialMax"))}
+    return {"type": "固定值", "value": _int(config.get("serial"))}
+
+
+def parse_selector(selector: str, selector_type: str = None) -> ParsedSelector:
+    """确定选择器策略，未指定类型时按写法识别XPath"""
+    strategy = SELECTOR_STRATEGIES.get(selector_type)
+    if strategy is None:
+        text = selector.lstrip()
+        strategy = "xpath" if text.startswith(("/", "./", "(")) else "css"
+    return ParsedSelector(selector, strategy)
+
+
+# ==================== 参数规范化 ====================
+# 只补充执行器使用的参数名，原有参数保持不变；已存在的执行器参数不覆盖
+
+def _normalize_goto_url(config: Dict[str, Any]) -> Dict[str, Any]:
+    params = {}
+    if "url" in config:
+        params["goto_url"] = config["url"]
+    if "timeout" in config:
+        params["timeout_seconds"] = _seconds(config["timeout"], 30) or 30  # 官方单位为毫秒
+    return params
+
+
+def _normalize_wait_time(config: Dict[str, Any]) -> Dict[str, Any]:
+    if "timeoutType" in config:
+        # 官方格式：毫秒
+        if config["timeoutType"] == "randomInterval":
+            return {"wait_type": "随机时间",
+                    "wait_min": _seconds(config.get("timeoutMin")),
+                    "wait_max": _seconds(config.get("timeoutMax"))}
+        return {"wait_type": "固定时间", "wait_min": _seconds(config.get("timeout"))}
+    if "timeout_type" in config:
+        # 标准格式：区间随机 / 固定值，毫秒
+        if config["timeout_type"] == "区间随机":
+            return {"wait_type": "随机时间",
+                    "wait_min": _seconds(config.get("timeout_min")),
+                    "wait_max": _seconds(config.get("timeout_max"))}
+        return {"wait_type": "固定时间", "wait_min": _seconds(config.get("timeout_value", config.get("timeout")))}
+    return {}
+
+
+def _normalize_selector_params(config: Dict[str, Any]) -> Dict[str, Any]:
+    params = {}
+    if "selectorRadio" in config:
+        params["selector_type"] = SELECTOR_TYPES.get(config["selectorRadio"], "Selector")
+    if "element" in config:
+        params["stored_element"] = config["element"]
+    if "serial" in config or "serialType" in config:
+        params["element_order"] = _element_order(config)
+    return params
+
+
+def _normalize_click(config: Dict[str, Any]) -> Dict[str, Any]:
+    params = _normalize_selector_params(config)
+    if "button" in config:
+        params["click_type"] = MOUSE_BUTTONS.get(config["button"], "鼠标左键")
+    if config.get("type") in ("click", "doubleClick"):
+        params["key_type"] = "双击" if config["type"] == "doubleClick" else "单击"
+    return params
+
+
+def _normalize_input(config: Dict[str, Any]) -> Dict[str, Any]:
+    params = _normalize_selector_params(config)
+    if str(config.get("isRandom", "0")) == "1" and config.get("randomContent"):
+        params["content"] = config["randomContent"]
+        params["content_type"] = "随机选取"
+    if "intervals" in config:
+        params["input_interval"] = _int(config["intervals"], 300)  # 执行器单位同为毫秒
+    if "isClear" in config:
+        params["clear_before"] = str(config["isClear"]) == "1"
+    return params
+
+
+def _normalize_scroll(config: Dict[str, Any]) -> Dict[str, Any]:
+    params = {}
+    if "rangeType" in config:
+        params["scroll_range_type"] = "元素" if config["rangeType"] == "element" else "窗口"
+        if config.get("selector"):
+            params["scroll_selector"] = config["selector"]
+    if config.get("scrollType") == "position":
+        params["scroll_position"] = config.get("position", "bottom")
+    if config.get("distance"):
+        params["scroll_distance"] = _int(config["distance"], 500)
+    if config.get("type") in ("smooth", "auto", "instant"):
+        params["scroll_behavior"] = config["type"]
+    return params
+
+
+def _normalize_keyboard(config: Dict[str, Any]) -> Dict[str, Any]:
+    if config.get("type") in KEY_NAMES:
+        return {"key_type": KEY_NAMES[config["type"]]}
+    return {}
+
+
+NORMALIZERS = {
+    "访问网站": _normalize_goto_url,
+    "等待时间": _normalize_wait_time,
+    "点击元素": _normalize_click,
+    "输入内容": _normalize_input,
+    "滚动页面": _normalize_scroll,
+    "键盘按键": _normalize_keyboard
+}
+
+# 块结构
+LOOP_OPERATIONS = ("For循环元素", "For循环次数", "For循环数据", "While循环")
+IF_OPERATION = "IF条件"
+ELSE_OPERATION = "Else条件"
+BREAK_OPERATION = "退出循环"
+END_OPERATION = "结束循环"  # 别名：结束条件
+
+# 需要网络事件捕获的操作：连接浏览器后立即开始捕获，步骤执行前发生的请求也能匹配
+NETWORK_OPERATIONS = ("监听请求触发", "监听请求结果", "等待请求完成")
+
+# 各操作中保存选择器的参数
+SELECTOR_PARAMS = ("selector", "click_selector", "input_selector", "hover_selector",
+                   "focus_selector", "dropdown_selector", "scroll_selector", "wait_element_selector")
+
+
+class CompiledStep:
+    """编译后的步骤，参数只读"""
+
+    __slots__ = ("index", "title", "operation", "entry", "params", "selectors", "variable_refs", "on_error",
+                 "template_params", "kind", "target", "pops")
+
+    def __init__(self, index: int, title: str, operation: str, entry, params: Dict[str, Any],
+                 selectors: Dict[str, ParsedSelector], variable_refs: Tuple[str, ...], on_error: str,
+                 template_params: Tuple[str, ...] = ()):
+        self.index = index
+        self.title = title
+        self.operation = operation          # 标准操作名
+        self.entry = entry                  # OperationEntry，未注册为None
+        self.params = MappingProxyType(params)
+        self.selectors = MappingProxyType(selectors)
+        self.variable_refs = variable_refs  # 参数中引用的变量名
+        self.on_error = on_error            # 失败时 stop / continue
+        self.template_params = template_params  # 含变量引用、执行时需要渲染的参数
+
+        # 块结构，编译时确定：
+        # loop - 循环开始，target为循环结束后的下一条
+        # loop_end - 循环体结束，target为循环开始
+        # if - 条件不成立时跳到target（Else分支或块结束后）
+        # else - IF分支执行完到达这里时跳到target（块结束后）
+        # end_if - 条件块结束
+        # break - 退出循环，target为跳转位置，pops为需要弹出的循环层数（0表示跳过当前迭代）
+        self.kind = "step"
+        self.target = -1
+        self.pops = 0
+
+    def __repr__(self):
+        return f"CompiledStep({self.index}, {self.operation!r})"
+
+
+class CompiledFlow:
+    """编译后的执行计划"""
+
+    def __init__(self, name: str, steps: Tuple[CompiledStep, ...], content_hash: str,
+                 errors: List[str], warnings: List[str], backend: str = "selenium"):
+        self.name = name
+        self.steps = steps
+        self.content_hash = content_hash
+        self.errors = errors
+        self.warnings = warnings
+        self.backend = backend
+        self.needs_network_capture = any(step.operation in NETWORK_OPERATIONS for step in steps)
+
+    @property
+    def valid(self) -> bool:
+        return not self.errors
+
+    def __len__(self):
+        return len(self.steps)
+
+
+class FlowCompiler:
+    """流程编译器 - 线程安全，按流程内容哈希缓存执行计划"""
+
+    def __init__(self, max_cached: int = 64):
+        self.max_cached = max_cached
+        self._cache = OrderedDict()  # content_hash -> CompiledFlow
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0}
+
+    @staticmethod
+    def content_hash(flow_data: Dict[str, Any]) -> str:
+        """按步骤内容和执行后端计算哈希，流程名称、保存时间等不影响执行计划"""
+        payload = {"steps": flow_data.get("steps", []), "backend": flow_data.get("backend", "selenium")}
+        raw = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def compile(self, flow_data: Dict[str, Any]) -> CompiledFlow:
+        """编译流程，相同内容的流程直接返回缓存的执行计划"""
+        key = self.content_hash(flow_data)
+        with self._lock:
+            plan = self._cache.get(key)
+            if plan is not None:
+                self._cache.move_to_end(key)
+                self.stats["hits"] += 1
+                return plan
+            self.stats["misses"] += 1
+
+        plan = self._compile(flow_data, key)
+        with self._lock:
+            self._cache[key] = plan
+            while len(self._cache) > self.max_cached:
+                self._cache.popitem(last=False)
+        return plan
+
+    def _compile(self, flow_data: Dict[str, Any], key: str) -> CompiledFlow:
+        errors, warnings, steps = [], [], []
+        self._flatten(flow_data.get("steps", []), steps, errors, warnings)
+        self._link_blocks(steps, errors, warnings)
+        return CompiledFlow(flow_data.get("name", ""), tuple(steps), key, errors, warnings,
+                            flow_data.get("backend", "selenium"))
+
+    @staticmethod
+    def _children(step: Dict[str, Any]) -> Optional[list]:
+        children = step.get("children")
+        if children is None and isinstance(step.get("config"), dict):
+            children = step["config"].get("children")
+        return children if isinstance(children, list) else None
+
+    def _flatten(self, raw_steps: list, steps: List[CompiledStep], errors: List[str], warnings: List[str]):
+        """按顺序编译步骤，嵌套children展开为 块开始 + 子步骤 + 结束标记"""
+        for position, raw in enumerate(raw_steps):
+            compiled = self.compile_step(len(steps), raw, errors, warnings)
+            if compiled is None:
+                continue
+            steps.append(compiled)
+
+            children = self._children(raw)
+            if children is None:
+                continue
+            self._flatten(children, steps, errors, warnings)
+            if compiled.operation == IF_OPERATION:
+                # 紧跟的Else条件属于同一个块，由Else在其子步骤后结束
+                following = raw_steps[position + 1] if position + 1 < len(raw_steps) else None
+                if following is not None and self._operation_of(following) == ELSE_OPERATION:
+                    continue
+            if compiled.operation in LOOP_OPERATIONS or compiled.operation in (IF_OPERATION, ELSE_OPERATION):
+                steps.append(self._end_marker(len(steps), compiled.operation in LOOP_OPERATIONS))
+
+    @staticmethod
+    def _operation_of(step: Dict[str, Any]) -> str:
+        config = step.get("config") if isinstance(step.get("config"), dict) else step
+        operation = config.get("operation") or step.get("operation") or step.get("operation_type", "")
+        entry = rpa_operations.resolve(operation)
+        return entry.name if entry else operation
+
+    @staticmethod
+    def _end_marker(index: int, loop: bool) -> CompiledStep:
+        name = "结束循环" if loop else "结束条件"
+        return CompiledStep(index, name, END_OPERATION, rpa_operations.resolve(END_OPERATION),
+                            {"operation": name}, {}, (), "continue")
+
+    def _link_blocks(self, steps: List[CompiledStep], errors: List[str], warnings: List[str]):
+        """匹配块开始/结束并计算跳转目标；未结束的块在流程末尾自动结束"""
+        blocks = []  # [开始步骤, Else步骤, 跳出该循环的退出循环步骤]
+
+        def close(end: CompiledStep):
+            head, else_step, breaks = blocks.pop()
+            if head.kind == "loop":
+                end.kind = "loop_end"
+                end.target = head.index
+                head.target = end.index + 1
+                for step in breaks:
+                    # 跳过当前迭代跳到循环结束处进入下一次迭代，其余跳到循环之后
+                    step.target = end.index if step.pops == 0 else end.index + 1
+            else:
+                end.kind = "end_if"
+                if else_step is not None:
+                    head.target = else_step.index + 1
+                    else_step.target = end.index + 1
+                else:
+                    head.target = end.index + 1
+
+        for step in steps:
+            if step.operation in LOOP_OPERATIONS:
+                step.kind = "loop"
+                blocks.append([step, None, []])
+            elif step.operation == IF_OPERATION:
+                step.kind = "if"
+                blocks.append([step, None, []])
+            elif step.operation == ELSE_OPERATION:
+                if not blocks or blocks[-1][0].kind != "if" or blocks[-1][1] is not None:
+                    errors.append(f"{step.title}: Else条件没有对应的IF条件")
+                    continue
+                step.kind = "else"
+                blocks[-1][1] = step
+            elif step.operation == BREAK_OPERATION:
+                loops = [block for block in blocks if block[0].kind == "loop"]
+                if not loops:
+                    warnings.append(f"{step.title}: 退出循环不在循环内")
+                    continue
+                step.kind = "break"
+                exit_type = step.params.get("exit_loop_type", "退出当前循环")
+                if exit_type == "跳过当前迭代":
+                    step.pops = 0
+                    loops[-1][2].append(step)
+                elif exit_type == "退出所有循环":
+                    step.pops = len(loops)
+                    loops[0][2].append(step)
+                else:
+                    step.pops = 1
+                    loops[-1][2].append(step)
+            elif step.operation == END_OPERATION:
+                if not blocks:
+                    errors.append(f"{step.title}: 没有对应的循环或条件开始")
+                    continue
+                close(step)
+
+        while blocks:
+            head = blocks[-1][0]
+            warnings.append(f"{head.title}: 块未结束，执行到流程末尾")
+            end = self._end_marker(len(steps), head.kind == "loop")
+            steps.append(end)
+            close(end)
+
+    def compile_step(self, index: int, step: Dict[str, Any], errors: List[str] = None,
+                     warnings: List[str] = None) -> Optional[CompiledStep]:
+        """编译单个步骤，问题写入errors/warnings；禁用的步骤返回None"""
+        errors = errors if errors is not None else []
+        warnings = warnings if warnings is not None else []
+        if step.get("enabled", True) is False:
+            return None
+
+        config = step.get("config") if isinstance(step.get("config"), dict) else step
+        operation = config.get("operation") or step.get("operation") or step.get("operation_type", "")
+        title = step.get("title") or f"步骤 {index + 1}: {operation}"
+
+        entry = rpa_operations.resolve(operation)
+        if entry is None:
+            errors.append(f"{title}: 未实现的操作 {operation}")
+        name = entry.name if entry else operation
+
+        params = dict(config)
+        params.pop("children", None)
+        params["operation"] = operation
+        normalizer = NORMALIZERS.get(name)
+        if normalizer:
+            for param, value in normalizer(config).items():
+                params.setdefault(param, value)
+
+        for group in REQUIRED_PARAMS.get(name, ()):
+            if not any(params.get(param) not in (None, "", "无") for param in group):
+                errors.append(f"{title}: 缺少参数 {'/'.join(group)}")
+
+        selectors = {}
+        for param in SELECTOR_PARAMS:
+            value = params.get(param)
+            if isinstance(value, str) and value:
+                selector_type = params.get("selector_type") if param == "selector" else params.get(f"{param}_type")
+                selectors[param] = parse_selector(value, selector_type)
+
+        # 预编译参数中的变量模板
+        refs, template_params = [], []
+        for param, value in params.items():
+            if param in RAW_PARAMS or not template_cache.has_template(value):
+                continue
+            template_params.append(param)
+            for ref in template_cache.refs(value):
+                if ref not in refs:
+                    refs.append(ref)
+
+        on_error = config.get("on_error") or step.get("on_error") or "continue"
+        return CompiledStep(index, title, name, entry, params, selectors, tuple(refs), on_error,
+                            tuple(template_params))
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = self.stats.copy()
+            stats["cached"] = len(self._cache)
+            return stats
+
+
+# 全局流程编译器 - 线程管理器和批量管理器共享
+flow_compiler = FlowCompiler()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+RPA流程解释器
+按编译后的执行计划逐条执行，For/While循环、退出循环和IF/Else分支通过编译时确定的跳转目标实现；
+循环状态保存在执行器的loop_stack中并原地推进，循环体不会重新遍历或复制
+"""
+
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from rpa_flow_compiler import CompiledFlow, CompiledStep
+
+
+class FlowInterpreter:
+    """在一个执行器上运行执行计划"""
+
+    def __init__(self, executor, plan: CompiledFlow, should_stop: Callable[[], bool] = None,
+                 on_step: Callable = None, keep_results: int = 1000):
+        self.executor = executor
+        self.plan = plan
+        self.should_stop = should_stop  # 返回True时停止执行（如任务取消）
+        self.on_step = on_step          # on_step(step) 每条步骤执行前回调，用于更新进度
+        self.keep_results = keep_results  # 保留的步骤结果数，长循环只保留最近的结果
+
+        self.executed_steps = 0
+        self.iterations = 0
+
+    def run(self) -> Dict[str, Any]:
+        """执行流程，返回 {"success", "results", "completed_steps", "error"}"""
+        executor = self.executor
+        steps = self.plan.steps
+        loop_stack = executor.loop_stack
+        loop_stack.clear()
+        results = []
+        pc = 0
+
+        while pc < len(steps):
+            if self.should_stop and self.should_stop():
+                break
+
+            step = steps[pc]
+            kind = step.kind
+
+            if kind == "loop_end":
+                # 循环体执行完，推进到下一次迭代
+                head = steps[step.target]
+                more, result = self._next_iteration(head, loop_stack, results)
+                if more:
+                    pc = step.target + 1
+                elif result is not None and head.on_error == "stop":
+                    return self._stopped(result, results)
+                else:
+                    pc += 1
+                continue
+            if kind == "break":
+                if step.pops:
+                    del loop_stack[-step.pops:]
+                pc = step.target
+                continue
+            if kind == "else":
+                # IF分支执行完，跳过Else分支
+                pc = step.target
+                continue
+            if kind == "end_if":
+                pc += 1
+                continue
+
+            if self.on_step:
+                self.on_step(step)
+            result = executor.execute_compiled_step(step)
+            self.executed_steps += 1
+            self._keep(results, result)
+
+            if not result.get("success"):
+                if step.on_error == "stop":
+                    return self._stopped(result, results)
+                # 块开始步骤失败时跳过整个块（IF条件连同Else分支）
+                pc = self._block_exit(step) if kind in ("loop", "if") else pc + 1
+                continue
+
+            if kind == "loop":
+                more, result = self._next_iteration(step, loop_stack, results)
+                if more:
+                    pc += 1
+                elif result is not None and step.on_error == "stop":
+                    return self._stopped(result, results)
+                else:
+                    pc = step.target
+            elif kind == "if":
+                pc = pc + 1 if result.get("condition_result") else step.target
+            else:
+                pc += 1
+
+        return {
+            "success": True,
+            "results": results,
+            "completed_steps": self.executed_steps
+        }
+
+    def _next_iteration(self, head: CompiledStep, loop_stack: list, results: list) -> Tuple[bool, Optional[Dict]]:
+        """推进循环，返回 (是否继续迭代, 失败结果)；循环结束或条件判断出错（如While条件的值不是数字）时弹出循环"""
+        try:
+            if self.executor.next_loop_iteration(loop_stack[-1]):
+                self.iterations += 1
+                return True, None
+            failure = None
+        except Exception as e:
+            failure = {"success": False, "message": f"{head.title}: 循环条件判断失败: {str(e)}"}
+            self._keep(results, failure)
+        loop_stack.pop()
+        return False, failure
+
+    def _keep(self, results: list, result: Dict):
+        results.append(result)
+        if len(results) > self.keep_results:
+            del results[:len(results) - self.keep_results]
+
+    def _stopped(self, result: Dict, results: list) -> Dict[str, Any]:
+        return {
+            "success": False,
+            "error": f"步骤执行失败: {result.get('message')}",
+            "results": results,
+            "completed_steps": self.executed_steps
+        }
+
+    def _block_exit(self, head: CompiledStep) -> int:
+        """块结束后的下一条；IF有Else时target为Else分支，需跳过Else"""
+        steps = self.plan.steps
+        if head.kind == "if" and steps[head.target - 1].kind == "else":
+            return steps[head.target - 1].target
+        return head.target
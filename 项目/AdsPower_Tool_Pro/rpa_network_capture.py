@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+RPA网络请求捕获
+基于DevTools Network域的事件流：浏览器推送请求/响应事件，保存在每个会话的有界环形缓冲区中，
+等待匹配的请求时事件到达即返回，不再注入fetch/XHR钩子轮询；
+覆盖页面跳转、Worker发出的请求以及开始等待之前已发生的请求，响应体在需要时才读取
+"""
+
+import base64
+import fnmatch
+import itertools
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
+from rpa_cdp_backend import CDPError, CDPPage
+
+
+class NetworkEvent:
+    """一次网络请求，随事件到达逐步补全"""
+
+    __slots__ = ("seq", "request_id", "url", "method", "resource_type", "request_headers", "post_data",
+                 "timestamp", "status", "status_text", "response_headers", "mime_type",
+                 "responded", "finished", "failed", "error", "encoded_length")
+
+    def __init__(self, seq: int, request_id: str, request: Dict[str, Any], resource_type: str):
+        self.seq = seq
+        self.request_id = request_id
+        self.url = request.get("url", "")
+        self.method = request.get("method", "GET")
+        self.resource_type = resource_type or ""
+        self.request_headers = request.get("headers", {})
+        self.post_data = request.get("postData")
+        self.timestamp = int(time.time() * 1000)
+
+        self.status = 0
+        self.status_text = ""
+        self.response_headers = {}
+        self.mime_type = ""
+        self.responded = False   # 已收到响应头
+        self.finished = False    # 响应体已接收完成，可读取
+        self.failed = False
+        self.error = ""
+        self.encoded_length = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "url": self.url,
+            "method": self.method,
+            "type": self.resource_type.lower(),
+            "timestamp": self.timestamp,
+            "headers": self.request_headers,
+            "body": self.post_data,
+            "status": self.status,
+            "statusText": self.status_text,
+            "responseHeaders": self.response_headers,
+            "mimeType": self.mime_type,
+            "failed": self.failed,
+            "error": self.error
+        }
+
+
+class RequestFilter:
+    """请求过滤条件：URL（包含子串，或含*?时按通配符匹配）、请求方法、状态码、资源类型"""
+
+    def __init__(self, url_pattern: str = "", method: str = "", status: Any = None,
+                 resource_types: List[str] = None):
+        self.url_pattern = url_pattern or ""
+        self.wildcard = any(ch in self.url_pattern for ch in "*?")
+        self.method = "" if method in (None, "", "所有方法") else str(method).upper()
+        self.status = None if status in (None, "", "所有状态") else int(status)
+        self.resource_types = {t.lower() for t in resource_types} if resource_types else None
+
+    @property
+    def key(self):
+        """相同条件的过滤器共用消费位置"""
+        return (self.url_pattern, self.method, self.status,
+                tuple(sorted(self.resource_types)) if self.resource_types else None)
+
+    def matches_request(self, event: NetworkEvent) -> bool:
+        if self.method and event.method.upper() != self.method:
+            return False
+        if self.resource_types and event.resource_type.lower() not in self.resource_types:
+            return False
+        if not self.url_pattern:
+            return True
+        if self.wildcard:
+            return fnmatch.fnmatchcase(event.url, self.url_pattern)
+        return self.url_pattern in event.url
+
+    def matches(self, event: NetworkEvent) -> bool:
+        if not self.matches_request(event):
+            return False
+        return self.status is None or (event.responded and event.status == self.status)
+
+
+class NetworkCapture:
+    """一个页面标签的网络事件捕获 - 事件由CDP读线程推送，等待方通过条件变量唤醒"""
+
+    # 等待阶段：request 请求发出 / response 收到响应头 / finished 响应体接收完成（或失败）
+    PHASES = ("request", "response", "finished")
+
+    def __init__(self, page: CDPPage, max_events: int = 500):
+        self.page = page
+        self.max_events = max_events
+        self._events = deque(maxlen=max_events)  # 环形缓冲区，最旧的事件自动丢弃
+        self._by_id = {}                         # request_id -> NetworkEvent（仅缓冲区内的）
+        self._seq = itertools.count(1)
+        self._cond = threading.Condition()
+        self.cursors = {}  # (过滤条件, 阶段) -> 已被该条件的等待消费的最大序号，之后只匹配更新的请求
+        self.started = False
+        self.stats = {"events": 0, "dropped": 0, "matched": 0, "bodies": 0}
+
+        self._handlers = {
+            "Network.requestWillBeSent": self._on_request,
+            "Network.responseReceived": self._on_response,
+            "Network.loadingFinished": self._on_finished,
+            "Network.loadingFailed": self._on_failed
+        }
+
+    @property
+    def target_id(self) -> Optional[str]:
+        return self.page.target_id
+
+    @property
+    def alive(self) -> bool:
+        connection = self.page.connection
+        return self.started and connection is not None and not connection.closed
+
+    def start(self, max_resource_buffer: int = 10 * 1024 * 1024):
+        """开启Network域，max_resource_buffer为浏览器端保留响应体的缓冲大小"""
+        for method, handler in self._handlers.items():
+            self.page.connection.on(method, handler)
+        self.page.send("Network.enable", {"maxTotalBufferSize": max_resource_buffer * 4,
+                                          "maxResourceBufferSize": max_resource_buffer})
+        self.started = True
+
+    def stop(self):
+        if self.page.connection is not None:
+            for method, handler in self._handlers.items():
+                self.page.connection.off(method, handler)
+        self.page.close()
+        self.started = False
+        with self._cond:
+            self._cond.notify_all()
+
+    # ==================== 事件 ====================
+
+    def _on_request(self, params: Dict[str, Any]):
+        request_id = params.get("requestId")
+        with self._cond:
+            previous = self._by_id.get(request_id)
+            if previous is not None and params.get("redirectResponse"):
+                # 重定向沿用同一requestId，上一跳视为已结束
+                previous.responded = previous.finished = True
+                previous.status = params["redirectResponse"].get("status", 0)
+            event = NetworkEvent(next(self._seq), request_id, params.get("request", {}), params.get("type"))
+            if len(self._events) == self.max_events:
+                dropped = self._events[0]
+                if self._by_id.get(dropped.request_id) is dropped:
+                    del self._by_id[dropped.request_id]
+                self.stats["dropped"] += 1
+            self._events.append(event)
+            self._by_id[request_id] = event
+            self.stats["events"] += 1
+            self._cond.notify_all()
+
+    def _on_response(self, params: Dict[str, Any]):
+        with self._cond:
+            event = self._by_id.get(params.get("requestId"))
+            if event is None:
+                return
+            response = params.get("response", {})
+            event.status = response.get("status", 0)
+            event.status_text = response.get("statusText", "")
+            event.response_headers = response.get("headers", {})
+            event.mime_type = response.get("mimeType", "")
+            event.responded = True
+            self._cond.notify_all()
+
+    def _on_finished(self, params: Dict[str, Any]):
+        with self._cond:
+            event = self._by_id.get(params.get("requestId"))
+            if event is None:
+                return
+            event.finished = True
+            event.encoded_length = params.get("encodedDataLength", 0)
+            self._cond.notify_all()
+
+    def _on_failed(self, params: Dict[str, Any]):
+        with self._cond:
+            event = self._by_id.get(params.get("requestId"))
+            if event is None:
+                return
+            event.failed = event.finished = True
+            event.error = params.get("errorText", "")
+            self._cond.notify_all()
+
+    # ==================== 查询和等待 ====================
+
+    @staticmethod
+    def _reached(event: NetworkEvent, phase: str) -> bool:
+        if phase == "request":
+            return True
+        if phase == "response":
+            return event.responded or event.failed
+        return event.finished
+
+    def find(self, request_filter: RequestFilter, since: int = None, phase: str = "request",
+             limit: int = 0) -> List[NetworkEvent]:
+        """返回缓冲区中序号大于since（默认为该条件的消费位置）、已到达phase阶段且匹配的请求"""
+        with self._cond:
+            if since is None:
+                since = self.cursors.get((request_filter.key, phase), 0)
+            return self._find_locked(request_filter, since, phase, limit)
+
+    def _find_locked(self, request_filter: RequestFilter, since: int, phase: str, limit: int) -> List[NetworkEvent]:
+        matched = []
+        for event in self._events:
+            if event.seq <= since or not self._reached(event, phase):
+                continue
+            if request_filter.matches(event):
+                matched.append(event)
+                if limit and len(matched) >= limit:
+                    break
+        return matched
+
+    def wait_for(self, request_filter: RequestFilter, timeout: float, since: int = None,
+                 phase: str = "request", count: int = 1,
+                 should_stop: Callable[[], bool] = None) -> List[NetworkEvent]:
+        """等待至少count个匹配的请求，事件到达时立即返回全部已匹配的请求；超时返回已匹配的部分（可能为空）
+
+        since默认为相同条件、相同阶段的上一次等待消费到的位置，因此开始等待之前已经发生的请求也会匹配；
+        返回后该条件的消费位置前移，下一次相同的等待不会重复匹配同一请求，其他条件的等待不受影响
+        """
+        cursor_key = (request_filter.key, phase)
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            if since is None:
+                since = self.cursors.get(cursor_key, 0)
+            while True:
+                matched = self._find_locked(request_filter, since, phase, 0)
+                remaining = deadline - time.monotonic()
+                if len(matched) >= count or remaining <= 0 or not self.alive:
+                    break
+                if should_stop and should_stop():
+                    break
+                self._cond.wait(min(remaining, 1.0))
+
+            if matched:
+                self.cursors[cursor_key] = max(self.cursors.get(cursor_key, 0), matched[-1].seq)
+                self.stats["matched"] += len(matched)
+            return matched
+
+    def get_body(self, event: NetworkEvent, timeout: float = 10) -> Optional[str]:
+        """读取响应体（需在finished之后），二进制内容返回base64解码后的文本"""
+        if event.failed:
+            return None
+        try:
+            result = self.page.send("Network.getResponseBody", {"requestId": event.request_id}, timeout)
+        except CDPError:
+            # 浏览器端缓冲已被清除或请求无响应体
+            return None
+        self.stats["bodies"] += 1
+        body = result.get("body", "")
+        if result.get("base64Encoded"):
+            try:
+                return base64.b64decode(body).decode("utf-8", errors="replace")
+            except Exception:
+                return body
+        return body
+
+    def clear(self):
+        """清空缓冲区"""
+        with self._cond:
+            self._events.clear()
+            self._by_id.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._cond:
+            stats = self.stats.copy()
+            stats["buffered"] = len(self._events)
+            stats["cursors"] = len(self.cursors)
+            return stats
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+RPA操作注册表
+操作名（含旧版别名）到处理函数的映射，执行器按表分发步骤；
+新操作通过装饰器注册，并按操作统计调用次数、失败次数和耗时
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+
+class OperationEntry:
+    """一个已注册的操作"""
+
+    def __init__(self, name: str, handler: Callable, aliases: Iterable[str] = ()):
+        self.name = name            # 标准操作名
+        self.handler = handler      # handler(executor, config) -> dict
+        self.aliases = tuple(aliases)
+
+        self.calls = 0
+        self.failures = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "failures": self.failures,
+            "total_time": round(self.total_time, 4),
+            "avg_time": round(self.total_time / self.calls, 4) if self.calls else 0,
+            "max_time": round(self.max_time, 4)
+        }
+
+
+class OperationRegistry:
+    """操作注册表 - 线程安全"""
+
+    def __init__(self):
+        self._entries = {}  # 操作名或别名 -> OperationEntry
+        self._lock = threading.Lock()
+        self.unknown = {}   # 未注册的操作名 -> 出现次数
+
+    # ==================== 注册 ====================
+
+    def add(self, name: str, handler: Callable, aliases: Iterable[str] = ()) -> OperationEntry:
+        """注册操作，同名操作会被替换"""
+        entry = OperationEntry(name, handler, aliases)
+        with self._lock:
+            for key in (name, *entry.aliases):
+                self._entries[key] = entry
+        return entry
+
+    def register(self, name: str, aliases: Iterable[str] = ()):
+        """装饰器：@rpa_operation("操作名", aliases=("旧名称",))，处理函数签名为(executor, config)"""
+        def decorator(handler: Callable) -> Callable:
+            self.add(name, handler, aliases)
+            return handler
+        return decorator
+
+    def resolve(self, name: str) -> Optional[OperationEntry]:
+        """按操作名或别名查找，未注册返回None"""
+        return self._entries.get(name)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._entries
+
+    def names(self) -> List[str]:
+        """所有标准操作名"""
+        with self._lock:
+            return sorted({entry.name for entry in self._entries.values()})
+
+    def find_unknown(self, operations: Iterable[str]) -> List[str]:
+        """返回其中未注册的操作名（用于执行前校验流程）"""
+        unknown = []
+        for name in operations:
+            if name not in self._entries and name not in unknown:
+                unknown.append(name)
+        return unknown
+
+    # ==================== 执行 ====================
+
+    def call(self, entry: OperationEntry, executor, config: Dict[str, Any],
+             handler: Callable = None) -> Dict[str, Any]:
+        """执行操作并记录耗时；handler用于替换默认实现（如CDP后端）"""
+        started = time.perf_counter()
+        try:
+            result = (handler or entry.handler)(executor, config)
+        except Exception as e:
+            result = {"success": False, "message": f"执行错误: {str(e)}"}
+        duration = time.perf_counter() - started
+
+        failed = not (isinstance(result, dict) and result.get("success", False))
+        with self._lock:
+            entry.calls += 1
+            entry.total_time += duration
+            if duration > entry.max_time:
+                entry.max_time = duration
+            if failed:
+                entry.failures += 1
+        return result
+
+    def unknown_operation(self, name: str) -> Dict[str, Any]:
+        """记录并返回未注册操作的结果"""
+        with self._lock:
+            self.unknown[name] = self.unknown.get(name, 0) + 1
+        return {"success": False, "message": f"未实现的操作: {name}"}
+
+    # ==================== 统计 ====================
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取有调用记录的操作统计"""
+        with self._lock:
+            entries = {entry.name: entry for entry in self._entries.values()}
+            return {
+                "operations": {name: entry.to_dict() for name, entry in sorted(entries.items()) if entry.calls},
+                "unknown": dict(self.unknown)
+            }
+
+    def reset_stats(self):
+        with self._lock:
+            for entry in self._entries.values():
+                entry.calls = entry.failures = 0
+                entry.total_time = entry.max_time = 0.0
+            self.unknown.clear()
+
+
+# 全局操作注册表 - 执行器的内置操作在导入时注册
+rpa_operations = OperationRegistry()
+rpa_operation = rpa_operations.register
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+RPA页面就绪等待
+以页面内的真实信号代替固定等待：元素进入视口且位置稳定（IntersectionObserver + requestAnimationFrame）、
+DOM不再变化（MutationObserver）、资源请求空闲（PerformanceObserver）和document.readyState；
+条件满足立即返回，超时返回False。page可以是Selenium WebDriver或CDPPage
+"""
+
+import time
+from typing import Any, Dict
+
+# 下一帧：后台标签页不触发requestAnimationFrame，改用定时器
+_NEXT_FRAME_JS = "const nextFrame = document.hidden ? (f => setTimeout(f, 16)) : requestAnimationFrame;"
+
+# arguments: element, timeout_ms, stable_frames
+ELEMENT_READY_JS = _NEXT_FRAME_JS + """
+const el = arguments[0], timeout = arguments[1], frames = arguments[2];
+if (!el || !el.isConnected) return {ok: false, reason: 'detached'};
+// 未渲染（display:none、零尺寸）的元素永远不会进入视口，文件选择框不需要可见，直接返回
+if (el.tagName === 'INPUT' && el.type === 'file') return {ok: true, reason: 'file input'};
+const box = el.getBoundingClientRect();
+if (el.getClientRects().length === 0 || (box.width === 0 && box.height === 0)) return {ok: true, reason: 'not rendered'};
+el.scrollIntoView({block: 'center', inline: 'center'});
+return await new Promise(resolve => {
+    let last = '', stable = 0, intersecting = false, finished = false;
+    const observer = typeof IntersectionObserver === 'function'
+        ? new IntersectionObserver(entries => { intersecting = entries[entries.length - 1].isIntersecting; })
+        : null;
+    const finish = (ok, reason) => {
+        if (finished) return;
+        finished = true;
+        if (observer) observer.disconnect();
+        clearTimeout(timer);
+        resolve({ok: ok, reason: reason});
+    };
+    const timer = setTimeout(() => finish(false, 'timeout'), timeout);
+    const tick = () => {
+        if (finished) return;
+        if (!el.isConnected) return finish(false, 'detached');
+        const r = el.getBoundingClientRect();
+        const key = r.left + ',' + r.top + ',' + r.width + ',' + r.height;
+        stable = key === last ? stable + 1 : 0;
+        last = key;
+        const inView = r.bottom > 0 && r.right > 0 && r.top < innerHeight && r.left < innerWidth;
+        if ((observer ? intersecting : inView) && stable >= frames) return finish(true, 'ready');
+        nextFrame(tick);
+    };
+    if (observer) observer.observe(el);
+    nextFrame(tick);
+});
+"""
+
+# arguments: state ('interactive' / 'complete'), timeout_ms
+READY_STATE_JS = """
+const state = arguments[0], timeout = arguments[1];
+const reached = () => state === 'interactive' ? document.readyState !== 'loading' : document.readyState === 'complete';
+if (reached()) return {ok: true, reason: 'ready'};
+return await new Promise(resolve => {
+    const finish = (ok, reason) => {
+        document.removeEventListener('readystatechange', onChange);
+        clearTimeout(timer);
+        resolve({ok: ok, reason: reason});
+    };
+    const onChange = () => { if (reached()) finish(true, 'ready'); };
+    const timer = setTimeout(() => finish(false, 'timeout'), timeout);
+    document.addEventListener('readystatechange', onChange);
+});
+"""
+
+# arguments: quiet_ms, timeout_ms
+DOM_QUIET_JS = """
+const quiet = arguments[0], timeout = arguments[1];
+return await new Promise(resolve => {
+    let idle = null, finished = false;
+    const observer = new MutationObserver(() => { clearTimeout(idle); idle = setTimeout(() => finish(true, 'quiet'), quiet); });
+    const finish = (ok, reason) => {
+        if (finished) return;
+        finished = true;
+        observer.disconnect();
+        clearTimeout(idle);
+        clearTimeout(deadline);
+        resolve({ok: ok, reason: reason});
+    };
+    const deadline = setTimeout(() => finish(false, 'timeout'), timeout);
+    observer.observe(document.documentElement || document, {childList: true, subtree: true, attributes: true, characterData: true});
+    idle = setTimeout(() => finish(true, 'quiet'), quiet);
+});
+"""
+
+# arguments: quiet_ms, timeout_ms
+NETWORK_IDLE_JS = """
+const quiet = arguments[0], timeout = arguments[1];
+return await new Promise(resolve => {
+    let idle = null, finished = false, observer = null;
+    const busy = () => document.readyState !== 'complete' || (window.jQuery && window.jQuery.active > 0);
+    const finish = (ok, reason) => {
+        if (finished) return;
+        finished = true;
+        if (observer) observer.disconnect();
+        clearTimeout(idle);
+        clearTimeout(deadline);
+        resolve({ok: ok, reason: reason});
+    };
+    const arm = () => { clearTimeout(idle); idle = setTimeout(() => busy() ? arm() : finish(true, 'idle'), quiet); };
+    const deadline = setTimeout(() => finish(false, 'timeout'), timeout);
+    if (typeof PerformanceObserver === 'function') {
+        observer = new PerformanceObserver(arm);
+        try { observer.observe({entryTypes: ['resource']}); } catch (e) { observer = null; }
+    }
+    arm();
+});
+"""
+
+
+def _run(page, body: str, timeout: float, *args) -> Dict[str, Any]:
+    """在页面中执行返回Promise的脚本并等待结果"""
+    if hasattr(page, "execute_async_script"):
+        # Selenium：异步脚本以回调返回，脚本超时需大于等待超时
+        if getattr(page, "_rpa_script_timeout", 0) < timeout + 5:
+            page.set_script_timeout(timeout + 5)
+            page._rpa_script_timeout = timeout + 5
+        script = ("const done = arguments[arguments.length - 1];\n"
+                  "(async function() {" + body + "}).apply(null, Array.prototype.slice.call(arguments, 0, -1))"
+                  ".then(done, e => done({ok: false, reason: String(e)}));")
+        result = page.execute_async_script(script, *args)
+    else:
+        # CDPPage.execute_script会等待Promise，等待超时同样需大于脚本内的超时
+        result = page.execute_script("return (async function() {" + body + "}).apply(null, arguments);", *args,
+                                     timeout=timeout + 5)
+    return result if isinstance(result, dict) else {"ok": False, "reason": "no result"}
+
+
+def wait_element_ready(page, element, timeout: float = 3, stable_frames: int = 2) -> bool:
+    """滚动到元素并等待其进入视口、位置连续stable_frames帧不变"""
+    try:
+        return _run(page, ELEMENT_READY_JS, timeout, element, int(timeout * 1000), stable_frames).get("ok", False)
+    except Exception as e:
+        print(f"[就绪等待] 元素等待失败: {e}")
+        return False
+
+
+def wait_ready_state(page, state: str = "complete", timeout: float = 30) -> bool:
+    """等待document.readyState达到interactive/complete
+
+    等待期间发生跳转时页面脚本上下文会被销毁，此时改为轮询直到超时
+    """
+    deadline = time.monotonic() + timeout
+    try:
+        return _run(page, READY_STATE_JS, timeout, state, int(timeout * 1000)).get("ok", False)
+    except Exception:
+        pass
+
+    while time.monotonic() < deadline:
+        try:
+            current = page.execute_script("return document.readyState")
+            if current == "complete" or (state == "interactive" and current == "interactive"):
+                return True
+        except Exception:
+            pass
+        time.sleep(0.05)
+    return False
+
+
+def wait_dom_quiet(page, quiet_ms: int = 300, timeout: float = 10) -> bool:
+    """等待DOM在quiet_ms内没有变化"""
+    try:
+        return _run(page, DOM_QUIET_JS, timeout, quiet_ms, int(timeout * 1000)).get("ok", False)
+    except Exception as e:
+        print(f"[就绪等待] DOM等待失败: {e}")
+        return False
+
+
+def wait_network_idle(page, quiet_ms: int = 500, timeout: float = 30) -> bool:
+    """等待页面加载完成、jQuery请求结束且quiet_ms内没有新的资源请求完成"""
+    try:
+        return _run(page, NETWORK_IDLE_JS, timeout, quiet_ms, int(timeout * 1000)).get("ok", False)
+    except Exception as e:
+        print(f"[就绪等待] 网络空闲等待失败: {e}")
+        return False
+
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+RPA资源屏蔽策略
+通过DevTools Fetch域在请求发出前拦截指定类型（图片、字体、媒体等）和URL（广告、统计）的资源，
+被屏蔽的请求不经过代理、不占带宽；策略可按流程设置，也可从某个步骤起替换或关闭（如验证码需要加载图片），
+一直生效到下一个指定策略的步骤，之后新开的标签页从第一个请求起同样生效。
+节省的流量按同一会话中已加载的同类型资源的平均大小估算
+"""
+
+import threading
+from typing import Any, Dict, Iterable, Optional
+
+from rpa_cdp_backend import CDPConnection, CDPError
+
+# DevTools资源类型（中文名称可用于配置）
+RESOURCE_TYPES = {
+    "图片": "Image", "字体": "Font", "媒体": "Media", "视频": "Media", "样式": "Stylesheet",
+    "脚本": "Script", "XHR": "XHR", "Fetch": "Fetch", "WebSocket": "WebSocket", "清单": "Manifest",
+    "预检": "Preflight", "Ping": "Ping", "其他": "Other"
+}
+
+# 小写 -> DevTools类型名
+_CANONICAL_TYPES = {name.lower(): name for name in
+                    list(RESOURCE_TYPES.values()) + ["Document", "TextTrack", "EventSource", "Other"]}
+
+# 常见广告和统计请求
+AD_URL_PATTERNS = (
+    "*doubleclick.net*", "*googlesyndication.com*", "*google-analytics.com*", "*googletagmanager.com*",
+    "*googleadservices.com*", "*connect.facebook.net*", "*hotjar.com*", "*clarity.ms*",
+    "*adservice.google.*", "*scorecardresearch.com*"
+)
+
+# 预设策略
+PRESETS = {
+    "屏蔽图片": {"block_types": ["Image"]},
+    "屏蔽广告统计": {"block_urls": list(AD_URL_PATTERNS)},
+    "节省流量": {"block_types": ["Image", "Media", "Font"], "block_urls": list(AD_URL_PATTERNS)}
+}
+
+# 自动附加新目标，目标在发出第一个请求前暂停，等待设置拦截后继续
+_AUTO_ATTACH = {"autoAttach": True, "waitForDebuggerOnStart": True, "flatten": True}
+
+# 可拦截请求的目标类型
+_INTERCEPT_TARGET_TYPES = ("page", "iframe", "worker", "shared_worker", "service_worker")
+
+# 表示不屏蔽的配置值
+_OFF_VALUES = (None, False, "", "关闭", "无", "off", "none")
+
+
+class ResourcePolicy:
+    """要屏蔽的资源类型和URL通配符（不含通配符时按包含匹配）"""
+
+    __slots__ = ("block_types", "block_urls")
+
+    def __init__(self, block_types: Iterable[str] = (), block_urls: Iterable[str] = ()):
+        self.block_types = tuple(sorted({RESOURCE_TYPES.get(t) or _CANONICAL_TYPES.get(t.lower(), t)
+                                         for t in block_types if t}))
+        self.block_urls = tuple(u if any(ch in u for ch in "*?") else f"*{u}*" for u in block_urls if u)
+
+    @classmethod
+    def parse(cls, value: Any) -> Optional["ResourcePolicy"]:
+        """配置值 -> 策略：预设名称、{"block_types": [...], "block_urls": [...]} 或策略对象；关闭或为空时返回None"""
+        if isinstance(value, ResourcePolicy):
+            return value if value else None
+        if isinstance(value, str) and value.strip().lower() in _OFF_VALUES:
+            return None
+        if value in _OFF_VALUES:
+            return None
+        if isinstance(value, str):
+            if value not in PRESETS:
+                raise ValueError(f"未知的资源屏蔽预设: {value}")
+            value = PRESETS[value]
+        if not isinstance(value, dict):
+            raise ValueError(f"无效的资源屏蔽策略: {value}")
+        if value.get("preset"):
+            merged = dict(PRESETS.get(value["preset"], {}))
+            for key in ("block_types", "block_urls"):
+                merged[key] = list(merged.get(key, ())) + list(value.get(key, ()))
+            value = merged
+        policy = cls(value.get("block_types", ()), value.get("block_urls", ()))
+        return policy if policy else None
+
+    def __bool__(self) -> bool:
+        return bool(self.block_types or self.block_urls)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, ResourcePolicy) and \
+            (self.block_types, self.block_urls) == (other.block_types, other.block_urls)
+
+    def __hash__(self) -> int:
+        return hash((self.block_types, self.block_urls))
+
+    def fetch_patterns(self):
+        """Fetch.enable的拦截规则，只有要屏蔽的请求会暂停"""
+        patterns = [{"resourceType": t, "requestStage": "Request"} for t in self.block_types]
+        patterns += [{"urlPattern": u, "requestStage": "Request"} for u in self.block_urls]
+        return patterns
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"block_types": list(self.block_types), "block_urls": list(self.block_urls)}
+
+
+class ResourceStats:
+    """屏蔽统计 - 线程安全"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.blocked = {}        # 资源类型 -> 屏蔽的请求数
+        self.loaded = {}         # 资源类型 -> [已加载请求数, 字节数]
+        self.estimated_saved = 0  # 按同类型平均大小估算的节省字节数
+
+    def record_blocked(self, resource_type: str):
+        with self._lock:
+            self.blocked[resource_type] = self.blocked.get(resource_type, 0) + 1
+            count, size = self.loaded.get(resource_type, (0, 0))
+            if count:
+                self.estimated_saved += size // count
+
+    def record_loaded(self, resource_type: str, size: int):
+        with self._lock:
+            entry = self.loaded.setdefault(resource_type, [0, 0])
+            entry[0] += 1
+            entry[1] += size
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "blocked_requests": sum(self.blocked.values()),
+                "blocked_by_type": dict(self.blocked),
+                "loaded_requests": sum(count for count, _ in self.loaded.values()),
+                "loaded_bytes": sum(size for _, size in self.loaded.values()),
+                "estimated_saved_bytes": self.estimated_saved
+            }
+
+
+# 全局屏蔽统计 - 所有执行器共享
+resource_stats = ResourceStats()
+
+
+class ResourceBlocker:
+    """浏览器的资源屏蔽 - 通过Target.setAutoAttach附加到所有页面，包括之后新建的标签页、target=_blank打开的页面和跨域iframe；
+    新目标暂停在第一个请求之前，应用当前策略后再继续。暂停的请求在CDP读线程中直接回复失败
+    """
+
+    def __init__(self, connection: CDPConnection, stats: ResourceStats = None):
+        self.connection = connection  # 浏览器级连接
+        self.stats = stats or ResourceStats()  # 任务统计，同时计入全局统计
+        self.policy = None
+        self._lock = threading.Lock()
+        self._sessions = set()  # 已附加、可拦截请求的会话
+        self._types = {}  # (会话, request_id) -> 资源类型（已收到响应、等待加载完成）
+
+        self._handlers = {
+            "Target.attachedToTarget": self._on_attached,
+            "Target.detachedFromTarget": self._on_detached,
+            "Fetch.requestPaused": self._on_paused,
+            "Network.responseReceived": self._on_response,
+            "Network.loadingFinished": self._on_finished,
+            "Network.loadingFailed": self._on_failed
+        }
+
+    @classmethod
+    def connect(cls, host: str, stats: ResourceStats = None, timeout: float = 30) -> "ResourceBlocker":
+        return cls(CDPConnection.browser(host, timeout), stats)
+
+    @property
+    def alive(self) -> bool:
+        return not self.connection.closed
+
+    def start(self):
+        for method, handler in self._handlers.items():
+            self.connection.on(method, handler)
+        # 已打开的页面同样会收到attachedToTarget
+        self.connection.send("Target.setAutoAttach", _AUTO_ATTACH)
+
+    def apply(self, policy: Optional[ResourcePolicy]):
+        """切换所有页面的策略，None为不屏蔽"""
+        with self._lock:
+            if policy == self.policy:
+                return
+            self.policy = policy
+            sessions = list(self._sessions)
+        for session_id in sessions:
+            try:
+                if policy:
+                    self.connection.send("Fetch.enable", {"patterns": policy.fetch_patterns()}, session_id=session_id)
+                else:
+                    self.connection.send("Fetch.disable", session_id=session_id)
+            except CDPError as e:
+                # 期间关闭的页面
+                print(f"[资源屏蔽] 切换策略失败: {e}")
+
+    def stop(self):
+        for method, handler in self._handlers.items():
+            self.connection.off(method, handler)
+        # 断开连接后浏览器自动放行并停止拦截
+        self.connection.close()
+        with self._lock:
+            self.policy = None
+            self._sessions.clear()
+
+    # ==================== 事件 ====================
+
+    def _on_attached(self, params: Dict[str, Any]):
+        session_id = params.get("sessionId")
+        target_type = params.get("targetInfo", {}).get("type")
+        if target_type in _INTERCEPT_TARGET_TYPES:
+            # 在锁内发送，与apply切换策略的顺序一致
+            with self._lock:
+                self._sessions.add(session_id)
+                if self.policy:
+                    self.connection.post("Fetch.enable", {"patterns": self.policy.fetch_patterns()}, session_id)
+            # Network事件只用于统计已加载资源的大小
+            self.connection.post("Network.enable", None, session_id)
+            if target_type in ("page", "iframe"):
+                # 页面内的跨域iframe和worker
+                self.connection.post("Target.setAutoAttach", _AUTO_ATTACH, session_id)
+        if params.get("waitingForDebugger"):
+            self.connection.post("Runtime.runIfWaitingForDebugger", None, session_id)
+
+    def _on_detached(self, params: Dict[str, Any]):
+        with self._lock:
+            self._sessions.discard(params.get("sessionId"))
+
+    def _on_paused(self, params: Dict[str, Any]):
+        self.connection.post("Fetch.failRequest", {"requestId": params.get("requestId"), "errorReason": "BlockedByClient"},
+                             params.get("sessionId"))
+        resource_type = params.get("resourceType", "Other")
+        self.stats.record_blocked(resource_type)
+        if self.stats is not resource_stats:
+            resource_stats.record_blocked(resource_type)
+
+    def _on_response(self, params: Dict[str, Any]):
+        if len(self._types) > 10000:
+            # 长连接等不会结束的请求
+            self._types.clear()
+        self._types[(params.get("sessionId"), params.get("requestId"))] = params.get("type", "Other")
+
+    def _on_finished(self, params: Dict[str, Any]):
+        resource_type = self._types.pop((params.get("sessionId"), params.get("requestId")), None)
+        if resource_type is None:
+            return
+        size = int(params.get("encodedDataLength", 0))
+        self.stats.record_loaded(resource_type, size)
+        if self.stats is not resource_stats:
+            resource_stats.record_loaded(resource_type, size)
+
+    def _on_failed(self, params: Dict[str, Any]):
+        self._types.pop((params.get("sessionId"), params.get("requestId")), None)
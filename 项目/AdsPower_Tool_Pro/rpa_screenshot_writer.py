@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+RPA截图
+整页截图通过DevTools的captureBeyondViewport直接截取视口外内容，不再调整窗口大小（不影响环境指纹的窗口尺寸）；
+base64解码、格式转换和写文件在后台I/O线程池中完成，等待写入的截图数有上限，磁盘慢时截图步骤等待空位而不是无限堆积
+"""
+
+import base64
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from io import BytesIO
+from typing import Any, Dict, List, Optional
+
+# 可选依赖：浏览器无法直接输出目标格式时用于转换
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+# 浏览器截图可直接输出的格式
+BROWSER_FORMATS = ("png", "jpeg", "webp")
+
+
+def normalize_format(image_format: str) -> str:
+    image_format = (image_format or "png").lower()
+    return "jpeg" if image_format in ("jpg", "jpeg") else image_format
+
+
+def capture_screenshot(page, full_page: bool = False, image_format: str = "png", quality: int = None) -> str:
+    """截取页面，返回base64数据（不解码）；page可以是Selenium WebDriver（需支持execute_cdp_cmd）或CDPPage"""
+    if hasattr(page, "execute_cdp_cmd"):
+        send = page.execute_cdp_cmd
+    else:
+        # 长页面编码耗时较长
+        def send(method, params):
+            return page.send(method, params, max(page.timeout, 60))
+    image_format = normalize_format(image_format)
+    params = {"format": image_format if image_format in BROWSER_FORMATS else "png"}
+    if quality is not None and params["format"] != "png":
+        params["quality"] = int(quality)
+    if full_page:
+        metrics = send("Page.getLayoutMetrics", {})
+        size = metrics.get("cssContentSize") or metrics.get("contentSize", {})
+        params["clip"] = {"x": 0, "y": 0, "width": size.get("width", 0),
+                          "height": size.get("height", 0), "scale": 1}
+        params["captureBeyondViewport"] = True
+    return send("Page.captureScreenshot", params)["data"]
+
+
+class ScreenshotWriter:
+    """截图写入线程池 - 线程安全"""
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 16):
+        self.max_workers = max_workers
+        self.max_pending = max_pending  # 等待写入的截图上限，满时submit阻塞
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._pending = 0  # 已提交、尚未写完的截图数
+        self._pool = None
+        self.stats = {"submitted": 0, "written": 0, "failed": 0, "converted": 0, "bytes": 0, "blocked": 0}
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                thread_name_prefix="RPA-Screenshot")
+            return self._pool
+
+    def submit(self, data: str, path: str, image_format: str = "png", source_format: str = "png",
+               quality: int = None, timeout: float = 60) -> Future:
+        """提交base64截图数据，写入path；source_format与image_format不同时在后台转换格式
+
+        等待写入的截图已满时最多等待timeout秒，仍无空位抛出TimeoutError
+        """
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.stats["blocked"] += 1
+            if not self._slots.acquire(timeout=timeout):
+                raise TimeoutError(f"截图写入队列已满（{self.max_pending}）")
+        with self._lock:
+            self.stats["submitted"] += 1
+            self._pending += 1
+        try:
+            future = self._get_pool().submit(self._write, data, path, normalize_format(image_format),
+                                             normalize_format(source_format), quality)
+        except Exception:
+            self._release()
+            raise
+        future.add_done_callback(lambda _: self._release())
+        return future
+
+    def _release(self):
+        with self._lock:
+            self._pending -= 1
+        self._slots.release()
+
+    def _write(self, data: str, path: str, image_format: str, source_format: str, quality: Optional[int]) -> str:
+        try:
+            content = base64.b64decode(data)
+            if image_format != source_format:
+                content = self._convert(content, image_format, quality)
+
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # 先写临时文件再替换，读取方不会看到写了一半的图片
+            temp_path = f"{path}.part"
+            with open(temp_path, "wb") as f:
+                f.write(content)
+            os.replace(temp_path, path)
+
+            with self._lock:
+                self.stats["written"] += 1
+                self.stats["bytes"] += len(content)
+            return path
+        except Exception as e:
+            with self._lock:
+                self.stats["failed"] += 1
+            print(f"[截图] 保存失败 {path}: {e}")
+            raise
+
+    def _convert(self, content: bytes, image_format: str, quality: Optional[int]) -> bytes:
+        if not PIL_AVAILABLE:
+            raise RuntimeError(f"转换为{image_format}需要安装Pillow")
+        image = Image.open(BytesIO(content))
+        if image_format == "jpeg" and image.mode != "RGB":
+            image = image.convert("RGB")
+        output = BytesIO()
+        options = {"quality": int(quality)} if quality is not None else {}
+        image.save(output, format=image_format.upper(), **options)
+        with self._lock:
+            self.stats["converted"] += 1
+        return output.getvalue()
+
+    @staticmethod
+    def wait(futures: List[Future], timeout: float = None) -> List[str]:
+        """等待截图写入完成，返回写入失败的信息"""
+        errors = []
+        for future in futures:
+            try:
+                future.result(timeout)
+            except Exception as e:
+                errors.append(str(e))
+        return errors
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = self.stats.copy()
+            stats["pending"] = self._pending
+        return stats
+
+
+# 全局截图写入器 - 所有执行器共享
+screenshot_writer = ScreenshotWriter()
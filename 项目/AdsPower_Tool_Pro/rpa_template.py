@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+RPA变量模板
+参数中的 ${name} / ${row.email} / ${items.0} 引用在首次出现时编译为字面量和引用片段并按字符串缓存，
+之后每次渲染只按片段拼接；整个字符串只有一个引用时返回变量原值（保留类型）
+"""
+
+import re
+import threading
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+TEMPLATE_PATTERN = re.compile(r"\$\{([^}]+)\}")
+
+_MISSING = object()
+
+
+class Template:
+    """编译后的模板：literal片段为str，引用片段为 (原文, 变量名, 字段路径)"""
+
+    __slots__ = ("source", "segments", "refs", "whole")
+
+    def __init__(self, source: str):
+        self.source = source
+        segments = []
+        refs = []
+        position = 0
+        for match in TEMPLATE_PATTERN.finditer(source):
+            if match.start() > position:
+                segments.append(source[position:match.start()])
+            name = match.group(1).strip()
+            parts = name.split(".")
+            segments.append((match.group(0), name, parts[0], tuple(parts[1:])))
+            if name not in refs:
+                refs.append(name)
+            position = match.end()
+        if position < len(source):
+            segments.append(source[position:])
+
+        self.segments = tuple(segments)
+        self.refs = tuple(refs)
+        # 整个字符串就是一个引用
+        self.whole = len(segments) == 1 and isinstance(segments[0], tuple)
+
+    @staticmethod
+    def _lookup(variables: Dict[str, Any], segment) -> Any:
+        _, name, root, path = segment
+        # 变量名本身可能带点，先按完整名称查找
+        value = variables.get(name, _MISSING)
+        if value is not _MISSING or not path:
+            return value
+        value = variables.get(root, _MISSING)
+        for field in path:
+            if value is _MISSING:
+                break
+            if isinstance(value, dict):
+                value = value.get(field, _MISSING)
+            elif isinstance(value, (list, tuple)) and field.lstrip("-").isdigit():
+                index = int(field)
+                value = value[index] if -len(value) <= index < len(value) else _MISSING
+            else:
+                value = getattr(value, field, _MISSING)
+        return value
+
+    def render(self, variables: Dict[str, Any]) -> Any:
+        """渲染模板，未定义的变量保留原文"""
+        if self.whole:
+            value = self._lookup(variables, self.segments[0])
+            return self.source if value is _MISSING else value
+
+        parts = []
+        for segment in self.segments:
+            if isinstance(segment, str):
+                parts.append(segment)
+            else:
+                value = self._lookup(variables, segment)
+                parts.append(segment[0] if value is _MISSING else str(value))
+        return "".join(parts)
+
+
+class TemplateCache:
+    """按字符串缓存编译后的模板 - 线程安全"""
+
+    def __init__(self, max_size: int = 4096):
+        self.max_size = max_size
+        self._templates = {}
+        self._lock = threading.Lock()
+        self.stats = {"compiled": 0, "evicted": 0}
+
+    def get(self, source: str) -> Optional[Template]:
+        """获取模板，不含变量引用的字符串返回None"""
+        template = self._templates.get(source)
+        if template is not None:
+            return template
+        if "${" not in source:
+            return None
+
+        template = Template(source)
+        if not template.segments or not template.refs:
+            return None
+        with self._lock:
+            if len(self._templates) >= self.max_size:
+                # 缓存满时整体清空，正在执行的流程会重新编译用到的模板
+                self.stats["evicted"] += len(self._templates)
+                self._templates.clear()
+            self._templates[source] = template
+            self.stats["compiled"] += 1
+        return template
+
+    def has_template(self, value: Any) -> bool:
+        """参数值（含嵌套的列表/字典）中是否有变量引用"""
+        if isinstance(value, str):
+            return self.get(value) is not None
+        if isinstance(value, dict):
+            return any(self.has_template(item) for item in value.values())
+        if isinstance(value, (list, tuple)):
+            return any(self.has_template(item) for item in value)
+        return False
+
+    def render(self, value: Any, variables: Dict[str, Any]) -> Any:
+        """渲染参数值，列表和字典逐项渲染"""
+        if isinstance(value, str):
+            template = self.get(value)
+            return template.render(variables) if template is not None else value
+        if isinstance(value, dict):
+            return {key: self.render(item, variables) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self.render(item, variables) for item in value]
+        if isinstance(value, tuple):
+            return tuple(self.render(item, variables) for item in value)
+        return value
+
+    def refs(self, value: Any) -> Tuple[str, ...]:
+        """参数值中引用的变量名"""
+        if isinstance(value, str):
+            template = self.get(value)
+            return template.refs if template is not None else ()
+        items = value.values() if isinstance(value, dict) else value if isinstance(value, (list, tuple)) else ()
+        refs = []
+        for item in items:
+            for ref in self.refs(item):
+                if ref not in refs:
+                    refs.append(ref)
+        return tuple(refs)
+
+    def render_params(self, params, keys: Iterable[str], variables: Dict[str, Any]) -> Dict[str, Any]:
+        """复制参数并只渲染keys中的参数"""
+        rendered = dict(params)
+        for key in keys:
+            rendered[key] = self.render(params[key], variables)
+        return rendered
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = self.stats.copy()
+        stats["cached"] = len(self._templates)
+        return stats
+
+
+# 不做变量替换的参数：JS代码中的 ${} 是模板字符串语法，变量通过注入变量传入
+RAW_PARAMS = ("operation", "js_code")
+
+# 全局模板缓存 - 所有执行器共享
+template_cache = TemplateCache()
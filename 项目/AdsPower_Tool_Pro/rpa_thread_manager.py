@@ -6,6 +6,7 @@ RPA多线程执行管理器
 实现多线程RPA执行控制，支持同时运行多个RPA任务，提供线程数量控制和任务队列管理
 """
 
+import heapq
 import threading
 import queue
 import time
@@ -14,6 +15,14 @@ from datetime import datetime
 from typing import Dict, List, Any, Optional, Callable
 from concurrent.futures import ThreadPoolExecutor, Future
 from enum import Enum
+from adspower_circuit_breaker import adspower_circuit_breaker
+from rpa_driver_pool import webdriver_pool
+from rpa_browser_prewarmer import browser_prewarmer
+from rpa_chromedriver_service import chromedriver_services
+from rpa_operation_registry import rpa_operations
+from rpa_flow_compiler import flow_compiler
+from rpa_flow_interpreter import FlowInterpreter
+from rpa_resource_policy import resource_stats
 
 class TaskStatus(Enum):
     """任务状态枚举"""
@@ -105,6 +114,11 @@ class RPAThreadManager:
         
         # 监控线程
         self.monitor_thread = None
+        
+        # 浏览器预热：提前启动队列中前N个任务的浏览器（0表示不预热）
+        self.prewarm_lookahead = 2
+        self.prewarm_interval = 0.5
+        self._last_prewarm = 0.0
     
     def start(self):
         """启动线程管理器"""
@@ -156,6 +170,10 @@ class RPAThreadManager:
                 except:
                     pass
 
+            # 释放连接池中的空闲连接（含未被使用的预热浏览器）
+            browser_prewarmer.discard()
+            webdriver_pool.close_idle()
+
             return {"success": True, "message": "线程管理器已停止"}
     
     def pause(self):
@@ -248,7 +266,14 @@ class RPAThreadManager:
                 "queue_size": self.task_queue.qsize(),
                 "max_threads": self.max_threads,
                 "is_running": self.is_running,
-                "is_paused": self.is_paused
+                "is_paused": self.is_paused,
+                "api_circuit_state": adspower_circuit_breaker.get_state(),
+                "driver_pool": webdriver_pool.get_stats(),
+                "prewarm": browser_prewarmer.get_stats(),
+                "chromedriver": chromedriver_services.get_stats(),
+                "operations": rpa_operations.get_stats(),
+                "flow_compiler": flow_compiler.get_stats(),
+                "resource_policy": resource_stats.get_stats()
             })
             return current_stats
     
@@ -269,6 +294,12 @@ class RPAThreadManager:
                     time.sleep(1)
                     continue
                 
+                # AdsPower API熔断期间暂停派发新任务，避免连接失败白白消耗环境
+                if adspower_circuit_breaker.is_open():
+                    adspower_circuit_breaker.wait_until_closed(timeout=1)
+                    self._check_completed_tasks()
+                    continue
+                
                 # 检查是否有可用线程和待执行任务
                 if len(self.running_tasks) < self.max_threads and not self.task_queue.empty():
                     try:
@@ -295,62 +326,102 @@ class RPAThreadManager:
                 # 检查已完成的任务
                 self._check_completed_tasks()
                 
+                # 为即将执行的任务预热浏览器
+                self._prewarm_upcoming()
+                
                 time.sleep(0.1)  # 避免CPU占用过高
                 
             except Exception as e:
                 print(f"监控线程错误: {e}")
                 time.sleep(1)
     
+    def _prewarm_upcoming(self):
+        """查看队列中即将执行的任务，在后台预先启动其浏览器"""
+        if self.prewarm_lookahead <= 0 or self.task_queue.empty():
+            return
+        now = time.monotonic()
+        if now - self._last_prewarm < self.prewarm_interval:
+            return
+        self._last_prewarm = now
+        
+        # 只查看不出队，PriorityQueue内部为堆，按(priority, timestamp)取最靠前的任务
+        with self.task_queue.mutex:
+            upcoming = heapq.nsmallest(self.prewarm_lookahead + self.max_threads, self.task_queue.queue)
+        
+        with self._lock:
+            running_envs = {task.env_id for task in self.running_tasks.values()}
+        env_ids = []
+        for priority, timestamp, task in upcoming:
+            if task.status == TaskStatus.CANCELLED or task.env_id in running_envs or task.env_id in env_ids:
+                continue
+            env_ids.append(task.env_id)
+            if len(env_ids) >= self.prewarm_lookahead:
+                break
+        if env_ids:
+            browser_prewarmer.prewarm(env_ids)
+    
     def _execute_task(self, task: RPATask) -> Dict[str, Any]:
         """执行单个RPA任务"""
+        executor = None
         try:
             # 导入RPA执行器
             from rpa_executor import RPAExecutor
             
+            # 编译流程（相同流程的任务共享执行计划），校验失败不连接浏览器
+            plan = flow_compiler.compile(task.flow_data)
+            if not plan.valid:
+                raise Exception(f"流程校验失败: {'; '.join(plan.errors)}")
+            
             # 创建执行器实例
-            executor = RPAExecutor(task_name=f"Task-{task.task_id}")
+            # 流程可通过backend指定执行后端（selenium / cdp）
+            executor = RPAExecutor(task_name=f"Task-{task.task_id}",
+                                   backend=task.flow_data.get('backend', 'selenium'))
+            executor.screenshot_dir = task.flow_data.get('screenshot_dir', '')
             task.executor_instance = executor
             
-            # 连接到AdsPower浏览器
-            connect_result = executor.connect_to_adspower_browser(task.env_id)
+            # 连接到AdsPower浏览器（同一环境的连续任务及预热过的环境复用连接池中的WebDriver）
+            browser_prewarmer.consume(task.env_id)
+            connect_result = executor.connect_to_adspower_browser(task.env_id, driver_pool=webdriver_pool)
             if not connect_result.get("success"):
                 raise Exception(f"连接浏览器失败: {connect_result.get('message')}")
+            if plan.needs_network_capture:
+                executor.start_network_capture()
+            if task.flow_data.get('resource_policy'):
+                executor.set_resource_policy(task.flow_data['resource_policy'])
             
-            # 执行流程步骤
-            steps = task.flow_data.get('steps', [])
-            results = []
+            # 执行流程步骤（循环和条件块由解释器按跳转目标执行）
+            total = len(plan.steps) or 1
             
-            for i, step in enumerate(steps):
-                # 检查是否被取消
-                if task.status == TaskStatus.CANCELLED:
-                    break
-                
-                # 更新进度
-                task.current_step = i + 1
-                task.progress = int((i + 1) / len(steps) * 100)
-                
-                # 执行步骤
-                step_result = executor.execute_step(step)
-                results.append(step_result)
-                
-                # 如果步骤失败且设置为停止，则终止执行
-                if not step_result.get("success") and step.get("on_error") == "stop":
-                    raise Exception(f"步骤执行失败: {step_result.get('message')}")
+            def update_progress(step):
+                task.current_step = step.index + 1
+                task.progress = int((step.index + 1) / total * 100)
             
-            # 断开浏览器连接
-            executor.disconnect_from_adspower_browser()
+            interpreter = FlowInterpreter(executor, plan,
+                                          should_stop=lambda: task.status == TaskStatus.CANCELLED,
+                                          on_step=update_progress)
+            result = interpreter.run()
+            screenshot_errors = executor.wait_screenshots()
+            if not result["success"]:
+                raise Exception(result["error"])
+            if screenshot_errors:
+                # 截图步骤提交后即返回成功，写入失败在这里计入任务结果
+                raise Exception(f"截图保存失败: {'; '.join(screenshot_errors)}")
+            result["resource_stats"] = executor.get_resource_stats()
             
-            return {
-                "success": True,
-                "results": results,
-                "completed_steps": len(results)
-            }
+            return result
             
         except Exception as e:
             return {
                 "success": False,
                 "error": str(e)
             }
+        
+        finally:
+            # 等待截图写入磁盘，断开浏览器连接（连接池中的连接归还连接池）
+            if executor is not None:
+                executor.wait_screenshots()
+            if executor is not None and executor.current_env_id:
+                executor.disconnect_from_adspower_browser()
     
     def _check_completed_tasks(self):
         """检查已完成的任务"""
@@ -1919,20 +1919,15 @@ class TaskFlowDialog(QDialog):
                     self.log_signal.emit(f"获取到WebDriver地址: {selenium_address}", "info")
 
                     # 连接到AdsPower浏览器
-                    from selenium import webdriver
                     from selenium.webdriver.chrome.options import Options
-                    from selenium.webdriver.chrome.service import Service
+                    from rpa_chromedriver_service import chromedriver_services
 
                     chrome_options = Options()
                     # 连接到已启动的AdsPower浏览器
                     chrome_options.add_experimental_option("debuggerAddress", selenium_address)
 
-                    # 创建WebDriver连接
-                    if webdriver_path:
-                        service = Service(webdriver_path)
-                        self.driver = webdriver.Chrome(service=service, options=chrome_options)
-                    else:
-                        self.driver = webdriver.Chrome(options=chrome_options)
+                    # 创建WebDriver连接（共享chromedriver进程）
+                    self.driver = chromedriver_services.create_driver(webdriver_path, chrome_options)
 
                     self.log_signal.emit("成功连接到AdsPower浏览器", "info")
                     time.sleep(2)
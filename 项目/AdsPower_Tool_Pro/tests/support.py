@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+测试公共部分：执行器的内置操作在导入rpa_executor时注册（需要Selenium等依赖），
+编译器测试只需操作名和别名，这里注册同名的空操作
+"""
+
+from rpa_operation_registry import rpa_operations
+
+# 操作名 -> 别名，与rpa_executor中的注册一致
+OPERATIONS = {
+    "For循环次数": ("forLoopCount",),
+    "While循环": ("whileLoop",),
+    "IF条件": ("ifCondition",),
+    "Else条件": (),
+    "退出循环": ("exitLoop", "breakLoop"),
+    "结束循环": ("结束条件", "endLoop", "endIf", "endBlock"),
+    "等待时间": ("waitTime",),
+    "执行JS脚本": ("javaScript", "executeJS")
+}
+
+
+def register_operations():
+    """注册测试用到的操作，已注册的（导入过执行器）保持不变"""
+    for name, aliases in OPERATIONS.items():
+        if name not in rpa_operations:
+            rpa_operations.add(name, lambda executor, config: {"success": True}, aliases)
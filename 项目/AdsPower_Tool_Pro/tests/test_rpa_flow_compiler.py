@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+流程编译器测试：块展开、跳转目标、退出循环和Else配对
+"""
+
+import unittest
+
+from rpa_flow_compiler import FlowCompiler
+from tests.support import register_operations
+
+
+def setUpModule():
+    register_operations()
+
+
+def step(operation, title=None, children=None, **params):
+    raw = {"operation": operation, "title": title or operation}
+    raw.update(params)
+    if children is not None:
+        raw["children"] = children
+    return raw
+
+
+def compile_steps(steps):
+    return FlowCompiler().compile({"name": "test", "steps": steps})
+
+
+def layout(plan):
+    """[(title, kind, target)]，便于整体比较"""
+    return [(s.title, s.kind, s.target) for s in plan.steps]
+
+
+class TestLoopLinking(unittest.TestCase):
+
+    def test_nested_loops(self):
+        plan = compile_steps([
+            step("For循环次数", "外层", for_count_times=2, children=[
+                step("等待时间", "a"),
+                step("For循环次数", "内层", for_count_times=3, children=[step("等待时间", "b")])
+            ]),
+            step("等待时间", "之后")
+        ])
+        self.assertEqual(layout(plan), [
+            ("外层", "loop", 6),
+            ("a", "step", -1),
+            ("内层", "loop", 5),
+            ("b", "step", -1),
+            ("结束循环", "loop_end", 2),
+            ("结束循环", "loop_end", 0),
+            ("之后", "step", -1)
+        ])
+        self.assertEqual([s.index for s in plan.steps], list(range(7)))
+        self.assertEqual((plan.errors, plan.warnings), ([], []))
+
+    def test_flat_loops_match_nested(self):
+        nested = compile_steps([
+            step("For循环次数", "外层", children=[
+                step("For循环次数", "内层", children=[step("等待时间", "b")])
+            ])
+        ])
+        flat = compile_steps([
+            step("For循环次数", "外层"),
+            step("For循环次数", "内层"),
+            step("等待时间", "b"),
+            step("结束循环"),
+            step("结束循环")
+        ])
+        self.assertEqual([(kind, target) for _, kind, target in layout(flat)],
+                         [(kind, target) for _, kind, target in layout(nested)])
+
+    def test_unclosed_loop_ends_at_flow_end(self):
+        plan = compile_steps([step("For循环次数", "循环"), step("等待时间", "a")])
+        self.assertEqual(layout(plan), [("循环", "loop", 3), ("a", "step", -1), ("结束循环", "loop_end", 0)])
+        self.assertEqual(len(plan.warnings), 1)
+        self.assertIn("块未结束", plan.warnings[0])
+
+    def test_unmatched_end_is_error(self):
+        plan = compile_steps([step("等待时间", "a"), step("结束循环", "多余的结束")])
+        self.assertEqual(len(plan.errors), 1)
+        self.assertIn("多余的结束", plan.errors[0])
+
+
+class TestBreakLinking(unittest.TestCase):
+
+    def compile_break(self, exit_type):
+        """两层循环，退出循环在内层"""
+        plan = compile_steps([
+            step("For循环次数", "外层", children=[
+                step("For循环次数", "内层", children=[
+                    step("退出循环", "退出", exit_loop_type=exit_type),
+                    step("等待时间", "b")
+                ])
+            ]),
+            step("等待时间", "之后")
+        ])
+        # 0 外层, 1 内层, 2 退出, 3 b, 4 内层结束, 5 外层结束, 6 之后
+        return plan.steps[2]
+
+    def test_skip_iteration(self):
+        brk = self.compile_break("跳过当前迭代")
+        self.assertEqual((brk.kind, brk.pops, brk.target), ("break", 0, 4))
+
+    def test_exit_current_loop(self):
+        brk = self.compile_break("退出当前循环")
+        self.assertEqual((brk.kind, brk.pops, brk.target), ("break", 1, 5))
+
+    def test_exit_current_loop_is_default(self):
+        plan = compile_steps([step("For循环次数", children=[step("退出循环", "退出")])])
+        self.assertEqual((plan.steps[1].pops, plan.steps[1].target), (1, 3))
+
+    def test_exit_all_loops(self):
+        brk = self.compile_break("退出所有循环")
+        self.assertEqual((brk.kind, brk.pops, brk.target), ("break", 2, 6))
+
+    def test_break_inside_if_in_loop(self):
+        plan = compile_steps([
+            step("For循环次数", "循环", children=[
+                step("IF条件", "条件", children=[step("退出循环", "退出", exit_loop_type="退出当前循环")])
+            ])
+        ])
+        # 0 循环, 1 条件, 2 退出, 3 条件结束, 4 循环结束
+        self.assertEqual((plan.steps[2].pops, plan.steps[2].target), (1, 5))
+        self.assertEqual(plan.steps[3].kind, "end_if")
+
+    def test_break_outside_loop_is_ignored(self):
+        plan = compile_steps([step("退出循环", "退出")])
+        self.assertEqual(plan.steps[0].kind, "step")
+        self.assertEqual(len(plan.warnings), 1)
+
+
+class TestConditionLinking(unittest.TestCase):
+
+    def test_if_without_else(self):
+        plan = compile_steps([
+            step("IF条件", "条件", children=[step("等待时间", "a")]),
+            step("等待时间", "之后")
+        ])
+        self.assertEqual(layout(plan), [
+            ("条件", "if", 3),
+            ("a", "step", -1),
+            ("结束条件", "end_if", -1),
+            ("之后", "step", -1)
+        ])
+
+    def test_if_with_else(self):
+        plan = compile_steps([
+            step("IF条件", "条件", children=[step("等待时间", "a")]),
+            step("Else条件", "否则", children=[step("等待时间", "b")]),
+            step("等待时间", "之后")
+        ])
+        # IF和Else共用一个结束标记
+        self.assertEqual(layout(plan), [
+            ("条件", "if", 3),
+            ("a", "step", -1),
+            ("否则", "else", 5),
+            ("b", "step", -1),
+            ("结束条件", "end_if", -1),
+            ("之后", "step", -1)
+        ])
+
+    def test_flat_if_with_else(self):
+        plan = compile_steps([
+            step("IF条件", "条件"),
+            step("等待时间", "a"),
+            step("Else条件", "否则"),
+            step("等待时间", "b"),
+            step("结束条件"),
+            step("等待时间", "之后")
+        ])
+        self.assertEqual([(kind, target) for _, kind, target in layout(plan)],
+                         [("if", 3), ("step", -1), ("else", 5), ("step", -1), ("end_if", -1), ("step", -1)])
+
+    def test_else_without_if_is_error(self):
+        plan = compile_steps([step("Else条件", "否则"), step("等待时间", "a")])
+        self.assertEqual(len(plan.errors), 1)
+        self.assertIn("Else条件没有对应的IF条件", plan.errors[0])
+
+    def test_second_else_is_error(self):
+        plan = compile_steps([step("IF条件"), step("Else条件", "否则1"), step("Else条件", "否则2"), step("结束条件")])
+        self.assertEqual(len(plan.errors), 1)
+        self.assertIn("否则2", plan.errors[0])
+
+    def test_unclosed_if(self):
+        plan = compile_steps([step("IF条件", "条件"), step("等待时间", "a")])
+        self.assertEqual(layout(plan), [("条件", "if", 3), ("a", "step", -1), ("结束条件", "end_if", -1)])
+        self.assertEqual(len(plan.warnings), 1)
+
+
+class TestCompileStep(unittest.TestCase):
+
+    def test_disabled_steps_are_skipped(self):
+        plan = compile_steps([step("等待时间", "a", enabled=False), step("等待时间", "b")])
+        self.assertEqual([s.title for s in plan.steps], ["b"])
+        self.assertEqual(plan.steps[0].index, 0)
+
+    def test_template_params_exclude_js_code(self):
+        plan = compile_steps([step("执行JS脚本", js_code="return `${x}`", goto_url="${site}/${path}")])
+        compiled = plan.steps[0]
+        self.assertEqual(compiled.template_params, ("goto_url",))
+        self.assertEqual(compiled.variable_refs, ("site", "path"))
+
+    def test_plans_are_cached_by_content(self):
+        compiler = FlowCompiler()
+        first = compiler.compile({"name": "a", "steps": [step("等待时间")]})
+        second = compiler.compile({"name": "b", "steps": [step("等待时间")]})
+        self.assertIs(first, second)
+        self.assertEqual(compiler.get_stats()["hits"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
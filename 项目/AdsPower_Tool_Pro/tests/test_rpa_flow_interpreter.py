@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+流程解释器测试：循环迭代、三种退出循环、IF/Else分支和失败处理
+"""
+
+import unittest
+
+from rpa_flow_compiler import FlowCompiler
+from rpa_flow_interpreter import FlowInterpreter
+from tests.support import register_operations
+from tests.test_rpa_flow_compiler import step
+
+
+def setUpModule():
+    register_operations()
+
+
+class FakeExecutor:
+    """记录执行过的步骤；For循环次数按for_count_times迭代，IF条件取参数cond，步骤参数fail为True时失败；
+    循环参数error_at为第几次迭代时条件判断抛出ValueError（同While条件的值不是数字）"""
+
+    def __init__(self):
+        self.loop_stack = []
+        self.executed = []
+
+    def execute_compiled_step(self, compiled):
+        self.executed.append(compiled.title)
+        params = compiled.params
+        if params.get("fail"):
+            return {"success": False, "message": f"{compiled.title} 失败"}
+        if compiled.operation == "For循环次数":
+            self.loop_stack.append({"total_count": int(params.get("for_count_times", 1)), "current_index": 0,
+                                    "error_at": params.get("error_at")})
+        if compiled.operation == "IF条件":
+            return {"success": True, "condition_result": bool(params.get("cond"))}
+        return {"success": True}
+
+    def next_loop_iteration(self, loop_info):
+        if loop_info["current_index"] == loop_info["error_at"]:
+            raise ValueError("条件值不是数字")
+        if loop_info["current_index"] >= loop_info["total_count"]:
+            return False
+        loop_info["current_index"] += 1
+        return True
+
+
+def run(steps, **kwargs):
+    executor = FakeExecutor()
+    plan = FlowCompiler().compile({"name": "test", "steps": steps})
+    result = FlowInterpreter(executor, plan, **kwargs).run()
+    return executor, result
+
+
+class TestLoops(unittest.TestCase):
+
+    def test_flat_loop(self):
+        executor, result = run([
+            step("For循环次数", "循环", for_count_times=3),
+            step("等待时间", "a"),
+            step("结束循环"),
+            step("等待时间", "之后")
+        ])
+        self.assertTrue(result["success"])
+        self.assertEqual(executor.executed, ["循环", "a", "a", "a", "之后"])
+        self.assertEqual(executor.loop_stack, [])
+
+    def test_nested_loops(self):
+        executor, _ = run([
+            step("For循环次数", "外层", for_count_times=2, children=[
+                step("等待时间", "a"),
+                step("For循环次数", "内层", for_count_times=3, children=[step("等待时间", "b")])
+            ])
+        ])
+        self.assertEqual(executor.executed, ["外层", "a", "内层", "b", "b", "b", "a", "内层", "b", "b", "b"])
+        self.assertEqual(executor.loop_stack, [])
+
+    def test_empty_loop_skips_body(self):
+        executor, _ = run([
+            step("For循环次数", "循环", for_count_times=0, children=[step("等待时间", "a")]),
+            step("等待时间", "之后")
+        ])
+        self.assertEqual(executor.executed, ["循环", "之后"])
+
+    def test_unclosed_loop_runs_to_flow_end(self):
+        executor, _ = run([step("For循环次数", "循环", for_count_times=2), step("等待时间", "a")])
+        self.assertEqual(executor.executed, ["循环", "a", "a"])
+
+
+class TestBreak(unittest.TestCase):
+
+    def run_break(self, exit_type):
+        """两层循环各2次，内层在退出循环前后各有一步"""
+        return run([
+            step("For循环次数", "外层", for_count_times=2, children=[
+                step("For循环次数", "内层", for_count_times=2, children=[
+                    step("等待时间", "前"),
+                    step("退出循环", exit_loop_type=exit_type),
+                    step("等待时间", "后")
+                ]),
+                step("等待时间", "外层尾")
+            ]),
+            step("等待时间", "之后")
+        ])
+
+    def test_skip_iteration(self):
+        executor, _ = self.run_break("跳过当前迭代")
+        inner = ["内层", "前", "前", "外层尾"]
+        self.assertEqual(executor.executed, ["外层"] + inner * 2 + ["之后"])
+        self.assertEqual(executor.loop_stack, [])
+
+    def test_exit_current_loop(self):
+        executor, _ = self.run_break("退出当前循环")
+        inner = ["内层", "前", "外层尾"]
+        self.assertEqual(executor.executed, ["外层"] + inner * 2 + ["之后"])
+        self.assertEqual(executor.loop_stack, [])
+
+    def test_exit_all_loops(self):
+        executor, _ = self.run_break("退出所有循环")
+        self.assertEqual(executor.executed, ["外层", "内层", "前", "之后"])
+        self.assertEqual(executor.loop_stack, [])
+
+    def test_conditional_break(self):
+        executor, _ = run([
+            step("For循环次数", "循环", for_count_times=3, children=[
+                step("等待时间", "a"),
+                step("IF条件", "条件", cond=True, children=[step("退出循环")]),
+                step("等待时间", "b")
+            ]),
+            step("等待时间", "之后")
+        ])
+        self.assertEqual(executor.executed, ["循环", "a", "条件", "之后"])
+
+
+class TestConditions(unittest.TestCase):
+
+    def run_if(self, cond, with_else):
+        steps = [step("IF条件", "条件", cond=cond, children=[step("等待时间", "是")])]
+        if with_else:
+            steps.append(step("Else条件", "否则", children=[step("等待时间", "否")]))
+        steps.append(step("等待时间", "之后"))
+        executor, _ = run(steps)
+        return executor.executed
+
+    def test_if_true_without_else(self):
+        self.assertEqual(self.run_if(True, False), ["条件", "是", "之后"])
+
+    def test_if_false_without_else(self):
+        self.assertEqual(self.run_if(False, False), ["条件", "之后"])
+
+    def test_if_true_with_else(self):
+        self.assertEqual(self.run_if(True, True), ["条件", "是", "之后"])
+
+    def test_if_false_with_else(self):
+        self.assertEqual(self.run_if(False, True), ["条件", "否", "之后"])
+
+    def test_failed_if_skips_else(self):
+        executor, _ = run([
+            step("IF条件", "条件", fail=True, children=[step("等待时间", "是")]),
+            step("Else条件", "否则", children=[step("等待时间", "否")]),
+            step("等待时间", "之后")
+        ])
+        self.assertEqual(executor.executed, ["条件", "之后"])
+
+
+class TestFailures(unittest.TestCase):
+
+    def test_stop_on_error(self):
+        executor, result = run([
+            step("等待时间", "a", fail=True, on_error="stop"),
+            step("等待时间", "b")
+        ])
+        self.assertFalse(result["success"])
+        self.assertEqual(result["completed_steps"], 1)
+        self.assertEqual(executor.executed, ["a"])
+
+    def test_continue_on_error(self):
+        executor, result = run([step("等待时间", "a", fail=True), step("等待时间", "b")])
+        self.assertTrue(result["success"])
+        self.assertEqual(executor.executed, ["a", "b"])
+
+    def test_failed_block_head_skips_block(self):
+        executor, _ = run([
+            step("For循环次数", "循环", fail=True, children=[step("等待时间", "a")]),
+            step("IF条件", "条件", fail=True, children=[step("等待时间", "b")]),
+            step("等待时间", "之后")
+        ])
+        self.assertEqual(executor.executed, ["循环", "条件", "之后"])
+
+    def test_loop_condition_error_ends_loop(self):
+        for error_at, expected in ((0, ["循环", "之后"]), (2, ["循环", "a", "a", "之后"])):
+            executor, result = run([
+                step("For循环次数", "循环", for_count_times=3, error_at=error_at, children=[step("等待时间", "a")]),
+                step("等待时间", "之后")
+            ])
+            self.assertTrue(result["success"])
+            self.assertEqual(executor.executed, expected)
+            self.assertEqual(executor.loop_stack, [])
+            self.assertIn("循环条件判断失败", result["results"][-2]["message"])
+
+    def test_loop_condition_error_stops_flow(self):
+        executor, result = run([
+            step("For循环次数", "循环", for_count_times=3, error_at=1, on_error="stop",
+                 children=[step("等待时间", "a")]),
+            step("等待时间", "之后")
+        ])
+        self.assertFalse(result["success"])
+        self.assertIn("条件值不是数字", result["error"])
+        self.assertEqual(executor.executed, ["循环", "a"])
+
+    def test_should_stop(self):
+        executor = FakeExecutor()
+        plan = FlowCompiler().compile({"steps": [step("等待时间", "a"), step("等待时间", "b")]})
+        interpreter = FlowInterpreter(executor, plan, should_stop=lambda: len(executor.executed) >= 1)
+        interpreter.run()
+        self.assertEqual(executor.executed, ["a"])
+
+    def test_keep_results(self):
+        _, result = run([step("For循环次数", for_count_times=10, children=[step("等待时间")])], keep_results=3)
+        self.assertEqual(len(result["results"]), 3)
+        self.assertEqual(result["completed_steps"], 11)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+变量模板测试：缺失、带点和带序号的引用，整体引用保留类型
+"""
+
+import unittest
+
+from rpa_template import Template, TemplateCache
+
+
+class TestTemplate(unittest.TestCase):
+
+    def render(self, source, variables):
+        return Template(source).render(variables)
+
+    def test_simple_reference(self):
+        self.assertEqual(self.render("Hello ${name}!", {"name": "Tom"}), "Hello Tom!")
+
+    def test_missing_reference_keeps_source(self):
+        self.assertEqual(self.render("${missing}", {}), "${missing}")
+        self.assertEqual(self.render("id=${missing}&p=${page}", {"page": 2}), "id=${missing}&p=2")
+
+    def test_whole_reference_keeps_type(self):
+        self.assertEqual(self.render("${count}", {"count": 3}), 3)
+        self.assertEqual(self.render("${items}", {"items": [1, 2]}), [1, 2])
+        self.assertIsNone(self.render("${value}", {"value": None}))
+        self.assertEqual(self.render(" ${count}", {"count": 3}), " 3")
+        self.assertEqual(self.render("${a}${b}", {"a": 1, "b": 2}), "12")
+
+    def test_whitespace_inside_braces(self):
+        self.assertEqual(self.render("${ name }", {"name": "Tom"}), "Tom")
+
+    def test_dotted_reference(self):
+        variables = {"row": {"email": "a@b.com", "profile": {"age": 30}}}
+        self.assertEqual(self.render("${row.email}", variables), "a@b.com")
+        self.assertEqual(self.render("${row.profile.age}", variables), 30)
+        self.assertEqual(self.render("${row.phone}", variables), "${row.phone}")
+        self.assertEqual(self.render("${none.field}", variables), "${none.field}")
+
+    def test_dotted_variable_name_takes_precedence(self):
+        variables = {"row.email": "flat", "row": {"email": "nested"}}
+        self.assertEqual(self.render("${row.email}", variables), "flat")
+
+    def test_indexed_reference(self):
+        variables = {"items": ["a", "b", "c"], "rows": [{"name": "x"}]}
+        self.assertEqual(self.render("${items.0}", variables), "a")
+        self.assertEqual(self.render("${items.-1}", variables), "c")
+        self.assertEqual(self.render("${items.3}", variables), "${items.3}")
+        self.assertEqual(self.render("${rows.0.name}", variables), "x")
+        self.assertEqual(self.render("${items.first}", variables), "${items.first}")
+
+    def test_attribute_reference(self):
+        class Record:
+            title = "标题"
+        self.assertEqual(self.render("${record.title}", {"record": Record()}), "标题")
+
+    def test_refs(self):
+        template = Template("${a}-${row.b}-${a}")
+        self.assertEqual(template.refs, ("a", "row.b"))
+        self.assertFalse(template.whole)
+
+
+class TestTemplateCache(unittest.TestCase):
+
+    def test_plain_strings_are_not_templates(self):
+        cache = TemplateCache()
+        self.assertIsNone(cache.get("no variables"))
+        self.assertIsNone(cache.get("${}"))
+        self.assertFalse(cache.has_template(["a", {"b": 1}]))
+
+    def test_templates_are_cached(self):
+        cache = TemplateCache()
+        self.assertIs(cache.get("${a}"), cache.get("${a}"))
+        self.assertEqual(cache.get_stats()["compiled"], 1)
+
+    def test_nested_values(self):
+        cache = TemplateCache()
+        value = {"url": "${site}/list", "headers": [("X-Id", "${id}")], "count": 5}
+        self.assertTrue(cache.has_template(value))
+        self.assertEqual(cache.refs(value), ("site", "id"))
+        self.assertEqual(cache.render(value, {"site": "https://a.com", "id": 7}),
+                         {"url": "https://a.com/list", "headers": [("X-Id", 7)], "count": 5})
+
+    def test_render_params_only_renders_keys(self):
+        cache = TemplateCache()
+        params = {"goto_url": "${url}", "js_code": "return `${url}`"}
+        rendered = cache.render_params(params, ("goto_url",), {"url": "https://a.com"})
+        self.assertEqual(rendered, {"goto_url": "https://a.com", "js_code": "return `${url}`"})
+        self.assertEqual(params["goto_url"], "${url}")
+
+    def test_full_cache_is_cleared(self):
+        cache = TemplateCache(max_size=2)
+        for name in ("a", "b", "c"):
+            cache.get("${%s}" % name)
+        self.assertEqual(cache.get_stats()["cached"], 1)
+        self.assertEqual(cache.get_stats()["evicted"], 2)
+        self.assertEqual(cache.render("${a}", {"a": 1}), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()